@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+"""
+Benchmark da conversão de itens (JSON -> PutRequests), em itens/s por núcleo.
+
+Compara o caminho antigo (_convert_to_dynamodb_format + _clean_dynamodb_item,
+duas passadas e um TypeSerializer por item) com a conversão em passada única
+usada pelo importador (prepare_put_requests).
+
+Uso:
+    python3 benchmark_converter.py
+    python3 benchmark_converter.py --items 200000 --processes 4
+    python3 benchmark_converter.py --file messages-dump.json --items 100000
+"""
+
+import argparse
+import logging
+import multiprocessing
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from decimal import Decimal
+from itertools import islice
+from pathlib import Path
+
+# Adicionar src ao path para imports
+sys.path.insert(0, str(Path(__file__).parent))
+
+from src.services.item_converter import ItemConverter, convert_chunk
+
+
+CHUNK_SIZE = 1000
+
+
+def sample_items(count: int, dynamodb_json: bool):
+    """Itens sintéticos parecidos com um dump de mensagens."""
+    items = []
+    for i in range(count):
+        item = {
+            'id': str(i),
+            'conversationId': f"conv-{i % 1000}",
+            'timestamp': 1700000000 + i,
+            'text': f"mensagem {i} " * 4,
+            'score': Decimal('0.75'),
+            'read': i % 2 == 0,
+            'tags': ['a', 'b', ''],
+            'meta': {'source': 'app', 'version': 3, 'empty': ''},
+            'deleted': None,
+        }
+        if dynamodb_json:
+            item = {
+                'id': {'S': item['id']},
+                'conversationId': {'S': item['conversationId']},
+                'timestamp': {'N': str(item['timestamp'])},
+                'text': {'S': item['text']},
+                'score': {'N': '0.75'},
+                'read': {'BOOL': item['read']},
+                'tags': {'SS': ['a', 'b', '']},
+                'meta': {'M': {'source': {'S': 'app'}, 'version': {'N': '3'}, 'empty': {'S': ''}}},
+                'deleted': {'NULL': True},
+            }
+        items.append(item)
+    return items
+
+
+def file_items(file_path: str, count: int):
+    """Primeiros itens de um dump, lidos pelo importador."""
+    from src.services.batch_importer import DynamoDBBatchImporter
+    importer = DynamoDBBatchImporter('http://localhost:8000')
+    return list(islice(importer.stream_json_items(file_path), count))
+
+
+def chunks(items):
+    """Blocos de CHUNK_SIZE itens, como o importador converte."""
+    return [items[i:i + CHUNK_SIZE] for i in range(0, len(items), CHUNK_SIZE)]
+
+
+def legacy_convert(converter: ItemConverter, items, key_schema):
+    """Caminho antigo: duas passadas por item."""
+    for chunk in chunks(items):
+        requests = []
+        for idx, item in enumerate(chunk):
+            converted = converter._convert_to_dynamodb_format(item)
+            if converted:
+                cleaned = converter._clean_dynamodb_item(converted, idx)
+                if not converter._missing_keys(cleaned, key_schema):
+                    requests.append({'PutRequest': {'Item': cleaned}})
+
+
+def single_pass_convert(converter: ItemConverter, items, key_schema):
+    """Conversão usada pelo importador."""
+    for chunk in chunks(items):
+        converter.prepare_put_requests(chunk, key_schema)
+
+
+def measure(label: str, function, item_count: int, cores: int = 1) -> float:
+    started = time.perf_counter()
+    function()
+    seconds = time.perf_counter() - started
+    rate = item_count / seconds if seconds > 0 else 0.0
+    print(f"   {label:32} {seconds:7.2f}s  {rate:12,.0f} itens/s  {rate / cores:12,.0f} itens/s/núcleo")
+    return rate
+
+
+def run_in_processes(items, key_schema, processes: int):
+    context = multiprocessing.get_context('spawn')
+    blocks = chunks(items)
+    with ProcessPoolExecutor(max_workers=processes, mp_context=context) as executor:
+        # Aquecer os processos antes de medir
+        list(executor.map(convert_chunk, blocks[:processes], [key_schema] * processes))
+        return measure(f"passada única ({processes} processos)",
+                       lambda: list(executor.map(convert_chunk, blocks, [key_schema] * len(blocks))),
+                       len(items), processes)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark da conversão de itens para DynamoDB JSON.')
+    parser.add_argument('--items', type=int, default=100000, help='Quantidade de itens (default: 100000)')
+    parser.add_argument('--file', help='Usar os primeiros itens de um dump em vez de itens sintéticos')
+    parser.add_argument('--processes', type=int, default=0,
+                        help='Também medir a conversão em N processos (default: 0)')
+    args = parser.parse_args()
+
+    # Os avisos de limpeza (strings vazias etc.) distorcem a medição
+    logging.disable(logging.WARNING)
+
+    key_schema = {'id': 'HASH'}
+    converter = ItemConverter()
+
+    if args.file:
+        datasets = [(os.path.basename(args.file), file_items(args.file, args.items))]
+    else:
+        datasets = [
+            ('JSON Python', sample_items(args.items, dynamodb_json=False)),
+            ('DynamoDB JSON', sample_items(args.items, dynamodb_json=True)),
+        ]
+
+    print(f"\n📊 Conversão de itens ({os.cpu_count()} núcleo(s) disponíveis)")
+    for name, items in datasets:
+        print(f"\n{name}: {len(items):,} itens")
+        legacy = measure("duas passadas (antigo)", lambda: legacy_convert(converter, items, key_schema), len(items))
+        single = measure("passada única", lambda: single_pass_convert(converter, items, key_schema), len(items))
+        if legacy > 0:
+            print(f"   Ganho: {single / legacy:.2f}x")
+        if args.processes > 0:
+            run_in_processes(items, key_schema, args.processes)
+    print()
+
+
+if __name__ == '__main__':
+    main()
@@ -55,8 +55,11 @@ def exemplo_2_com_callback():
         """Função chamada a cada batch importado"""
         if error:
             print(f"   ⚠️  Erro: {error}")
+        elif total_count is not None:
+            # Total estimado pelos bytes já lidos do arquivo (streaming)
+            print(f"   ✓ {imported_count} de ~{total_count} itens importados até agora...")
         else:
-            # Total count é None porque usa streaming
+            # Sem estimativa ainda (ex.: nada lido do arquivo)
             print(f"   ✓ {imported_count} itens importados até agora...")
     
     importer = DynamoDBBatchImporter('http://localhost:8000')
@@ -6,17 +6,25 @@ Ideal para arquivos maiores que 2.5GB com processamento paralelo e batch writes.
 Uso:
     python3 import_large_dumps.py --file messages-dump.json --table messages
     python3 import_large_dumps.py --dir /path/to/dumps --endpoint http://localhost:8000
+    python3 import_large_dumps.py --s3-export /path/to/export --table messages
+    python3 import_large_dumps.py --dead-letter messages-dump.dead-letter-20250101-120000.jsonl
 """
 
 import argparse
 import sys
 import os
+import time
 from pathlib import Path
 
 # Adicionar src ao path para imports
 sys.path.insert(0, str(Path(__file__).parent))
 
 from src.services.batch_importer import DynamoDBBatchImporter
+from src.services.compressed_input import COMPRESSION_EXTENSIONS
+from src.services.directory_import import DirectoryImport
+from src.services.import_progress import format_eta
+from src.services.item_converter import DUPLICATE_POLICIES, ON_DUPLICATE_COALESCE
+from src.services.s3_export import S3ExportError
 import logging
 
 # Configurar logging
@@ -30,6 +38,114 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+_STATUS_ICONS = {
+    'waiting': '⏳',
+    'running': '🔄',
+    'done': '✅',
+    'warning': '⚠️ ',
+    'error': '❌',
+}
+
+
+class _Dashboard:
+    """Painel por tabela de uma importação de diretório
+
+    Num terminal, redesenha a tabela no lugar a cada atualização; fora de um
+    terminal (ex: saída redirecionada), imprime uma linha de resumo a cada
+    ``LOG_INTERVAL`` segundos.
+    """
+
+    LOG_INTERVAL = 30.0
+
+    def __init__(self):
+        self.live = sys.stdout.isatty()
+        self._lines = 0
+        self._last_log = 0.0
+
+    def render(self, directory_import):
+        rows = directory_import.snapshot()
+        summary = directory_import.summary()
+
+        if not self.live:
+            now = time.monotonic()
+            if now - self._last_log >= self.LOG_INTERVAL:
+                self._last_log = now
+                running = sum(1 for row in rows if row['status'] == 'running')
+                done = sum(1 for row in rows if row['status'] in ('done', 'warning', 'error'))
+                print(f"[{summary['elapsed_seconds']:7.0f}s] {done}/{len(rows)} arquivo(s) concluído(s), "
+                      f"{running} em andamento, {summary['successful']:,} itens "
+                      f"({summary['items_per_second']:.0f} itens/s)", flush=True)
+            return
+
+        concurrency = summary['concurrency']
+        lines = [
+            f"{'':2} {'Tabela':30} {'Tamanho':>9} {'%':>4} {'OK':>10} {'Falhas':>7} {'itens/s':>9} "
+            f"{'Tempo':>7} {'ETA':>7}",
+        ]
+        for row in rows:
+            percent = f"{row['fraction'] * 100:3.0f}%" if row['fraction'] is not None else "  --"
+            eta = format_eta(row['eta_seconds']) if row['status'] == 'running' else ""
+            lines.append(
+                f"{_STATUS_ICONS[row['status']]} {row['table'][:30]:30} {row['size'] / (1024 * 1024):8.1f}M "
+                f"{percent:>4} {row['successful']:10,} {row['failed']:7,} {row['items_per_second']:9.0f} "
+                f"{row['elapsed_seconds']:6.0f}s {eta:>7}"
+            )
+        lines.append(
+            f"   TOTAL {summary['successful']:,} itens, {summary['failed']:,} falhas, "
+            f"{summary['items_per_second']:.0f} itens/s em {summary['elapsed_seconds']:.0f}s | "
+            f"escritas simultâneas {concurrency['limit']}/{concurrency['max_limit']}"
+        )
+
+        # Voltar ao início do painel anterior e redesenhar
+        if self._lines:
+            sys.stdout.write(f"\x1b[{self._lines}F")
+        sys.stdout.write("".join(f"\x1b[2K{line}\n" for line in lines))
+        sys.stdout.flush()
+        self._lines = len(lines)
+
+
+def _print_telemetry(stats):
+    """Linhas de latência/retries e o caminho do relatório de telemetria"""
+    telemetry = stats.get('telemetry')
+    if not telemetry:
+        return
+    latency = telemetry['call_latency_ms']
+    print(f"Latência:    p50 {latency['p50']:.0f} ms | p95 {latency['p95']:.0f} ms | "
+          f"p99 {latency['p99']:.0f} ms (por chamada batch_write_item)")
+    print(f"Retries:     {telemetry['retries']} | UnprocessedItems: {telemetry['unprocessed_items']} "
+          f"({telemetry['unprocessed_rate']:.1%})")
+    if stats.get('telemetry_report'):
+        print(f"Telemetria:  {stats['telemetry_report']}")
+
+
+def _print_dry_run(stats):
+    """Resultado de um --dry-run de arquivo: vazão, rejeitados e tamanhos de item"""
+    print("\n" + "="*80)
+    print("🧪 RESULTADO DO DRY-RUN (nada foi escrito)")
+    print("="*80)
+    print(f"Arquivo:     {stats['file']}")
+    print(f"Chaves:      {stats['key_schema'] or 'desconhecidas (itens não validados)'}")
+    print(f"Total:       {stats['total_items']} itens")
+    print(f"Válidos:     {stats['successful']} ✅")
+    print(f"Rejeitados:  {stats['failed']} ❌" + (f" ({stats['dead_letter']})" if stats.get('dead_letter') else ""))
+    if stats.get('coalesced'):
+        print(f"Repetidas:   {stats['coalesced']} escrita(s) substituída(s) pela seguinte da mesma chave")
+    print(f"Tempo:       {stats['elapsed_seconds']:.2f}s")
+    print(f"Vazão:       {stats['items_per_second']:.1f} itens/s, {stats.get('mb_per_second', 0):.1f} MB/s do arquivo")
+    if stats.get('parser'):
+        print(f"Parser:      {stats['parser']['backend']} ({stats['parser']['mb_per_second']:.1f} MB/s)")
+    if not stats.get('completed', True):
+        print(f"Status:      ⚠️  interrompido ({stats.get('error') or stats.get('parser', {}).get('error')})")
+    sizes = stats.get('item_sizes')
+    if sizes and sizes['count']:
+        print(f"Tamanho:     média {sizes['mean_bytes'] / 1024:.1f} KB, máximo {sizes['max_bytes'] / 1024:.1f} KB "
+              f"({sizes['total_bytes'] / (1024 * 1024):.1f} MB em DynamoDB JSON)")
+        for label, count in sizes['buckets']:
+            print(f"   {label:>9}: {count:10,} ({count / sizes['count']:6.1%})")
+        if sizes['oversize']:
+            print(f"Acima de 400 KB: {sizes['oversize']} item(ns) ⚠️  (o DynamoDB recusaria)")
+    print("="*80 + "\n")
+
 
 def main():
     parser = argparse.ArgumentParser(
@@ -44,18 +160,61 @@ EXEMPLOS:
   # Importar arquivo especificando endpoint
   python3 import_large_dumps.py --file messages-dump.json --table messages --endpoint http://localhost:8000
   
-  # Importar todos os arquivos de um diretório
+  # Importar todos os arquivos de um diretório (4 em paralelo, maiores primeiro)
   python3 import_large_dumps.py --dir /home/joaquim/dumps/DynamoDB --pattern "*-dump.json"
   
+  # Diretório com 8 arquivos em paralelo dividindo 32 escritas simultâneas
+  python3 import_large_dumps.py --dir /home/joaquim/dumps/DynamoDB --parallel-files 8 --workers 32
+  
   # Com customizações
   python3 import_large_dumps.py --file dados.json --table minha_tabela --endpoint http://localhost:8000 --region us-east-1
+  
+  # Importar um "Export to S3" do DynamoDB baixado (manifest + data/*.json.gz)
+  python3 import_large_dumps.py --s3-export ./AWSDynamoDB/01234567890123-abcdef12 --table messages
+  
+  # Reimportar só os itens rejeitados de uma importação anterior
+  python3 import_large_dumps.py --dead-letter messages-dump.dead-letter-20250101-120000.jsonl
+  
+  # Retomar uma importação interrompida do último checkpoint
+  python3 import_large_dumps.py --file messages-dump.json --table messages --resume
+  
+  # Mais threads escritoras em paralelo
+  python3 import_large_dumps.py --file messages-dump.json --table messages --workers 8
+  
+  # Escrever de forma constante numa tabela provisionada (no máximo 500 WCU/s)
+  python3 import_large_dumps.py --file messages-dump.json --table messages --max-wcu 500
+  
+  # DynamoDB Local vazio: criar as tabelas (schema de <dump>.schema.json ou inferido do dump)
+  python3 import_large_dumps.py --dir /home/joaquim/dumps/DynamoDB --create-tables
+  
+  # Validar um dump e medir leitura/conversão sem DynamoDB (nada é escrito)
+  python3 import_large_dumps.py --file messages-dump.json --table messages --dry-run --processes 4
+  
+  # Dump exportado em ordem de chave: alternar partições em janelas de 5000 itens
+  python3 import_large_dumps.py --file messages-dump.json --table messages --spread-partitions 5000
+  
+  # Converter itens em 4 processos (arquivos grandes, CPU como gargalo)
+  python3 import_large_dumps.py --file messages-dump.json --table messages --workers 8 --processes 4
 
 OTIMIZAÇÕES APLICADAS:
   ✓ Streaming de arquivo (não carrega tudo na memória)
   ✓ Batch write (25 itens por batch, limite do DynamoDB)
-  ✓ Retry automático com backoff exponencial
+  ✓ Threads escritoras em paralelo (--workers)
+  ✓ Vários arquivos/tabelas em paralelo com --dir (--parallel-files), com painel por tabela
+  ✓ Conversão de itens em múltiplos processos (--processes)
+  ✓ Retry automático com backoff exponencial (full jitter)
+  ✓ Concorrência adaptativa (AIMD): reduz as escritas em paralelo sob throttling
+  ✓ Limite de escrita opcional em WCU/s ou itens/s (--max-wcu, --max-items-per-second)
+  ✓ Checkpoints para retomar importações interrompidas (--resume)
+  ✓ Criação de tabelas ausentes no DynamoDB Local (--create-tables), GSIs só após a carga
+  ✓ Dry-run offline (--dry-run): valida o dump e mede itens/s, MB/s e tamanhos de item
+  ✓ Itens acima de 400 KB rejeitados antes do envio; lotes limitados a 16 MB
+  ✓ Chaves repetidas num lote não derrubam o lote (--on-duplicate coalesce|flush)
+  ✓ Dumps em ordem de chave: lotes alternando partições (--spread-partitions)
+  ✓ Itens rejeitados gravados com o motivo num arquivo dead-letter (--dead-letter para reimportar)
   ✓ Suporte a diferentes estruturas JSON
-  ✓ Progress bar em tempo real
+  ✓ Progress bar em tempo real (bytes lidos, ETA pela vazão recente)
+  ✓ Telemetria (latência p50/p95/p99, retries, linha do tempo de vazão) em JSON ao lado do log
   ✓ Logging detalhado
 
 ESTRUTURAS JSON SUPORTADAS:
@@ -64,12 +223,17 @@ ESTRUTURAS JSON SUPORTADAS:
   ✓ {"Records": [...]}
   ✓ {"messages": [...]}
   ✓ [...]  (lista direta)
+  ✓ Arquivos compactados (.gz, .bz2, .xz), descompactados em streaming
+  ✓ Export to S3 do DynamoDB (--s3-export, DynamoDB JSON em .json.gz)
+  ✓ JSON Lines (.jsonl / .ndjson, um item por linha; em faixas paralelas com --processes)
         """
     )
     
     parser.add_argument('--file', help='Arquivo JSON para importar')
     parser.add_argument('--table', help='Nome da tabela DynamoDB')
     parser.add_argument('--dir', help='Diretório com arquivos JSON')
+    parser.add_argument('--s3-export', help='Diretório de um "Export to S3" do DynamoDB baixado')
+    parser.add_argument('--dead-letter', help='Reimporta só os itens de um arquivo dead-letter (.jsonl)')
     parser.add_argument('--pattern', default='*-dump.json', 
                        help='Padrão de arquivo (default: *-dump.json)')
     parser.add_argument('--endpoint', default='http://localhost:8000',
@@ -78,33 +242,156 @@ ESTRUTURAS JSON SUPORTADAS:
                        help='Região AWS (default: us-east-1)')
     parser.add_argument('--access-key', help='AWS Access Key ID (opcional para local)')
     parser.add_argument('--secret-key', help='AWS Secret Access Key (opcional para local)')
+    parser.add_argument('--workers', type=int, default=DynamoDBBatchImporter.DEFAULT_WORKERS,
+                       help=f'Máximo de threads escritoras em paralelo, reduzido automaticamente sob '
+                            f'throttling (default: {DynamoDBBatchImporter.DEFAULT_WORKERS})')
+    parser.add_argument('--processes', type=int, default=0,
+                       help='Processos para converter itens em paralelo (default: 0, converte nas threads)')
+    parser.add_argument('--max-wcu', type=float, default=0,
+                       help='Limite de escrita em WCU/s (1 WCU por KB de item; default: 0, sem limite)')
+    parser.add_argument('--max-items-per-second', type=float, default=0,
+                       help='Limite de escrita em itens/s (default: 0, sem limite)')
+    parser.add_argument('--parallel-files', type=int, default=DirectoryImport.DEFAULT_PARALLEL_FILES,
+                       help=f'Com --dir, arquivos importados em paralelo (default: '
+                            f'{DirectoryImport.DEFAULT_PARALLEL_FILES}); --workers vira o total de '
+                            f'escritas simultâneas de todos os arquivos')
+    parser.add_argument('--resume', action='store_true',
+                       help='Retoma uma importação interrompida a partir do último checkpoint')
+    parser.add_argument('--create-tables', action='store_true',
+                       help='Cria tabelas ausentes (só DynamoDB Local) em PAY_PER_REQUEST, com o schema de '
+                            '<dump>.schema.json (saída de describe-table) ou inferido do dump; '
+                            'os GSIs são criados depois da carga')
+    parser.add_argument('--schema',
+                       help='Com --file e --create-tables, schema da tabela (saída de describe-table)')
+    parser.add_argument('--dry-run', action='store_true',
+                       help='Lê, limpa, converte e valida as chaves sem escrever nem acessar o DynamoDB; '
+                            'relata itens/s, MB/s, rejeitados e tamanhos de item (chaves de --schema, '
+                            '<dump>.schema.json ou inferidas do dump)')
+    parser.add_argument('--on-duplicate', choices=DUPLICATE_POLICIES, default=ON_DUPLICATE_COALESCE,
+                       help='Chave repetida num mesmo lote (o DynamoDB recusaria o lote): coalesce envia só '
+                            'a última escrita, flush fecha o lote antes e envia as duas (default: coalesce)')
+    parser.add_argument('--spread-partitions', type=int, default=0, metavar='JANELA',
+                       help='Reordena os itens em janelas de JANELA itens, alternando as chaves de partição '
+                            'entre os lotes, para não concentrar a escrita numa partição quando o dump está '
+                            'em ordem de chave (ex: 5000; default: 0, ordem do arquivo)')
+    parser.add_argument('--allow-full-load', action='store_true',
+                       help='Sem ijson, permite carregar o arquivo inteiro na memória com json.load')
     
     args = parser.parse_args()
     
-    if not args.file and not args.dir:
+    if not args.file and not args.dir and not args.s3_export and not args.dead_letter:
         parser.print_help()
-        print("\n❌ Especifique --file ou --dir")
+        print("\n❌ Especifique --file, --dir, --s3-export ou --dead-letter")
+        sys.exit(1)
+    
+    if args.dry_run and (args.s3_export or args.dead_letter):
+        print("❌ --dry-run funciona com --file ou --dir")
         sys.exit(1)
     
     # Criar importador
     logger.info("🚀 Iniciando DynamoDB Batch Importer Otimizado")
     logger.info(f"   Endpoint: {args.endpoint}")
     logger.info(f"   Região: {args.region}")
+    logger.info(f"   Workers: {args.workers}")
+    logger.info(f"   Processos de conversão: {args.processes}")
+    if args.max_wcu > 0:
+        logger.info(f"   Limite de escrita: {args.max_wcu:g} WCU/s")
+    if args.max_items_per_second > 0:
+        logger.info(f"   Limite de escrita: {args.max_items_per_second:g} itens/s")
     
-    importer = DynamoDBBatchImporter(
-        endpoint_url=args.endpoint,
-        region_name=args.region,
-        access_key_id=args.access_key,
-        secret_access_key=args.secret_key
-    )
+    def create_importer():
+        return DynamoDBBatchImporter(
+            endpoint_url=args.endpoint,
+            region_name=args.region,
+            access_key_id=args.access_key,
+            secret_access_key=args.secret_key,
+            num_workers=args.workers,
+            num_processes=args.processes,
+            allow_full_load=args.allow_full_load,
+            max_wcu_per_second=args.max_wcu,
+            max_items_per_second=args.max_items_per_second,
+            create_tables=args.create_tables,
+            dry_run=args.dry_run,
+            on_duplicate=args.on_duplicate,
+            spread_window=args.spread_partitions
+        )
+    
+    try:
+        importer = create_importer()
+    except ValueError as e:
+        logger.error(f"❌ {e}")
+        sys.exit(1)
     
     # Importar dados
-    if args.file:
+    if args.dead_letter:
+        if not os.path.exists(args.dead_letter):
+            logger.error(f"❌ Arquivo não encontrado: {args.dead_letter}")
+            sys.exit(1)
+        
+        try:
+            stats = importer.import_dead_letters(args.dead_letter, args.table)
+        except ValueError as e:
+            logger.error(f"❌ {e}")
+            sys.exit(1)
+        
+        print("\n" + "="*80)
+        print("📊 RESULTADO DA REIMPORTAÇÃO (DEAD-LETTER)")
+        print("="*80)
+        print(f"Arquivo:     {stats['file']}")
+        print(f"Tabela:      {stats['table']}")
+        print(f"Total:       {stats['total_items']} itens")
+        print(f"Sucesso:     {stats['successful']} ✅")
+        print(f"Falhas:      {stats['failed']} ❌")
+        print(f"Tempo:       {stats['elapsed_seconds']:.2f}s")
+        if stats.get('dead_letter'):
+            print(f"Rejeitados:  {stats['dead_letter']}")
+        print("="*80 + "\n")
+        
+        sys.exit(0 if stats['failed'] == 0 else 1)
+    
+    elif args.s3_export:
+        if not os.path.isdir(args.s3_export):
+            logger.error(f"❌ Diretório não encontrado: {args.s3_export}")
+            sys.exit(1)
+        
+        try:
+            stats = importer.import_s3_export(args.s3_export, args.table)
+        except S3ExportError as e:
+            logger.error(f"❌ {e}")
+            sys.exit(1)
+        
+        print("\n" + "="*80)
+        print("📊 RESULTADO DA IMPORTAÇÃO (EXPORT S3)")
+        print("="*80)
+        print(f"Export:      {stats['file']}")
+        print(f"Tabela:      {stats['table']}")
+        print(f"Arquivos:    {stats['data_files']} ({len(stats['errors'])} com erro)")
+        print(f"Total:       {stats['total_items']} itens")
+        print(f"Sucesso:     {stats['successful']} ✅")
+        print(f"Falhas:      {stats['failed']} ❌")
+        print(f"Tempo:       {stats['elapsed_seconds']:.2f}s")
+        print(f"Velocidade:  {stats['items_per_second']:.1f} itens/s")
+        _print_telemetry(stats)
+        if stats.get('dead_letter'):
+            print(f"Rejeitados:  {stats['dead_letter']}")
+        print("="*80 + "\n")
+        
+        sys.exit(0 if stats['failed'] == 0 and not stats['errors'] else 1)
+    
+    elif args.file:
         if not os.path.exists(args.file):
             logger.error(f"❌ Arquivo não encontrado: {args.file}")
             sys.exit(1)
         
-        stats = importer.import_file(args.file, args.table)
+        if args.schema and not os.path.exists(args.schema):
+            logger.error(f"❌ Arquivo não encontrado: {args.schema}")
+            sys.exit(1)
+        
+        stats = importer.import_file(args.file, args.table, resume=args.resume, schema_file=args.schema)
+        
+        if args.dry_run:
+            _print_dry_run(stats)
+            sys.exit(0 if stats['failed'] == 0 and stats.get('completed', True) else 1)
         
         print("\n" + "="*80)
         print("📊 RESULTADO DA IMPORTAÇÃO")
@@ -116,9 +403,32 @@ ESTRUTURAS JSON SUPORTADAS:
         print(f"Falhas:      {stats['failed']} ❌")
         print(f"Tempo:       {stats['elapsed_seconds']:.2f}s")
         print(f"Velocidade:  {stats['items_per_second']:.1f} itens/s")
+        if stats.get('table_created'):
+            print(f"Criada:      tabela {stats['table']} (chaves {stats['key_schema']})")
+        if stats.get('indexes_created'):
+            print(f"Índices:     {', '.join(stats['indexes_created'])} (criados após a carga)")
+        if stats.get('index_error'):
+            print(f"Índices:     ❌ {stats['index_error']}")
+        if stats.get('error'):
+            print(f"Erro:        {stats['error']}")
+        if stats.get('resumed_from'):
+            print(f"Retomado:    a partir da posição {stats['resumed_from']:,}")
+        if not stats.get('completed', True):
+            print("Status:      ⚠️  interrompido (use --resume para continuar)")
+        if stats.get('parser'):
+            print(f"Parser:      {stats['parser']['backend']} ({stats['parser']['mb_per_second']:.1f} MB/s)")
+        if stats.get('coalesced'):
+            print(f"Repetidas:   {stats['coalesced']} escrita(s) substituída(s) pela seguinte da mesma chave")
+        if stats.get('concurrency', {}).get('throttle_events'):
+            concurrency = stats['concurrency']
+            print(f"Throttling:  {concurrency['throttle_events']} sinal(is), concorrência "
+                  f"{concurrency['limit']}/{concurrency['max_limit']} (mínimo {concurrency['lowest']})")
+        _print_telemetry(stats)
+        if stats.get('dead_letter'):
+            print(f"Rejeitados:  {stats['dead_letter']} (reimporte com --dead-letter)")
         print("="*80 + "\n")
         
-        sys.exit(0 if stats['failed'] == 0 else 1)
+        sys.exit(0 if stats['failed'] == 0 and stats.get('completed', True) else 1)
     
     elif args.dir:
         if not os.path.isdir(args.dir):
@@ -126,7 +436,11 @@ ESTRUTURAS JSON SUPORTADAS:
             sys.exit(1)
         
         import glob
-        files = sorted(glob.glob(os.path.join(args.dir, args.pattern)))
+        # Incluir versões compactadas dos arquivos (ex: *-dump.json.gz)
+        files = set()
+        for suffix in ('',) + tuple(COMPRESSION_EXTENSIONS):
+            files.update(glob.glob(os.path.join(args.dir, args.pattern + suffix)))
+        files = sorted(files)
         
         if not files:
             logger.warning(f"⚠️  Nenhum arquivo encontrado em {args.dir} com padrão '{args.pattern}'")
@@ -134,40 +448,45 @@ ESTRUTURAS JSON SUPORTADAS:
         
         logger.info(f"📂 Encontrados {len(files)} arquivo(s)")
         
-        all_stats = []
-        for file_path in files:
-            stats = importer.import_file(file_path)
-            all_stats.append(stats)
+        directory_import = DirectoryImport(
+            files,
+            create_importer,
+            parallel_files=args.parallel_files,
+            resume=args.resume
+        )
+        
+        dashboard = _Dashboard()
+        if dashboard.live:
+            # Os logs INFO de cada arquivo continuam no arquivo de log; no terminal, só o painel
+            for handler in logging.getLogger().handlers:
+                if isinstance(handler, logging.StreamHandler) and not isinstance(handler, logging.FileHandler):
+                    handler.setLevel(logging.WARNING)
+        directory_import.run_with_monitor(dashboard.render)
         
         # Imprimir resumo
+        rows = directory_import.snapshot()
+        summary = directory_import.summary()
+        
         print("\n" + "="*80)
-        print("📊 RESUMO DAS IMPORTAÇÕES")
+        print("🧪 RESUMO DO DRY-RUN (nada foi escrito)" if args.dry_run else "📊 RESUMO DAS IMPORTAÇÕES")
         print("="*80)
         
-        total_success = 0
-        total_failed = 0
-        total_time = 0
-        
-        for stats in all_stats:
-            total_success += stats['successful']
-            total_failed += stats['failed']
-            total_time += stats['elapsed_seconds']
-            
-            table = stats['table']
-            success = stats['successful']
-            failed = stats['failed']
-            rate = stats['items_per_second']
-            
-            status = "✅" if failed == 0 else "⚠️"
-            print(f"{status} {table:30} | {success:8} ok | {failed:6} erros | {rate:8.1f} itens/s")
+        for row in rows:
+            status = _STATUS_ICONS[row['status']]
+            print(f"{status} {row['table']:30} | {row['successful']:8} ok | {row['failed']:6} erros | "
+                  f"{row['items_per_second']:8.1f} itens/s | {row['elapsed_seconds']:7.1f}s")
         
         print("="*80)
-        overall_rate = total_success / total_time if total_time > 0 else 0
-        print(f"🎉 TOTAL: {total_success} itens importados, {total_failed} falhas, "
-              f"{total_time:.1f}s ({overall_rate:.1f} itens/s)")
+        print(f"🎉 TOTAL: {summary['successful']} itens {'válidos' if args.dry_run else 'importados'}, "
+              f"{summary['failed']} falhas, "
+              f"{summary['files']} arquivo(s) ({summary['files_with_errors']} com erro), "
+              f"{summary['elapsed_seconds']:.1f}s ({summary['items_per_second']:.1f} itens/s)")
+        if summary['concurrency']['throttle_events']:
+            print(f"   Throttling: {summary['concurrency']['throttle_events']} sinal(is), concorrência mínima "
+                  f"{summary['concurrency']['lowest']}/{summary['concurrency']['max_limit']}")
         print("="*80 + "\n")
         
-        sys.exit(0 if total_failed == 0 else 1)
+        sys.exit(0 if summary['failed'] == 0 and summary['files_with_errors'] == 0 else 1)
 
 
 if __name__ == '__main__':
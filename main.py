@@ -5,6 +5,7 @@ Similar à interface AWS Console
 """
 import sys
 import os
+import multiprocessing
 
 # Suporte a PyInstaller (executável empacotado)
 if getattr(sys, "frozen", False):
@@ -48,4 +49,6 @@ def main():
 
 
 if __name__ == "__main__":
+    # Necessário para os processos de conversão do importador no executável (PyInstaller)
+    multiprocessing.freeze_support()
     main()
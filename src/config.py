@@ -14,6 +14,10 @@ class Config:
     DYNAMODB_ACCESS_KEY = os.getenv("DYNAMODB_ACCESS_KEY", "local")
     DYNAMODB_SECRET_KEY = os.getenv("DYNAMODB_SECRET_KEY", "local")
     
+    # Bulk delete-by-filter (somente modo local)
+    BULK_DELETE_WRITE_BUDGET = int(os.getenv("DYNAMODB_DELETE_WRITE_BUDGET", "1000"))  # itens/s, 0 = sem limite
+    BULK_DELETE_SEGMENTS = int(os.getenv("DYNAMODB_DELETE_SEGMENTS", "4"))
+    
     # UI Settings
     WINDOW_WIDTH = 1400
     WINDOW_HEIGHT = 800
@@ -1,5 +1,7 @@
 """Models module"""
 
 from .filter_row import FilterRow
+from .result_store import ResultStore
+from .search_index import SearchIndex
 
-__all__ = ["FilterRow"]
+__all__ = ["FilterRow", "ResultStore", "SearchIndex"]
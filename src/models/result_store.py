@@ -0,0 +1,326 @@
+"""Columnar in-memory store for query results"""
+
+from array import array
+from decimal import Decimal
+from itertools import compress
+
+
+_MISSING = object()
+
+# Inteiros exatos num double (para promover uma coluna 'q' de Decimals a 'd')
+_MAX_EXACT_FLOAT_INT = 2 ** 53
+
+
+class ResultStore:
+    """Armazenamento colunar compacto dos itens carregados
+
+    Os nomes de atributo ficam num dicionário de colunas compartilhado (em vez
+    de repetidos em cada dict), e cada coluna é um vetor indexado pelo id da
+    linha. Colunas só com inteiros ou só com floats usam ``array`` (8 bytes por
+    valor); as demais guardam objetos Python, com strings repetidas
+    compartilhadas. Colunas de ``Decimal`` (números do boto3) também usam
+    ``array`` enquanto os valores cabem sem perda (inteiros em 'q', os demais
+    em 'd') e voltam como ``Decimal`` na leitura. Ids de linha são estáveis:
+    deletar apenas marca a linha como removida, em O(1).
+    """
+
+    # Acima disso uma coluna de strings deixa de deduplicar valores
+    MAX_POOLED_STRINGS = 4096
+    MAX_POOLED_STRING_LENGTH = 64
+
+    def __init__(self, items=None):
+        """Initialize store
+
+        Args:
+            items: Optional iterable of item dictionaries to append
+        """
+        self._columns = {}
+        self._names = []
+        self._data = []
+        self._present = []
+        self._decimal = []
+        self._pools = []
+        self._alive = bytearray()
+        self._count = 0
+
+        if items:
+            self.extend(items)
+
+    def __len__(self):
+        return self._count
+
+    def __contains__(self, row_id):
+        return 0 <= row_id < len(self._alive) and self._alive[row_id] == 1
+
+    @property
+    def columns(self):
+        """Sorted list of attribute names seen in the store"""
+        return sorted(self._names)
+
+    def append(self, item):
+        """Append an item
+
+        Args:
+            item: Item dictionary
+
+        Returns:
+            int: Row id of the new row
+        """
+        row_id = len(self._alive)
+        self._alive.append(1)
+        self._count += 1
+
+        for index, column in enumerate(self._data):
+            if isinstance(column, list):
+                column.append(_MISSING)
+            else:
+                column.append(0)
+                self._present[index].append(0)
+
+        for name, value in item.items():
+            index = self._columns.get(name)
+            if index is None:
+                index = self._add_column(name, value, row_id + 1)
+            self._store(index, row_id, value)
+
+        return row_id
+
+    def extend(self, items):
+        """Append several items
+
+        Args:
+            items: Iterable of item dictionaries
+
+        Returns:
+            list: Row ids, in the same order as items
+        """
+        return [self.append(item) for item in items]
+
+    def delete(self, row_id):
+        """Delete a row, keeping every other row id valid
+
+        Args:
+            row_id: Row id to delete
+
+        Returns:
+            bool: True if the row existed
+        """
+        if row_id not in self:
+            return False
+
+        self._alive[row_id] = 0
+        self._count -= 1
+        for column in self._data:
+            if isinstance(column, list):
+                column[row_id] = _MISSING
+        return True
+
+    def clear(self):
+        """Remove all rows and columns"""
+        self.__init__()
+
+    def ids(self):
+        """List live row ids in insertion order"""
+        return list(compress(range(len(self._alive)), self._alive))
+
+    def get(self, row_id, default=None):
+        """Materialize a row as an item dictionary
+
+        Args:
+            row_id: Row id
+            default: Returned when the row does not exist
+
+        Returns:
+            dict: Item dictionary
+        """
+        if row_id not in self:
+            return default
+
+        item = {}
+        for index, name in enumerate(self._names):
+            value = self._cell(index, row_id)
+            if value is not _MISSING:
+                item[name] = value
+        return item
+
+    def value(self, row_id, name, default=None):
+        """Get a single attribute value of a row
+
+        Args:
+            row_id: Row id
+            name: Attribute name
+            default: Returned when the attribute is missing
+
+        Returns:
+            Attribute value or default
+        """
+        index = self._columns.get(name)
+        if index is None or row_id not in self:
+            return default
+        value = self._cell(index, row_id)
+        return default if value is _MISSING else value
+
+    def row_values(self, row_id, names, default=None):
+        """Get several attribute values of a row, in the given order"""
+        return [self.value(row_id, name, default) for name in names]
+
+    def column_values(self, name):
+        """Iterate over the present values of a column in live rows"""
+        index = self._columns.get(name)
+        if index is None:
+            return
+        for row_id in self.ids():
+            value = self._cell(index, row_id)
+            if value is not _MISSING:
+                yield value
+
+    def cells(self, name, row_ids):
+        """Iterate over (row_id, value) of a column for the given rows
+
+        Rows that are deleted or do not have the attribute are skipped.
+        """
+        index = self._columns.get(name)
+        if index is None:
+            return
+        alive = self._alive
+        column = self._data[index]
+        if isinstance(column, list):
+            for row_id in row_ids:
+                value = column[row_id]
+                if value is not _MISSING:
+                    yield row_id, value
+            return
+        present = self._present[index]
+        decimal = self._decimal[index]
+        for row_id in row_ids:
+            if present[row_id] and alive[row_id]:
+                value = column[row_id]
+                yield row_id, _unpack_decimal(value) if decimal else value
+
+    def rows(self):
+        """Iterate over (row_id, item) pairs of live rows"""
+        for row_id in self.ids():
+            yield row_id, self.get(row_id)
+
+    def _cell(self, index, row_id):
+        """Raw value of a cell, or _MISSING"""
+        column = self._data[index]
+        if isinstance(column, list):
+            return column[row_id]
+        if not self._present[index][row_id]:
+            return _MISSING
+        if self._decimal[index]:
+            return _unpack_decimal(column[row_id])
+        return column[row_id]
+
+    def _add_column(self, name, value, size):
+        """Create a column typed after its first value, padded to size rows"""
+        index = len(self._names)
+        self._columns[name] = index
+        self._names.append(name)
+
+        typecode, decimal = None, False
+        if type(value) is int:
+            typecode = 'q'
+        elif type(value) is float:
+            typecode = 'd'
+        elif type(value) is Decimal:
+            decimal = True
+            if _pack_number(value, 'q', True) is not _MISSING:
+                typecode = 'q'
+            elif _pack_number(value, 'd', True) is not _MISSING:
+                typecode = 'd'
+
+        if typecode:
+            self._data.append(array(typecode, bytes(8 * size)))
+            self._present.append(bytearray(size))
+        else:
+            self._data.append([_MISSING] * size)
+            self._present.append(None)
+        self._decimal.append(decimal and typecode is not None)
+        self._pools.append({})
+        return index
+
+    def _store(self, index, row_id, value):
+        """Write a cell, falling back to an object column when needed"""
+        column = self._data[index]
+
+        if not isinstance(column, list):
+            decimal = self._decimal[index]
+            packed = _pack_number(value, column.typecode, decimal)
+            if (packed is _MISSING and decimal and column.typecode == 'q'
+                    and _pack_number(value, 'd', True) is not _MISSING
+                    and self._to_float_column(index)):
+                # Decimal fracionário numa coluna de Decimals inteiros
+                column = self._data[index]
+                packed = _pack_number(value, 'd', True)
+            if packed is not _MISSING:
+                try:
+                    column[row_id] = packed
+                    self._present[index][row_id] = 1
+                    return
+                except OverflowError:
+                    pass
+            column = self._to_object_column(index)
+
+        if type(value) is str and len(value) <= self.MAX_POOLED_STRING_LENGTH:
+            pool = self._pools[index]
+            if pool is not None:
+                value = pool.setdefault(value, value)
+                if len(pool) > self.MAX_POOLED_STRINGS:
+                    self._pools[index] = None
+
+        column[row_id] = value
+
+    def _to_float_column(self, index):
+        """Convert an integral Decimal column ('q') to 'd', if every value stays exact
+
+        Returns:
+            bool: True if converted
+        """
+        column = self._data[index]
+        if any(abs(value) > _MAX_EXACT_FLOAT_INT for value in column):
+            return False
+        self._data[index] = array('d', column)
+        return True
+
+    def _to_object_column(self, index):
+        """Convert a numeric column to a list of Python objects"""
+        column = self._data[index]
+        present = self._present[index]
+        unpack = _unpack_decimal if self._decimal[index] else None
+        converted = [
+            (unpack(value) if unpack else value) if flag else _MISSING
+            for value, flag in zip(column, present)
+        ]
+        self._data[index] = converted
+        self._present[index] = None
+        self._decimal[index] = False
+        return converted
+
+
+def _pack_number(value, typecode, decimal):
+    """Value to store in an array column of typecode, or _MISSING if it does not fit
+
+    Args:
+        value: Cell value
+        typecode: 'q' or 'd'
+        decimal: Column of Decimals (integral ones in 'q', others in 'd' without loss)
+    """
+    if not decimal:
+        expected = int if typecode == 'q' else float
+        return value if type(value) is expected else _MISSING
+
+    if type(value) is not Decimal or not value.is_finite():
+        return _MISSING
+    if typecode == 'q':
+        return int(value) if value == value.to_integral_value() else _MISSING
+    number = float(value)
+    return number if Decimal(repr(number)) == value else _MISSING
+
+
+def _unpack_decimal(number):
+    """Decimal from a packed 'q' or 'd' value"""
+    if type(number) is float:
+        return Decimal(int(number)) if number.is_integer() else Decimal(repr(number))
+    return Decimal(number)
@@ -0,0 +1,262 @@
+"""In-memory quick-search index over loaded results"""
+
+import json
+import re
+from array import array
+from bisect import bisect_right
+from decimal import Decimal
+
+
+_TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+_JSON_ENCODER = json.JSONEncoder(ensure_ascii=False, default=str)
+
+
+class SearchIndex:
+    """Índice incremental de tokens para busca rápida nos itens carregados
+
+    Cada linha é indexada pelos tokens (sequências alfanuméricas) dos seus
+    valores. Uma busca por substring percorre apenas o vocabulário de tokens
+    (muito menor que o número de linhas) e une as listas de linhas dos tokens
+    que contêm o termo. Buscas que estendem a anterior (usuário digitando)
+    reaproveitam os tokens já filtrados, então cada tecla custa pouco.
+
+    O índice não guarda cópia do texto das linhas: o vocabulário fica numa
+    única string (um token por linha) e cada token aponta para um id solto
+    ou um ``array`` de ids. Frases com espaço ou pontuação são conferidas
+    apenas nas linhas candidatas, lidas do ResultStore.
+    """
+
+    # Valores maiores que isso são indexados apenas até este limite
+    MAX_VALUE_CHARS = 512
+
+    def __init__(self, store):
+        """Initialize an empty index
+
+        Args:
+            store: ResultStore whose rows are indexed (used to check phrases)
+        """
+        self._store = store
+        self._vocab = ""
+        self._starts = array('I', [0])
+        self._rows = []
+        self._pending = {}
+        self._removed = set()
+        self._count = 0
+        self._last_term = None
+        self._last_tokens = None
+
+    def __len__(self):
+        return self._count
+
+    @classmethod
+    def value_text(cls, value):
+        """Build the lowercase searchable text of an attribute value"""
+        if isinstance(value, (dict, list)):
+            value = _JSON_ENCODER.encode(value)
+        elif isinstance(value, Decimal):
+            value = float(value)
+        return str(value)[:cls.MAX_VALUE_CHARS].lower()
+
+    @classmethod
+    def row_text(cls, item):
+        """Build the lowercase searchable text of an item
+
+        Args:
+            item: Item dictionary
+
+        Returns:
+            str: One line per attribute value
+        """
+        return "\n".join(cls.value_text(value) for value in item.values())
+
+    def add(self, row_id, item):
+        """Index a new row
+
+        Row ids are not reused (as in ResultStore). Para cargas grandes use
+        add_many, que compacta o vocabulário no final.
+
+        Args:
+            row_id: Stable row identifier
+            item: Item dictionary
+        """
+        pending = self._pending
+        for token in set(_TOKEN_RE.findall(self.row_text(item))):
+            ids = pending.get(token)
+            if ids is None:
+                pending[token] = row_id
+            elif type(ids) is int:
+                pending[token] = array('I', (ids, row_id))
+            else:
+                ids.append(row_id)
+        self._count += 1
+        self._reset_cache()
+
+    def add_many(self, rows):
+        """Index several rows and compact the vocabulary
+
+        Args:
+            rows: Iterable of (row_id, item) pairs
+        """
+        for row_id, item in rows:
+            self.add(row_id, item)
+        self._compact()
+
+    def remove(self, row_id):
+        """Remove a row from the search results
+
+        Args:
+            row_id: Row identifier
+        """
+        if row_id not in self._removed:
+            self._removed.add(row_id)
+            self._count -= 1
+
+    def clear(self):
+        """Remove all rows"""
+        self.__init__(self._store)
+
+    def search(self, query):
+        """Find rows whose values contain the query
+
+        Todos os termos da consulta precisam aparecer (AND). Se a consulta
+        tiver espaços ou pontuação, o texto exato é conferido nas linhas
+        candidatas.
+
+        Args:
+            query: Text typed by the user
+
+        Returns:
+            set or None: Matching row ids, or None when the query is empty
+        """
+        phrase = (query or "").strip().lower()
+        if not phrase:
+            return None
+
+        terms = _TOKEN_RE.findall(phrase)
+        if not terms:
+            # Só pontuação: não há tokens para filtrar as candidatas
+            return self._matching_rows(phrase, self._store.ids())
+
+        result = None
+        for term in sorted(set(terms), key=len, reverse=True):
+            ids = set()
+            for posting in self._matching_postings(term):
+                if type(posting) is int:
+                    ids.add(posting)
+                else:
+                    ids.update(posting)
+            result = ids if result is None else result & ids
+            if not result:
+                return set()
+
+        result -= self._removed
+        if len(terms) > 1 or terms[0] != phrase:
+            result = self._matching_rows(phrase, result)
+
+        return result
+
+    def _matching_rows(self, phrase, row_ids):
+        """Return the rows among row_ids with an attribute value containing phrase
+
+        Confere coluna por coluna, com o resultado guardado por valor, então
+        valores repetidos (status, cidade, números) são convertidos uma vez só.
+        """
+        store = self._store
+        remaining = set(row_ids) - self._removed
+        found = set()
+        value_text = self.value_text
+        max_chars = self.MAX_VALUE_CHARS
+
+        for name in store.columns:
+            if not remaining:
+                break
+            seen = {}
+            hits = []
+            for row_id, value in store.cells(name, remaining):
+                if type(value) is str:
+                    hit = seen.get(value)
+                    if hit is None:
+                        hit = seen[value] = phrase in value[:max_chars].lower()
+                elif isinstance(value, (dict, list)):
+                    hit = phrase in value_text(value)
+                else:
+                    # Chave com o tipo: True, 1 e Decimal(1) têm textos diferentes
+                    key = (type(value), value)
+                    hit = seen.get(key)
+                    if hit is None:
+                        hit = seen[key] = phrase in value_text(value)
+                if hit:
+                    hits.append(row_id)
+            found.update(hits)
+            remaining.difference_update(hits)
+
+        return found
+
+    def _matching_postings(self, term):
+        """Return the postings of indexed tokens containing term"""
+        rows = self._rows
+        pending = self._pending
+        token_ids, tokens = self._matching_tokens(term)
+        return [rows[i] for i in token_ids] + [pending[token] for token in tokens]
+
+    def _matching_tokens(self, term):
+        """Return (vocabulary ids, pending tokens) containing term, reusing the last lookup"""
+        vocab, starts = self._vocab, self._starts
+
+        if self._last_term is not None and self._last_term in term:
+            last_ids, last_tokens = self._last_tokens
+            token_ids = [i for i in last_ids if term in vocab[starts[i]:starts[i + 1] - 1]]
+            tokens = [token for token in last_tokens if term in token]
+        else:
+            # Busca direto na string do vocabulário, pulando para o token seguinte a cada achado
+            token_ids = []
+            position = vocab.find(term)
+            while position != -1:
+                i = bisect_right(starts, position) - 1
+                token_ids.append(i)
+                position = vocab.find(term, starts[i + 1])
+            tokens = [token for token in self._pending if term in token]
+
+        self._last_term = term
+        self._last_tokens = (token_ids, tokens)
+        return token_ids, tokens
+
+    def _compact(self):
+        """Merge pending tokens into the vocabulary string"""
+        if not self._pending:
+            return
+
+        vocab, starts = self._vocab, self._starts
+        tokens = [vocab[starts[i]:starts[i + 1] - 1] for i in range(len(self._rows))]
+        token_ids = {token: i for i, token in enumerate(tokens)}
+        rows = self._rows
+
+        for token, posting in self._pending.items():
+            i = token_ids.get(token)
+            if i is None:
+                tokens.append(token)
+                rows.append(posting)
+                continue
+            current = rows[i]
+            if type(current) is int:
+                current = rows[i] = array('I', (current,))
+            if type(posting) is int:
+                current.append(posting)
+            else:
+                current.extend(posting)
+
+        del token_ids
+        self._pending = {}
+        self._vocab = "".join(token + "\n" for token in tokens)
+        starts = array('I', [0])
+        offset = 0
+        for token in tokens:
+            offset += len(token) + 1
+            starts.append(offset)
+        self._starts = starts
+        self._reset_cache()
+
+    def _reset_cache(self):
+        """Invalidate the incremental lookup cache"""
+        self._last_term = None
+        self._last_tokens = None
@@ -0,0 +1,108 @@
+"""AIMD concurrency limit for parallel writes, driven by throttling feedback"""
+
+import threading
+import time
+from typing import Any, Dict
+
+
+class AdaptiveConcurrency:
+    """Limite de chamadas simultâneas ajustado por AIMD, seguro para várias threads
+
+    Cada chamada bem-sucedida soma 1/limite ao limite (ou seja, +1 a cada
+    "janela" de ``limite`` sucessos: aumento aditivo). Cada sinal de
+    throttling multiplica o limite por ``DECREASE_FACTOR`` (redução
+    multiplicativa), no máximo uma vez por ``DECREASE_COOLDOWN`` segundos,
+    para que as várias chamadas em voo que recebem o mesmo throttling não
+    derrubem o limite de uma vez.
+
+    Uso::
+
+        with limit:
+            client.batch_write_item(...)
+    """
+
+    DECREASE_FACTOR = 0.5
+    DECREASE_COOLDOWN = 1.0  # segundos
+
+    def __init__(self, max_limit: int, min_limit: int = 1, initial: int = None):
+        """
+        Args:
+            max_limit: Máximo de chamadas simultâneas (ex: número de threads escritoras)
+            min_limit: Mínimo de chamadas simultâneas
+            initial: Limite inicial (padrão: max_limit)
+        """
+        self.max_limit = max(1, int(max_limit))
+        self.min_limit = max(1, min(int(min_limit), self.max_limit))
+        self.limit = float(min(self.max_limit, max(self.min_limit, initial or self.max_limit)))
+        self.in_flight = 0
+        self.throttle_events = 0
+        self.decreases = 0
+        self.lowest = self.limit
+
+        self._condition = threading.Condition()
+        self._last_decrease = 0.0
+
+    @property
+    def current(self) -> int:
+        """Chamadas simultâneas permitidas agora"""
+        return int(self.limit)
+
+    def acquire(self):
+        """Bloqueia até haver uma vaga dentro do limite atual"""
+        with self._condition:
+            while self.in_flight >= int(self.limit):
+                self._condition.wait()
+            self.in_flight += 1
+
+    def release(self):
+        """Libera a vaga de uma chamada terminada"""
+        with self._condition:
+            self.in_flight -= 1
+            self._condition.notify()
+
+    def __enter__(self):
+        self.acquire()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.release()
+        return False
+
+    def on_success(self):
+        """Registra uma chamada sem throttling (aumento aditivo)"""
+        with self._condition:
+            if self.limit >= self.max_limit:
+                return
+            previous = int(self.limit)
+            self.limit = min(float(self.max_limit), self.limit + 1.0 / self.limit)
+            if int(self.limit) > previous:
+                self._condition.notify()
+
+    def on_throttle(self) -> bool:
+        """
+        Registra um sinal de throttling (redução multiplicativa).
+
+        Returns:
+            True se o limite foi reduzido agora
+        """
+        with self._condition:
+            self.throttle_events += 1
+            now = time.monotonic()
+            if now - self._last_decrease < self.DECREASE_COOLDOWN or self.limit <= self.min_limit:
+                return False
+            self._last_decrease = now
+            self.limit = max(float(self.min_limit), self.limit * self.DECREASE_FACTOR)
+            self.lowest = min(self.lowest, self.limit)
+            self.decreases += 1
+            return True
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Estado atual para estatísticas"""
+        with self._condition:
+            return {
+                'limit': int(self.limit),
+                'max_limit': self.max_limit,
+                'lowest': int(self.lowest),
+                'throttle_events': self.throttle_events,
+                'decreases': self.decreases,
+            }
@@ -7,13 +7,32 @@ import json
 import boto3
 import time
 import os
+import queue
+import threading
+import multiprocessing
+import random
+from collections import deque
+from itertools import islice
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 from typing import Iterator, List, Dict, Any, Callable, Optional, Tuple
 from datetime import datetime
 import logging
-from decimal import Decimal
-from boto3.dynamodb.types import TypeSerializer
-import math
+from botocore.config import Config as BotoConfig
+from botocore.exceptions import ClientError, ConnectionError as BotoConnectionError, HTTPClientError
+
+from src.services import compressed_input, dead_letter, ndjson_reader, s3_export, table_schema
+from src.services.adaptive_concurrency import AdaptiveConcurrency
+from src.services.dead_letter import DeadLetterWriter
+from src.services.import_checkpoint import ImportCheckpoint
+from src.services.import_progress import ProgressEstimate, format_eta
+from src.services.import_telemetry import ImportTelemetry, ItemSizeDistribution
+from src.services.partition_spread import hash_key_name, reorder_window
+from src.services.item_converter import (
+    DUPLICATE_POLICIES, ON_DUPLICATE_COALESCE, ItemConverter, convert_chunk, dynamodb_item_size,
+    write_capacity_units
+)
+from src.services.rate_limiter import RateLimiter
 
 try:
     from tqdm import tqdm
@@ -28,20 +47,229 @@ except ImportError:
     HAS_IJSON = False
 
 
+def _load_ijson_backend():
+    """Escolhe o backend ijson mais rápido disponível (C primeiro)."""
+    for name in ('yajl2_c', 'yajl2_cffi', 'yajl2', 'python'):
+        try:
+            return ijson.get_backend(name)
+        except Exception:
+            continue
+    return ijson
+
+
+IJSON_BACKEND = _load_ijson_backend() if HAS_IJSON else None
+
+
 # Configuração de logging
 logger = logging.getLogger('DynamoDBBatchImporter')
 
 
-class DynamoDBBatchImporter:
+def _key_value(value: Any) -> Any:
+    """Valor hashable de um atributo de chave (Python ou AttributeValue)"""
+    if type(value) is dict and len(value) == 1:
+        value = next(iter(value.values()))
+    if type(value) is str:
+        return value
+    try:
+        hash(value)
+        return value
+    except TypeError:
+        return json.dumps(value, sort_keys=True, default=str)
+
+
+def _batch_key_function(key_attrs: Optional[Dict[str, str]]) -> Optional[Callable[[List[Dict[str, Any]]], set]]:
+    """
+    Função que devolve as chaves primárias de um lote (PutRequests ou itens
+    ainda não convertidos), para _BatchWriterPool manter a ordem das escritas
+    de uma mesma chave. Itens sem algum atributo da chave ficam de fora (serão
+    rejeitados na escrita e não devem segurar outros lotes). None se a chave
+    da tabela é desconhecida.
+    """
+    if not key_attrs:
+        return None
+    key_names = list(key_attrs)
+
+    def item_of(entry: Any) -> Dict[str, Any]:
+        if type(entry) is not dict:
+            return {}
+        put = entry.get('PutRequest')
+        if put is not None and len(entry) == 1:
+            return put.get('Item') or {}
+        return entry
+
+    if len(key_names) == 1:
+        name, = key_names
+
+        def batch_keys(batch: List[Dict[str, Any]]) -> set:
+            keys = set()
+            for entry in batch:
+                value = item_of(entry).get(name)
+                if value is not None:
+                    keys.add(_key_value(value))
+            return keys
+        return batch_keys
+
+    def batch_keys(batch: List[Dict[str, Any]]) -> set:
+        keys = set()
+        for entry in batch:
+            item = item_of(entry)
+            values = [item.get(name) for name in key_names]
+            if None not in values:
+                keys.add(tuple(_key_value(value) for value in values))
+        return keys
+    return batch_keys
+
+
+class _BatchWriterPool:
+    """Pool de threads escritoras alimentado por uma fila limitada de lotes.
+
+    O leitor (thread principal) continua fazendo streaming do arquivo enquanto
+    até ``num_workers`` chamadas batch_write_item ficam em voo. A fila limitada
+    impede que o leitor acumule lotes na memória quando a escrita é mais lenta.
+
+    Com ``batch_keys``, um lote que repete a chave de um lote anterior ainda em
+    voo espera a confirmação dele antes de ser escrito: a última escrita de
+    cada chave no arquivo é a que fica na tabela (ex: --on-duplicate flush, ou
+    a mesma chave em blocos de conversão diferentes).
+    """
+
+    def __init__(self, write_batch: Callable[[List[Dict[str, Any]]], Tuple[int, int]],
+                 num_workers: int,
+                 on_batch_done: Callable[[int, int, int], None],
+                 batch_keys: Optional[Callable[[List[Dict[str, Any]]], set]] = None):
+        """
+        Args:
+            write_batch: Função que escreve um lote e retorna (sucesso, falhas)
+            num_workers: Número de threads escritoras
+            on_batch_done: Callback(tamanho_do_lote, sucesso, falhas), chamado pelas threads
+            batch_keys: Função que devolve as chaves primárias de um lote (ver _batch_key_function)
+        """
+        self.write_batch = write_batch
+        self.on_batch_done = on_batch_done
+        self.batch_keys = batch_keys
+        self.queue = queue.Queue(maxsize=num_workers * 2)
+        # Ordem por chave: lotes numerados na ordem da fila (_submit_lock), e
+        # para cada chave o último lote enfileirado com ela que ainda não terminou
+        self._submit_lock = threading.Lock()
+        self._order = threading.Condition()
+        self._next_seq = 0
+        self._last_batch_for_key: Dict[Any, int] = {}
+        self._pending: set = set()
+        self.threads = [
+            threading.Thread(target=self._run, name=f"batch-writer-{i}", daemon=True)
+            for i in range(num_workers)
+        ]
+        for thread in self.threads:
+            thread.start()
+
+    def submit(self, batch: List[Dict[str, Any]],
+               on_done: Optional[Callable[[int, int], None]] = None):
+        """
+        Enfileira um lote (bloqueia se a fila estiver cheia).
+        
+        Args:
+            batch: Lote a escrever
+            on_done: Callback(sucesso, falhas) chamado depois que este lote terminou
+        """
+        if self.batch_keys is None:
+            self.queue.put((batch, on_done, None, (), ()))
+            return
+        keys = self.batch_keys(batch)
+        # Mesma ordem de numeração e de fila, senão uma thread poderia esperar
+        # por um lote que ainda nem foi enfileirado
+        with self._submit_lock:
+            with self._order:
+                seq = self._next_seq
+                self._next_seq += 1
+                last = self._last_batch_for_key
+                after = {last[key] for key in keys if key in last}
+                for key in keys:
+                    last[key] = seq
+                self._pending.add(seq)
+            self.queue.put((batch, on_done, seq, keys, after))
+
+    def _release(self, seq: int, keys: set):
+        with self._order:
+            self._pending.discard(seq)
+            last = self._last_batch_for_key
+            for key in keys:
+                if last.get(key) == seq:
+                    del last[key]
+            self._order.notify_all()
+
+    def close(self):
+        """Espera todos os lotes enfileirados serem escritos."""
+        for _ in self.threads:
+            self.queue.put(None)
+        for thread in self.threads:
+            thread.join()
+
+    def _run(self):
+        while True:
+            job = self.queue.get()
+            if job is None:
+                return
+            batch, on_done, seq, keys, after = job
+            if after:
+                # Lotes anteriores com as mesmas chaves já saíram da fila (ordem FIFO)
+                with self._order:
+                    self._order.wait_for(lambda: self._pending.isdisjoint(after))
+            try:
+                success, failed = self.write_batch(batch)
+            except Exception as e:
+                logger.error(f"❌ Erro inesperado na thread escritora: {e}")
+                success, failed = 0, len(batch)
+            if seq is not None:
+                self._release(seq, keys)
+            try:
+                self.on_batch_done(len(batch), success, failed)
+                if on_done:
+                    on_done(success, failed)
+            except Exception as e:
+                # A thread não pode morrer: o leitor ficaria bloqueado na fila
+                logger.error(f"❌ Erro ao registrar progresso do lote: {e}")
+
+
+class DynamoDBBatchImporter(ItemConverter):
     """Importador otimizado de dados para DynamoDB com suporte a arquivos grandes."""
     
     BATCH_SIZE = 25  # Limite do DynamoDB
-    MAX_RETRIES = 3
+    MAX_RETRIES = 5  # Erros transitórios seguidos (servidor/conexão) antes de desistir de um lote
+    MAX_THROTTLED_SECONDS = 600  # Tempo sob throttling SEM progresso antes de desistir de um lote
     INITIAL_BACKOFF = 0.5  # segundos
+    MAX_BACKOFF = 20.0  # segundos
+    # Fração de UnprocessedItems num lote a partir da qual o lote conta como throttling
+    UNPROCESSED_THROTTLE_RATIO = 0.1
+    THROTTLING_ERROR_CODES = (
+        'ProvisionedThroughputExceededException',
+        'ThrottlingException',
+        'RequestLimitExceeded',
+    )
+    TRANSIENT_ERROR_CODES = (
+        'InternalServerError',
+        'ServiceUnavailable',
+        'InternalFailure',
+    )
+    DEFAULT_WORKERS = 4
+    CONVERT_CHUNK_SIZE = 1000  # Itens enviados de uma vez a um processo de conversão
+    NDJSON_RANGE_SIZE = 8 * 1024 * 1024  # Bytes de JSON Lines por tarefa de processo (máximo)
+    NDJSON_MIN_RANGE_SIZE = 256 * 1024  # Faixa mínima (custo de uma tarefa de processo)
+    NDJSON_CHECKPOINT_RANGES = 64  # Faixas por arquivo, no mínimo: cada faixa é uma unidade do checkpoint
+    EXPORT_FILE_READERS = 4  # Arquivos de dados de um export S3 lidos em paralelo
+    PROGRESS_EVERY = 100  # Itens lidos entre atualizações da posição de leitura (bytes)
+    SCHEMA_SAMPLE_SIZE = 1000  # Itens lidos para inferir a chave de uma tabela criada
+    TABLE_WAIT_SECONDS = 300  # Espera máxima pela tabela criada ficar ACTIVE
+    INDEX_WAIT_SECONDS = 3600  # Espera máxima por cada GSI criado após a carga
+    # Chaves de objetos wrapper que contêm a lista de itens, em ordem de prioridade
+    WRAPPER_KEYS = ('Items', 'items', 'Records', 'records', 'data', 'Data',
+                    'MessageGroup', 'messages', 'Messages', 'Rows', 'rows')
     
     def __init__(self, endpoint_url: str, region_name: str = 'us-east-1',
                  access_key_id: str = None, secret_access_key: str = None,
-                 num_workers: int = 1):
+                 num_workers: int = 1, num_processes: int = 0, allow_full_load: bool = False,
+                 max_wcu_per_second: float = 0, max_items_per_second: float = 0,
+                 create_tables: bool = False, dry_run: bool = False,
+                 on_duplicate: str = ON_DUPLICATE_COALESCE, spread_window: int = 0):
         """
         Inicializa o importador.
         
@@ -50,8 +278,34 @@ class DynamoDBBatchImporter:
             region_name: Região AWS
             access_key_id: AWS Access Key ID (opcional para local)
             secret_access_key: AWS Secret Access Key (opcional para local)
-            num_workers: Número de workers (não implementado ainda)
+            num_workers: Número de threads escritoras (chamadas batch_write_item em paralelo)
+            num_processes: Processos para converter itens em paralelo (0 = converter nas threads)
+            allow_full_load: Permite carregar o arquivo inteiro com json.load quando
+                o streaming não é possível (ijson ausente)
+            max_wcu_per_second: Limite de escrita em WCU/s (1 WCU por KB de item; 0 = sem limite)
+            max_items_per_second: Limite de escrita em itens/s (0 = sem limite)
+            create_tables: Criar tabelas ausentes (só DynamoDB Local), com o schema do
+                arquivo <dump>.schema.json ou inferido de uma amostra do dump
+            dry_run: Executar leitura, limpeza, conversão e validação de chaves sem
+                escrever nada (nem acessar a rede): mede vazão e tamanhos de item
+            on_duplicate: Chave repetida num lote: 'coalesce' (só a última escrita é
+                enviada) ou 'flush' (o lote é fechado antes e as duas são enviadas)
+            spread_window: Reordena os itens de cada arquivo em janelas desse tamanho,
+                alternando as chaves de partição entre os lotes (dumps em ordem de
+                chave concentram cada lote numa partição); 0 = ordem do arquivo.
+                Com processos, a janela é o bloco de conversão (ou a faixa de bytes)
+        
+        Raises:
+            ValueError: create_tables com um endpoint que não é local, ou on_duplicate inválido
         """
+        if create_tables and not self.is_local_endpoint(endpoint_url):
+            raise ValueError("Criação automática de tabelas só é permitida no DynamoDB Local "
+                             "(endpoint localhost ou 127.0.0.1)")
+        if on_duplicate not in DUPLICATE_POLICIES:
+            raise ValueError(f"on_duplicate inválido: {on_duplicate!r} (use {' ou '.join(DUPLICATE_POLICIES)})")
+        num_workers = max(1, int(num_workers or 1))
+        # Uma conexão HTTP por thread escritora (o padrão do botocore é 10)
+        boto_config = BotoConfig(max_pool_connections=max(10, num_workers + 2))
         dynamodb_kwargs = {
             'endpoint_url': endpoint_url,
             'region_name': region_name,
@@ -61,9 +315,41 @@ class DynamoDBBatchImporter:
             dynamodb_kwargs['aws_access_key_id'] = access_key_id
             dynamodb_kwargs['aws_secret_access_key'] = secret_access_key
         
-        self.dynamodb = boto3.client('dynamodb', **dynamodb_kwargs)
-        self.resource = boto3.resource('dynamodb', **dynamodb_kwargs)
+        # Sem retries internos do botocore no cliente de escrita: o throttling
+        # precisa chegar ao controle de concorrência (write_put_requests).
+        # total_max_attempts conta a chamada inicial (max_attempts: 1 ainda faria 2)
+        self.dynamodb = boto3.client(
+            'dynamodb',
+            config=boto_config.merge(BotoConfig(retries={'mode': 'standard', 'total_max_attempts': 1})),
+            **dynamodb_kwargs
+        )
+        self.resource = boto3.resource('dynamodb', config=boto_config, **dynamodb_kwargs)
         self.num_workers = num_workers
+        # Chamadas batch_write_item simultâneas, entre 1 e num_workers (AIMD)
+        self.concurrency = AdaptiveConcurrency(num_workers)
+        # Limites de escrita opcionais (token bucket compartilhado pelas threads)
+        self.wcu_limiter = RateLimiter(max_wcu_per_second)
+        self.items_limiter = RateLimiter(max_items_per_second)
+        self.num_processes = max(0, int(num_processes or 0))
+        self.allow_full_load = allow_full_load
+        self.create_tables = create_tables and not dry_run
+        self.dry_run = dry_run
+        self.on_duplicate = on_duplicate
+        self.spread_window = max(0, int(spread_window or 0))
+        # Escritas substituídas por uma posterior da mesma chave (on_duplicate='coalesce')
+        self.coalesced_items = 0
+        self._coalesced_lock = threading.Lock()
+        self.item_sizes = None  # ItemSizeDistribution do dry-run em andamento
+        self.parse_stats = {}
+        self._skipping_lines = False  # Pulando itens já confirmados no checkpoint (retomada)
+        # Posição do leitor (itens e bytes do arquivo em disco), para progresso/ETA
+        self.read_items = 0
+        self.read_bytes = 0
+        self.current_progress = None  # ProgressEstimate (bytes) da importação em andamento
+        self.telemetry = None  # ImportTelemetry da importação em andamento
+        self.dead_letter = None  # DeadLetterWriter da importação em andamento
+        self.current_stats = None  # Estatísticas da importação em andamento (para painéis)
+        self.show_progress_bar = True
         
         self.stats = {
             'total_items': 0,
@@ -76,7 +362,14 @@ class DynamoDBBatchImporter:
     def stream_json_items(self, file_path: str) -> Iterator[Dict[str, Any]]:
         """
         Lê arquivo JSON de forma eficiente usando streaming.
-        Suporta diferentes estruturas: {Items: []}, {items: []}, {Records: []}, etc.
+        Suporta diferentes estruturas: {Items: []}, {items: []}, {Records: []},
+        JSON Lines (um item por linha), etc.
+        
+        O arquivo é lido em modo binário pelo backend ijson mais rápido
+        disponível. Ao final, backend e vazão do parser ficam em
+        ``self.parse_stats`` ({'backend', 'bytes', 'seconds', 'mb_per_second'}).
+        Durante a leitura, ``self.read_items`` e ``self.read_bytes`` (posição
+        no arquivo em disco, compactado ou não) acompanham o leitor.
         
         Args:
             file_path: Caminho do arquivo JSON
@@ -84,52 +377,148 @@ class DynamoDBBatchImporter:
         Yields:
             Itens do JSON um por um
         """
+        backend = IJSON_BACKEND.backend if HAS_IJSON else 'json.load'
+        self.parse_stats = {'backend': backend, 'bytes': 0, 'seconds': 0.0, 'mb_per_second': 0.0}
+        self.read_items = self.read_bytes = 0
+        parse_seconds = 0.0
+        count = 0
+        
         try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                # Detectar estrutura lendo o primeiro caractere
-                content = f.read(10000)
-                f.seek(0)
-                
-                if content.strip().startswith('['):
+            compression = compressed_input.detect_compression(file_path)
+            if compression:
+                logger.info(f"   Compressão: {compression} (descompactando em streaming)")
+            
+            # Detectar estrutura lendo o início do arquivo
+            content = compressed_input.read_sample(file_path, 10000, compression)
+            
+            with compressed_input.open_input(file_path, compression) as f:
+                if ndjson_reader.is_ndjson(compressed_input.strip_compression_suffix(file_path), content):
+                    # JSON Lines: um item por linha
+                    backend = 'json lines'
+                    self.parse_stats['backend'] = backend
+                    items = ndjson_reader.iter_items(f, on_invalid=self._invalid_line)
+                elif content.strip().startswith(b'['):
                     # É um array direto
-                    yield from self._stream_json_array(f)
+                    items = self._stream_json_array(f)
+                elif HAS_IJSON:
+                    # É um objeto - fazer streaming do array interno ({"Items": [...]})
+                    items = self._stream_json_object(f, file_path)
                 else:
-                    # É um objeto - extrair lista de itens
-                    f.seek(0)
+                    # Sem ijson: carregar o objeto inteiro e extrair lista de itens
+                    items = self._extract_items(self._load_full_json(f))
+                
+                logger.info(f"   Parser: {backend}")
+                
+                # Medir só o tempo gasto dentro do parser (não o do consumidor)
+                while True:
+                    started = time.perf_counter()
                     try:
-                        full_data = json.load(f)
-                        yield from self._extract_items(full_data)
-                    except json.JSONDecodeError as e:
-                        logger.error(f"❌ Erro ao decodificar JSON em {file_path}: {e}")
-                        return
+                        item = next(items)
+                    except StopIteration:
+                        break
+                    finally:
+                        parse_seconds += time.perf_counter() - started
+                    count += 1
+                    if count % self.PROGRESS_EVERY == 0:
+                        self.read_items = count
+                        self.read_bytes = compressed_input.source_position(f)
+                    yield item
+                
+                self.read_items = count
+                self.read_bytes = os.path.getsize(file_path)
+                self._finish_parse_stats(f.tell(), parse_seconds)
                     
         except FileNotFoundError:
             logger.error(f"❌ Arquivo não encontrado: {file_path}")
+            self.parse_stats['error'] = f"Arquivo não encontrado: {file_path}"
             return
         except Exception as e:
             logger.error(f"❌ Erro ao ler arquivo {file_path}: {e}")
+            self.parse_stats['error'] = f"Erro ao ler arquivo: {e}"
             return
     
+    def _invalid_line(self, reject: Dict[str, Any]):
+        """Conta uma linha JSON Lines inválida e a grava no dead-letter."""
+        if self._skipping_lines:
+            # Antes da posição do checkpoint: já contada e gravada na execução anterior
+            return
+        self.parse_stats['invalid_lines'] = self.parse_stats.get('invalid_lines', 0) + 1
+        self._record_rejects([reject])
+    
+    def _finish_parse_stats(self, bytes_read: int, seconds: float):
+        """Registra e reporta a vazão do parser."""
+        mb = bytes_read / (1024 * 1024)
+        mb_per_second = mb / seconds if seconds > 0 else 0.0
+        self.parse_stats.update({
+            'bytes': bytes_read,
+            'seconds': seconds,
+            'mb_per_second': mb_per_second,
+        })
+        logger.info(f"   Parser {self.parse_stats['backend']}: {mb:.1f} MB em {seconds:.2f}s "
+                    f"({mb_per_second:.1f} MB/s)")
+    
+    def _load_full_json(self, f) -> Any:
+        """Carrega o arquivo inteiro na memória (só com allow_full_load)."""
+        if not self.allow_full_load:
+            raise RuntimeError(
+                "ijson não está instalado e o streaming não é possível. "
+                "Instale ijson ou permita carregar o arquivo inteiro (--allow-full-load)"
+            )
+        logger.warning("⚠️  Carregando o arquivo inteiro na memória (json.load)...")
+        return json.load(f)
+    
     def _stream_json_array(self, f) -> Iterator[Dict[str, Any]]:
         """Faz streaming de um array JSON sem carregar tudo na memória."""
         if HAS_IJSON:
-            try:
-                for item in ijson.items(f, 'item'):
-                    yield item
-                return
-            except Exception:
-                pass
+            # Erros no meio do arquivo são propagados: recarregar tudo
+            # duplicaria os itens já enviados
+            yield from IJSON_BACKEND.items(f, 'item')
+            return
         
-        # Fallback: carregar array inteiro (menos ideal mas funciona)
-        logger.warning("⚠️  Usando fallback para streaming de array (mais lento com arquivos grandes)...")
-        f.seek(0)
-        try:
-            data = json.load(f)
-            if isinstance(data, list):
-                for item in data:
-                    yield item
-        except json.JSONDecodeError as e:
-            logger.error(f"❌ Erro ao decodificar array JSON: {e}")
+        data = self._load_full_json(f)
+        if isinstance(data, list):
+            yield from data
+    
+    def _stream_json_object(self, f, file_path: str) -> Iterator[Dict[str, Any]]:
+        """
+        Faz streaming do array de itens de um objeto wrapper (ex: saída do
+        `aws dynamodb scan`: {"Items": [...], "Count": ...}).
+        
+        A chave wrapper é detectada pelos primeiros eventos do parser e o
+        array interno é lido item a item (prefixo ijson 'Items.item'), então
+        o uso de memória não depende do tamanho do arquivo.
+        """
+        events = IJSON_BACKEND.parse(f)
+        key = self._find_wrapper_key(events)
+        
+        if key is None:
+            # Nenhuma lista conhecida: o objeto inteiro é um único item
+            with compressed_input.open_input(file_path) as single:
+                yield from IJSON_BACKEND.items(single, '')
+            return
+        
+        logger.info(f"   Estrutura detectada: {{\"{key}\": [...]}}")
+        yield from IJSON_BACKEND.items(events, f"{key}.item")
+    
+    def _find_wrapper_key(self, events) -> Optional[str]:
+        """
+        Consome eventos do ijson até o início do array de itens.
+        
+        Returns:
+            Chave wrapper (ex: 'Items') com os eventos posicionados no início
+            do array, ou None se o objeto não tem nenhuma lista conhecida
+        """
+        candidate = None
+        for prefix, event, value in events:
+            if prefix == '' and event == 'map_key':
+                candidate = value if value in self.WRAPPER_KEYS else None
+            elif candidate is not None and prefix == candidate:
+                if event == 'start_array':
+                    return candidate
+                candidate = None
+            elif prefix == '' and event == 'end_map':
+                return None
+        return None
     
     def _extract_items(self, data: Any) -> Iterator[Dict[str, Any]]:
         """Extrai itens de uma estrutura JSON."""
@@ -137,8 +526,7 @@ class DynamoDBBatchImporter:
         
         if isinstance(data, dict):
             # Tenta chaves comuns
-            for key in ['Items', 'items', 'Records', 'records', 'data', 'Data', 
-                       'MessageGroup', 'messages', 'Messages', 'Rows', 'rows']:
+            for key in self.WRAPPER_KEYS:
                 if key in data and isinstance(data[key], list):
                     items = data[key]
                     break
@@ -160,6 +548,10 @@ class DynamoDBBatchImporter:
         """
         Escreve itens em lote com retry automático.
         
+        Itens acima de 400 KB são rejeitados antes do envio, e os PutRequests
+        são divididos em mais de uma chamada se passariam de 16 MB ou se
+        repetem uma chave (ver on_duplicate).
+        
         Args:
             table_name: Nome da tabela DynamoDB
             items: Lista de itens para inserir
@@ -171,84 +563,88 @@ class DynamoDBBatchImporter:
         if not items:
             return 0, 0
         
-        total_items = len(items)
-        request_items = {
-            table_name: []
-        }
+        batches, rejects, coalesced = self.prepare_put_batches(items, key_schema, self.BATCH_SIZE,
+                                                               self.on_duplicate)
+        self._record_rejects(rejects)
+        self._count_coalesced(coalesced)
         
-        # Converter todos os itens e construir requisição
-        for idx, item in enumerate(items):
-            try:
-                converted = self._convert_to_dynamodb_format(item)
-                if converted:  # Só adicionar se não estiver vazio
-                    # Limpar atributos inválidos (strings vazias, NULL, etc) em vez de rejeitar
-                    cleaned = self._clean_dynamodb_item(converted, idx)
-                    if not cleaned:
-                        logger.warning(f"⚠️  Item {idx} ficou vazio após limpeza, pulando")
-                        continue
-                    
-                    # Validar que item tem as chaves obrigatórias
-                    if key_schema:
-                        missing_keys = []
-                        for key_attr, key_type in key_schema.items():
-                            if key_attr not in cleaned:
-                                missing_keys.append(f"'{key_attr}' ({key_type})")
-                        if missing_keys:
-                            logger.error(f"❌ Item {idx}: falta chave(s) obrigatória(s): {', '.join(missing_keys)}")
-                            continue
-                    
-                    request_items[table_name].append({
-                        'PutRequest': {'Item': cleaned}
-                    })
-            except Exception as e:
-                logger.error(f"❌ Erro ao converter item {idx}: {e}")
-                if logger.isEnabledFor(logging.DEBUG):
-                    logger.debug(f"   Item problemático: {json.dumps(item, default=str)[:500]}")
-                continue
-        
-        if not request_items[table_name]:
+        if not batches:
             logger.warning(f"⚠️  Nenhum item válido para inserir em {table_name}")
             return 0, len(items)
         
+        # Escritas substituídas contam como feitas: a tabela fica igual
+        successful, failed = coalesced, len(rejects)
+        for batch in batches:
+            batch_successful, batch_failed = self.write_put_requests(table_name, batch)
+            successful += batch_successful
+            failed += batch_failed
+        return successful, failed
+    
+    def write_put_requests(self, table_name: str, requests: List[Dict[str, Any]]) -> Tuple[int, int]:
+        """
+        Envia PutRequests já convertidos com retry automático.
+        
+        Args:
+            table_name: Nome da tabela DynamoDB
+            requests: Lista de {'PutRequest': {'Item': ...}} (um lote de pack_batches:
+                até BATCH_SIZE itens e 16 MB, sem itens acima de 400 KB)
+            
+        Returns:
+            (quantidade de itens inseridos, quantidade de falhas)
+        """
+        if not requests:
+            return 0, 0
+        if self.dry_run:
+            return self._dry_run_write(requests)
+        
+        request_items = {
+            table_name: requests
+        }
+        
+        batch_started = time.perf_counter()
         successful = 0
         failed = 0
-        retries = 0
+        retries = 0  # erros transitórios seguidos
+        throttled_since = None  # início do throttling sem progresso
+        attempt = 0
+        last_error = None
         
-        while request_items.get(table_name) and retries < self.MAX_RETRIES:
+        while request_items.get(table_name):
+            if retries >= self.MAX_RETRIES:
+                break
+            if throttled_since is not None and time.monotonic() - throttled_since > self.MAX_THROTTLED_SECONDS:
+                break
+            
+            pending = len(request_items[table_name])
+            self._acquire_write_capacity(request_items[table_name])
             try:
-                response = self.dynamodb.batch_write_item(RequestItems=request_items)
-                
-                # Itens que falharam (não processados)
-                unprocessed = response.get('UnprocessedItems', {}).get(table_name, [])
-                
-                # Itens que foram processados com sucesso nesta rodada
-                current_batch_size = len(request_items[table_name])
-                processed_this_round = current_batch_size - len(unprocessed)
-                successful += processed_this_round
-                
-                # Se houver itens não processados, tentar novamente
-                if unprocessed:
-                    request_items[table_name] = unprocessed
-                    retries += 1
-                    backoff = self.INITIAL_BACKOFF * (2 ** retries)
-                    logger.debug(
-                        f"⚠️  {len(unprocessed)} itens não processados. "
-                        f"Tentando novamente em {backoff}s..."
-                    )
-                    time.sleep(backoff)
-                else:
-                    # Todos foram processados com sucesso
-                    break
+                with self.concurrency:
+                    call_started = time.perf_counter()
+                    response = self.dynamodb.batch_write_item(RequestItems=request_items)
             
             except Exception as e:
-                # Verificar se é throttling
-                if 'ProvisionedThroughputExceededException' in str(type(e)):
-                    backoff = self.INITIAL_BACKOFF * (2 ** retries)
-                    logger.warning(f"⚠️  Limite de throughput atingido. Aguardando {backoff}s...")
+                self._record_call(call_started, pending, pending, self._error_code(e) or type(e).__name__)
+                if self._is_retryable_error(e):
+                    # Throttling ou falha transitória: menos concorrência e nova tentativa
+                    code = self._error_code(e)
+                    last_error = str(e)
+                    self._on_throttle(code or type(e).__name__)
+                    if code in self.THROTTLING_ERROR_CODES:
+                        # Throttling não esgota tentativas, só o tempo sem progresso
+                        if throttled_since is None:
+                            throttled_since = time.monotonic()
+                    else:
+                        retries += 1
+                    attempt += 1
+                    backoff = self._backoff(attempt)
+                    logger.debug(f"⚠️  {self._error_code(e) or type(e).__name__}: "
+                                 f"tentando novamente em {backoff:.2f}s...")
                     time.sleep(backoff)
-                    retries += 1
+                    continue
+                
                 else:
                     error_str = str(e)
+                    last_error = error_str
                     logger.error(f"❌ Erro ao fazer batch write: {e}")
                     
                     # Log detailed information about the request that failed
@@ -300,583 +696,696 @@ class DynamoDBBatchImporter:
                                 except:
                                     logger.error(f"     - {key}: {str(value)[:100]}")
                     
-                    failed += len(request_items.get(table_name, []))
+                    # Contados como falha em 'remaining' abaixo
                     break
+            
+            # Itens que falharam (não processados)
+            unprocessed = response.get('UnprocessedItems', {}).get(table_name, [])
+            self._record_call(call_started, pending, len(unprocessed))
+            processed_this_round = pending - len(unprocessed)
+            successful += processed_this_round
+            
+            if not unprocessed:
+                # Todos foram processados com sucesso
+                self.concurrency.on_success()
+                request_items[table_name] = []
+                break
+            
+            # Se houver itens não processados, tentar novamente
+            if len(unprocessed) / pending >= self.UNPROCESSED_THROTTLE_RATIO:
+                self._on_throttle('UnprocessedItems')
+            request_items[table_name] = unprocessed
+            last_error = None
+            retries = 0
+            # Enquanto houver progresso o lote não é abandonado
+            if processed_this_round:
+                throttled_since = None
+            elif throttled_since is None:
+                throttled_since = time.monotonic()
+            attempt += 1
+            backoff = self._backoff(attempt)
+            logger.debug(
+                f"⚠️  {len(unprocessed)} itens não processados. "
+                f"Tentando novamente em {backoff:.2f}s..."
+            )
+            time.sleep(backoff)
         
         # Itens que ainda não foram processados após retries
-        remaining = len(request_items.get(table_name, []))
-        if remaining > 0:
-            failed += remaining
+        remaining = request_items.get(table_name, [])
+        if remaining:
+            failed += len(remaining)
+            reason = (f"erro no batch write: {last_error}" if last_error
+                      else f"não processado após {attempt} tentativa(s)")
+            self._record_rejects([
+                {'reason': reason, 'item': request['PutRequest']['Item'], 'format': 'dynamodb'}
+                for request in remaining
+            ])
         
+        if self.telemetry is not None:
+            self.telemetry.record_batch(time.perf_counter() - batch_started, failed)
         return successful, failed
     
-    def _convert_to_dynamodb_format(self, item: Dict[str, Any]) -> Dict[str, Any]:
+    def _dry_run_write(self, requests: List[Dict[str, Any]]) -> Tuple[int, int]:
         """
-        Converte item do formato Python para formato DynamoDB nativo.
-        
-        Args:
-            item: Item em formato Python
-            
-        Returns:
-            Item em formato DynamoDB
+        Escrita simulada do dry-run: só mede os itens (os acima de 400 KB já
+        foram rejeitados na conversão, ver _record_rejects).
         """
-        if not isinstance(item, dict):
-            logger.warning(f"⚠️  Item não é dict: {type(item).__name__}")
-            return {}
-        
-        if not item:  # Item vazio
-            return item
-        
-        # Verificar se já está no formato DynamoDB (tem tipos como 'S', 'N', etc)
-        # Formato DynamoDB tem estrutura: {'field1': {'S': 'value'}, 'field2': {'N': '123'}}
-        if self._is_dynamodb_format(item):
-            logger.debug("ℹ️  Item já está em formato DynamoDB, validando e limpando...")
-            # Validar e limpar atributos problemáticos
-            cleaned = {}
-            for key, value in item.items():
-                if not isinstance(value, dict):
-                    continue  # Pular valores inválidos
-                
-                # Remover atributos NULL (DynamoDB pode rejeitar em alguns contextos)
-                if 'NULL' in value:
-                    logger.debug(f"   Removendo atributo NULL: {key}")
-                    continue
-                
-                # Remover strings vazias (DynamoDB não aceita)
-                if 'S' in value and value['S'] == '':
-                    logger.debug(f"   Removendo string vazia: {key}")
-                    continue
-                
-                # Remover sets vazios
-                if any(t in value for t in ['SS', 'NS', 'BS']) and len(value.get(list(value.keys())[0], [])) == 0:
-                    logger.debug(f"   Removendo set vazio: {key}")
-                    continue
-                
-                cleaned[key] = value
-            return cleaned if cleaned else {}
-        
-        # Limpar e validar item antes de serializar
-        cleaned_item = self._clean_item(item)
-        
-        if not cleaned_item:
-            logger.warning(f"⚠️  Item ficou vazio após limpeza")
-            return {}
-        
-        # Usar TypeSerializer do boto3 para conversão correta
-        serializer = TypeSerializer()
-        converted_item = {}
-        
-        for key, value in cleaned_item.items():
+        if self.item_sizes is not None:
+            self.item_sizes.add([dynamodb_item_size(request['PutRequest']['Item']) for request in requests])
+        return len(requests), 0
+    
+    def _record_call(self, started: float, items: int, unprocessed: int, error: str = None):
+        """Registra uma chamada batch_write_item na telemetria, se houver importação em andamento."""
+        if self.telemetry is not None:
+            self.telemetry.record_call(time.perf_counter() - started, items, unprocessed,
+                                       error, self.concurrency.current)
+    
+    def _acquire_write_capacity(self, requests: List[Dict[str, Any]]):
+        """Espera pelos limites de escrita (WCU/s e itens/s), se configurados."""
+        if self.items_limiter.enabled:
+            self.items_limiter.acquire(len(requests))
+        if self.wcu_limiter.enabled:
+            self.wcu_limiter.acquire(sum(write_capacity_units(request['PutRequest']['Item'])
+                                         for request in requests))
+    
+    def _backoff(self, attempt: int) -> float:
+        """Backoff exponencial com "full jitter": uniforme entre 0 e o teto da tentativa."""
+        return random.uniform(0, min(self.MAX_BACKOFF, self.INITIAL_BACKOFF * (2 ** attempt)))
+    
+    @staticmethod
+    def _error_code(error: Exception) -> Optional[str]:
+        """Código de erro de um ClientError do botocore (ou None)."""
+        if isinstance(error, ClientError):
+            return error.response.get('Error', {}).get('Code')
+        return None
+    
+    def _is_retryable_error(self, error: Exception) -> bool:
+        """Throttling, erro interno do servidor ou falha de conexão."""
+        code = self._error_code(error)
+        if code:
+            return code in self.THROTTLING_ERROR_CODES or code in self.TRANSIENT_ERROR_CODES
+        return isinstance(error, (BotoConnectionError, HTTPClientError))
+    
+    def _on_throttle(self, reason: str):
+        """Reduz a concorrência de escrita após um sinal de throttling."""
+        if self.concurrency.on_throttle():
+            logger.warning(f"⚠️  {reason}: concorrência de escrita reduzida para "
+                           f"{self.concurrency.current}/{self.concurrency.max_limit}")
+    
+    def _count_coalesced(self, coalesced: int):
+        """Soma escritas substituídas por uma posterior da mesma chave."""
+        if coalesced:
+            with self._coalesced_lock:
+                self.coalesced_items += coalesced
+    
+    def _record_rejects(self, rejects: List[Dict[str, Any]]):
+        """Grava rejeições no arquivo dead-letter da importação (se houver)."""
+        if rejects and self.item_sizes is not None:
+            # Dry-run: itens rejeitados por tamanho também entram na distribuição
+            self.item_sizes.add([reject['size'] for reject in rejects if 'size' in reject])
+        if rejects and self.dead_letter is not None:
             try:
-                # TypeSerializer converte tipos Python para DynamoDB
-                converted_item[key] = serializer.serialize(value)
+                self.dead_letter.write(rejects)
             except Exception as e:
-                logger.warning(f"⚠️  Erro ao converter atributo '{key}' (tipo {type(value).__name__}): {e}")
-                continue  # Pular atributos que não podem ser serializados
-        
-        if not converted_item:
-            logger.warning(f"⚠️  Item sem atributos válidos após conversão")
-            return {}
+                logger.error(f"❌ Erro ao gravar dead-letter {self.dead_letter.path}: {e}")
+    
+    def _iter_in_processes(self, function: Callable, tasks: Iterator[tuple]) -> Iterator[Any]:
+        """
+        Executa function(*args) para cada tarefa em processos auxiliares,
+        devolvendo os resultados na ordem das tarefas.
         
-        return converted_item
+        No máximo 2 tarefas por processo ficam pendentes, então a leitura não
+        se adianta demais em relação à conversão.
+        """
+        # 'spawn' evita fork com as threads escritoras já em execução
+        context = multiprocessing.get_context('spawn')
+        with ProcessPoolExecutor(max_workers=self.num_processes, mp_context=context) as executor:
+            pending = deque()
+            for args in tasks:
+                pending.append(executor.submit(function, *args))
+                if len(pending) >= self.num_processes * 2:
+                    yield pending.popleft().result()
+            while pending:
+                yield pending.popleft().result()
     
-    def _clean_dynamodb_item(self, item: Dict[str, Any], item_index: int = 0) -> Dict[str, Any]:
+    def _iter_converted_ranges(self, file_path: str, key_schema: Optional[Dict[str, str]],
+                               start: int = 0) -> Iterator[Tuple[List[List[Dict[str, Any]]], List[Dict[str, Any]], int, int]]:
         """
-        Remove atributos inválidos de um item em formato DynamoDB.
-        Remove strings vazias, NULL, sets vazios, etc.
+        Lê e converte um arquivo JSON Lines em faixas de bytes paralelas.
         
         Args:
-            item: Item em formato DynamoDB
-            item_index: Índice do item para logs
-            
-        Returns:
-            Item limpo ou {} se ficou vazio
-        """
-        if not isinstance(item, dict):
-            return {}
+            start: Byte inicial (início de linha, ex: posição do checkpoint)
         
-        cleaned = {}
-        removed_count = 0
+        Yields:
+            (lotes de PutRequests da faixa, rejeições, escritas substituídas, byte final da faixa)
+        """
+        spread = bool(self.spread_window and hash_key_name(key_schema))
+        # Faixas menores em arquivos pequenos: o checkpoint só avança no fim de uma faixa
+        range_size = min(self.NDJSON_RANGE_SIZE,
+                         max(self.NDJSON_MIN_RANGE_SIZE,
+                             (os.path.getsize(file_path) - start) // self.NDJSON_CHECKPOINT_RANGES))
+        ranges = ndjson_reader.split_ranges(file_path, range_size, start)
+        self.parse_stats = {'backend': f"json lines ({self.num_processes} processo(s))"}
+        logger.info(f"   Parser: {self.parse_stats['backend']}, {len(ranges)} faixa(s) de bytes")
         
-        def _clean_av(av: Dict[str, Any], path: str) -> Optional[Dict[str, Any]]:
-            """Limpa recursivamente um AttributeValue, retornando None se inválido."""
-            if not isinstance(av, dict) or len(av) != 1:
-                return None
-            
-            type_key = next(iter(av.keys()))
-            type_value = av[type_key]
-            
-            # Remover NULL
-            if type_key == 'NULL':
-                return None
-            
-            # Remover strings vazias
-            if type_key == 'S' and (not isinstance(type_value, str) or type_value == ''):
-                return None
+        started = time.perf_counter()
+        results = self._iter_in_processes(
+            ndjson_reader.convert_range,
+            ((file_path, range_start, range_end, key_schema, self.on_duplicate, spread)
+             for range_start, range_end in ranges)
+        )
+        for (batches, rejects, coalesced), (_, range_end) in zip(results, ranges):
+            yield batches, rejects, coalesced, range_end
+        self._finish_parse_stats(os.path.getsize(file_path) - start, time.perf_counter() - started)
+    
+    def _get_key_schema(self, table_name: str) -> Optional[Dict[str, str]]:
+        """Lê o schema de chaves da tabela ({attr_name: 'HASH'|'RANGE'}), ou None."""
+        logger.info(f"   Validando tabela '{table_name}'...")
+        try:
+            table = self.resource.Table(table_name)
+            table.reload()
             
-            # Remover sets vazios
-            if type_key in ('SS', 'NS', 'BS'):
-                if not isinstance(type_value, list) or len(type_value) == 0:
-                    return None
-                # Limpar elementos vazios do set
-                cleaned_set = []
-                for v in type_value:
-                    if type_key == 'SS' and isinstance(v, str) and v != '':
-                        cleaned_set.append(v)
-                    elif type_key == 'NS' and isinstance(v, str):
-                        try:
-                            float(v)
-                            cleaned_set.append(v)
-                        except (TypeError, ValueError):
-                            pass
-                    elif type_key == 'BS' and isinstance(v, (str, bytes, bytearray)):
-                        cleaned_set.append(v)
-                if not cleaned_set:
-                    return None
-                return {type_key: cleaned_set}
-            
-            # Limpar listas recursivamente
-            if type_key == 'L':
-                if not isinstance(type_value, list):
-                    return None
-                cleaned_list = []
-                for inner_av in type_value:
-                    cleaned_inner = _clean_av(inner_av, f"{path}[]")
-                    if cleaned_inner is not None:
-                        cleaned_list.append(cleaned_inner)
-                if not cleaned_list:
-                    return None
-                return {type_key: cleaned_list}
-            
-            # Limpar mapas recursivamente
-            if type_key == 'M':
-                if not isinstance(type_value, dict):
-                    return None
-                cleaned_map = {}
-                for nested_key, nested_av in type_value.items():
-                    if not isinstance(nested_key, str) or not nested_key:
-                        continue
-                    cleaned_nested = _clean_av(nested_av, f"{path}.{nested_key}")
-                    if cleaned_nested is not None:
-                        cleaned_map[nested_key] = cleaned_nested
-                if not cleaned_map:
-                    return None
-                return {type_key: cleaned_map}
-            
-            # Outros tipos válidos (N, B, BOOL)
-            return av
-        
-        for key, value in item.items():
-            if not isinstance(key, str) or not key:
-                continue
-            
-            cleaned_value = _clean_av(value, key)
-            if cleaned_value is not None:
-                cleaned[key] = cleaned_value
-            else:
-                removed_count += 1
-        
-        if removed_count > 0:
-            logger.debug(f"   Item {item_index}: removidos {removed_count} atributo(s) inválido(s)")
-        
-        return cleaned
+            # Obter schema da tabela
+            key_schema = table.key_schema
+            key_attrs = {key['AttributeName']: key['KeyType'] for key in key_schema}
+            logger.info(f"   Chaves da tabela: {key_attrs}")
+            return key_attrs
+        except Exception as e:
+            logger.warning(f"   ⚠️  Não foi possível validar tabela: {e}")
+            return None
+    
+    @staticmethod
+    def is_local_endpoint(endpoint_url: Optional[str]) -> bool:
+        """True se o endpoint é um DynamoDB Local (localhost ou 127.0.0.1)."""
+        endpoint = (endpoint_url or "").lower()
+        return 'amazonaws.com' not in endpoint and ('localhost' in endpoint or '127.0.0.1' in endpoint)
     
-    def _validate_dynamodb_item(self, item: Dict[str, Any], item_index: int = 0) -> bool:
+    def _describe_table(self, table_name: str) -> Dict[str, Any]:
+        return self.dynamodb.describe_table(TableName=table_name)['Table']
+    
+    def _load_or_infer_schema(self, file_path: str, schema_file: Optional[str] = None) -> Dict[str, Any]:
+        """Schema do schema_file ou inferido dos primeiros itens do dump (ver table_schema)."""
+        if schema_file:
+            logger.info(f"   Schema: {schema_file}")
+            return table_schema.load_schema(schema_file)
+        items = self.stream_json_items(file_path)
+        try:
+            sample = list(islice(items, self.SCHEMA_SAMPLE_SIZE))
+        finally:
+            items.close()
+        schema = table_schema.infer_schema(sample)
+        logger.info(f"   Schema inferido de {len(sample)} item(ns) do dump")
+        return schema
+    
+    def _offline_key_schema(self, file_path: str, table_name: str,
+                            schema_file: Optional[str] = None) -> Optional[Dict[str, str]]:
+        """Chaves para validar itens sem consultar a tabela (dry-run), ou None."""
+        schema_file = schema_file or table_schema.find_schema_sidecar(file_path, table_name)
+        try:
+            key_attrs = table_schema.key_attributes(self._load_or_infer_schema(file_path, schema_file))
+        except (table_schema.TableSchemaError, OSError, ValueError) as e:
+            logger.warning(f"   ⚠️  Chaves desconhecidas, itens não serão validados: {e}")
+            return None
+        logger.info(f"   Chaves da tabela: {key_attrs}")
+        return key_attrs
+    
+    def _create_table(self, table_name: str, file_path: str,
+                      schema_file: Optional[str] = None) -> Dict[str, str]:
         """
-        Valida se um item convertido está em formato válido para DynamoDB.
+        Cria a tabela em PAY_PER_REQUEST, sem GSIs (criados depois da carga).
+        
+        A chave vem do schema_file ou é inferida dos primeiros itens do dump.
         
-        Args:
-            item: Item em formato DynamoDB (AttributeValue)
-            item_index: Índice do item para logs
-            
         Returns:
-            True se válido, False caso contrário
-        """
-        if not isinstance(item, dict):
-            logger.warning(f"⚠️  Item {item_index} não é dict: {type(item).__name__}")
-            return False
-        
-        def _validate_av(attr_key: str, av: Dict[str, Any], path: str) -> bool:
-            """Valida recursivamente um AttributeValue."""
-            # Valor deve ser um dict com exatamente 1 chave
-            if not isinstance(av, dict):
-                logger.error(f"❌ {path}: valor não é dict - {type(av).__name__}")
-                return False
-            if len(av) != 1:
-                logger.error(f"❌ {path}: dict com múltiplas chaves - {list(av.keys())}")
-                return False
-            
-            type_key = next(iter(av.keys()))
-            type_value = av[type_key]
-            
-            valid_types = ['S', 'N', 'B', 'SS', 'NS', 'BS', 'M', 'L', 'BOOL', 'NULL']
-            if type_key not in valid_types:
-                logger.error(f"❌ {path}: tipo inválido - {type_key}")
-                return False
-            
-            # Tipos escalares simples
-            if type_key == 'S':
-                if not isinstance(type_value, str):
-                    logger.error(f"❌ {path}: S deve ser string, got {type(type_value).__name__}")
-                    return False
-                if type_value == '':
-                    logger.error(f"❌ {path}: string vazia não permitida")
-                    return False
-            
-            elif type_key == 'N':
-                if not isinstance(type_value, str):
-                    logger.error(f"❌ {path}: N deve ser string, got {type(type_value).__name__}")
-                    return False
-                try:
-                    float(type_value)
-                except (TypeError, ValueError):
-                    logger.error(f"❌ {path}: N valor inválido - {type_value}")
-                    return False
-            
-            elif type_key == 'BOOL':
-                if not isinstance(type_value, bool):
-                    logger.error(f"❌ {path}: BOOL deve ser bool, got {type(type_value).__name__}")
-                    return False
-            
-            elif type_key == 'NULL':
-                # DynamoDB espera literalmente true
-                if type_value is not True:
-                    logger.error(f"❌ {path}: NULL deve ser true, got {type_value}")
-                    return False
-            
-            # Sets (SS/NS/BS)
-            elif type_key in ('SS', 'NS', 'BS'):
-                if not isinstance(type_value, list):
-                    logger.error(f"❌ {path}: {type_key} deve ser list, got {type(type_value).__name__}")
-                    return False
-                if len(type_value) == 0:
-                    logger.error(f"❌ {path}: {type_key} não pode ser lista vazia")
-                    return False
-                
-                for i, v in enumerate(type_value):
-                    elem_path = f"{path}[{i}]"
-                    if type_key == 'SS':
-                        if not isinstance(v, str) or v == '':
-                            logger.error(f"❌ {elem_path}: SS deve conter strings não vazias, got {repr(v)}")
-                            return False
-                    elif type_key == 'NS':
-                        if not isinstance(v, str):
-                            logger.error(f"❌ {elem_path}: NS deve conter strings numéricas, got {type(v).__name__}")
-                            return False
-                        try:
-                            float(v)
-                        except (TypeError, ValueError):
-                            logger.error(f"❌ {elem_path}: NS valor inválido - {v}")
-                            return False
-                    elif type_key == 'BS':
-                        # Em JSON normalmente vem como base64 string
-                        if not isinstance(v, (str, bytes, bytearray)):
-                            logger.error(f"❌ {elem_path}: BS deve conter strings/bytes, got {type(v).__name__}")
-                            return False
-            
-            # Lista
-            elif type_key == 'L':
-                if not isinstance(type_value, list):
-                    logger.error(f"❌ {path}: L deve ser list, got {type(type_value).__name__}")
-                    return False
-                for i, inner_av in enumerate(type_value):
-                    if not _validate_av(attr_key, inner_av, f"{path}[{i}]"):
-                        return False
-            
-            # Mapa
-            elif type_key == 'M':
-                if not isinstance(type_value, dict):
-                    logger.error(f"❌ {path}: M deve ser dict, got {type(type_value).__name__}")
-                    return False
-                for nested_key, nested_av in type_value.items():
-                    if not isinstance(nested_key, str) or not nested_key:
-                        logger.error(f"❌ {path}: chave de M inválida - {repr(nested_key)}")
-                        return False
-                    if not _validate_av(nested_key, nested_av, f"{path}.{nested_key}"):
-                        return False
-            
-            return True
-        
-        # Validação de cada atributo na raiz
-        for key, value in item.items():
-            # Validar chave
-            if not isinstance(key, str) or not key:
-                logger.error(f"❌ Item {item_index}: chave inválida - {repr(key)}")
-                return False
-            
-            if not _validate_av(key, value, f"Item {item_index}.{key}"):
-                return False
-        
-        return True
-    
-    def _is_dynamodb_format(self, item: Dict[str, Any]) -> bool:
-        """
-        Verifica se um item já está em formato DynamoDB.
-        
-        Formato DynamoDB: cada valor é um dict com EXATAMENTE uma chave de tipo
-        Ex: {'field': {'S': 'string'}} ou {'count': {'N': '42'}}
-        
-        Vs Python dict: {'nested': {'field1': 'value', 'field2': 123}}
-        """
-        if not item:
-            return False
-        
-        # Verificar os primeiros valores para determinar o formato
-        checked = 0
-        for value in item.values():
-            if not isinstance(value, dict):
-                # Se qualquer valor não é dict, não é DynamoDB format
-                return False
-            
-            # DynamoDB format tem exatamente 1 chave de tipo
-            if len(value) != 1:
-                return False
-            
-            # Verificar se tem uma chave de tipo DynamoDB (S, N, B, SS, NS, BS, M, L, BOOL, NULL)
-            has_type_key = any(k in value for k in ['S', 'N', 'B', 'SS', 'NS', 'BS', 'M', 'L', 'BOOL', 'NULL'])
-            
-            if not has_type_key:
-                return False
-            
-            checked += 1
-            if checked >= 3:  # Verificar apenas os 3 primeiros
-                break
+            Schema de chaves da tabela ({attr_name: 'HASH'|'RANGE'})
+        """
+        schema = self._load_or_infer_schema(file_path, schema_file)
+        key_attrs = table_schema.key_attributes(schema)
+        logger.info(f"🆕 Criando tabela '{table_name}' (PAY_PER_REQUEST, chaves {key_attrs})")
+        try:
+            self.dynamodb.create_table(**table_schema.create_table_request(table_name, schema))
+        except ClientError as e:
+            if self._error_code(e) != 'ResourceInUseException':
+                raise
+            # Criada nesse meio tempo (ex: outro arquivo da mesma tabela no --dir)
+            key_attrs = {key['AttributeName']: key['KeyType']
+                         for key in self._describe_table(table_name)['KeySchema']}
+            logger.info(f"   Tabela já existe, chaves {key_attrs}")
         
-        return checked > 0
+        self._wait_until_active(table_name, timeout=self.TABLE_WAIT_SECONDS)
+        return key_attrs
     
-    def _clean_item(self, item: Dict[str, Any]) -> Dict[str, Any]:
+    def _create_indexes(self, table_name: str, schema_file: str) -> List[str]:
         """
-        Limpa e valida um item para garantir compatibilidade com DynamoDB.
-        Remove valores inválidos (strings vazias, NaN, Infinity, None, datetime, floats).
+        Cria os GSIs do schema que a tabela ainda não tem, um de cada vez.
+        
+        Chamado depois da carga: com os índices criados antes, cada escrita
+        também atualizaria todos os GSIs durante a importação.
         
-        Args:
-            item: Item a limpar
-            
         Returns:
-            Item limpo e validado
-        """
-        cleaned = {}
-        
-        for key, value in item.items():
-            if value is None:
-                # DynamoDB exige NULL explícito, mas vamos pular None por segurança
-                continue
-            
-            # Validar key (não pode ser vazio)
-            if not key or not isinstance(key, str):
-                logger.warning(f"⚠️  Chave inválida: {key}, pulando")
-                continue
-            
-            # Processar strings
-            if isinstance(value, str):
-                if value == '':
-                    continue  # Skip empty strings
-                cleaned[key] = value
-            
-            # Processar números
-            elif isinstance(value, bool):
-                # bool deve vir ANTES de int/float check, pois bool é subclass de int
-                cleaned[key] = value
-            
-            elif isinstance(value, int):
-                cleaned[key] = value
-            
-            elif isinstance(value, float):
-                # Float não é suportado - converter para Decimal ou remover
-                if math.isnan(value) or math.isinf(value):
-                    # Valores inválidos - pular
-                    logger.warning(f"⚠️  Valor inválido em '{key}': {value}, pulando")
-                    continue
-                else:
-                    # Converter float para Decimal para DynamoDB
-                    cleaned[key] = Decimal(str(value))
-            
-            elif isinstance(value, Decimal):
-                cleaned[key] = value
-            
-            elif isinstance(value, datetime):
-                # datetime -> ISO 8601 string
-                cleaned[key] = value.isoformat()
-            
-            elif isinstance(value, (bytes, bytearray)):
-                # Bytes ficam como base64 automaticamente pelo TypeSerializer
-                if len(value) > 0:  # Não permitir bytes vazios
-                    cleaned[key] = value
-            
-            # Processar listas recursivamente
-            elif isinstance(value, list):
-                cleaned_list = []
-                for item_in_list in value:
-                    cleaned_item_value = self._clean_value(item_in_list)
-                    if cleaned_item_value is not None:
-                        cleaned_list.append(cleaned_item_value)
-                
-                if cleaned_list:  # Só adicionar se não vazio
-                    cleaned[key] = cleaned_list
-            
-            # Processar dicts recursivamente
-            elif isinstance(value, dict):
-                cleaned_dict = self._clean_item(value)
-                if cleaned_dict:  # Só adicionar se não vazio
-                    cleaned[key] = cleaned_dict
-            
-            else:
-                # Tipo desconhecido - converter para string
-                str_value = str(value).strip()
-                if str_value:
-                    logger.warning(f"⚠️  Tipo desconhecido em '{key}': {type(value).__name__}, convertendo para string")
-                    cleaned[key] = str_value
+            Nomes dos índices criados
+        """
+        schema = table_schema.load_schema(schema_file)
+        existing = [index['IndexName']
+                    for index in self._describe_table(table_name).get('GlobalSecondaryIndexes') or []]
+        created = []
+        for request in table_schema.create_index_requests(table_name, schema, existing):
+            index_name = request['GlobalSecondaryIndexUpdates'][0]['Create']['IndexName']
+            logger.info(f"🔧 Criando índice '{index_name}' em '{table_name}' (após a carga)...")
+            started = time.perf_counter()
+            self.dynamodb.update_table(**request)
+            self._wait_until_active(table_name, index_name, self.INDEX_WAIT_SECONDS)
+            logger.info(f"   Índice '{index_name}' ativo em {time.perf_counter() - started:.1f}s")
+            created.append(index_name)
+        return created
+    
+    def _wait_until_active(self, table_name: str, index_name: Optional[str] = None,
+                           timeout: float = TABLE_WAIT_SECONDS, interval: float = 1.0):
+        """
+        Espera a tabela (e o GSI index_name, se informado) ficar ACTIVE.
         
-        return cleaned
+        Raises:
+            TimeoutError: não ficou ACTIVE em ``timeout`` segundos
+        """
+        deadline = time.monotonic() + timeout
+        while True:
+            table = self._describe_table(table_name)
+            active = table.get('TableStatus') == 'ACTIVE'
+            if active and index_name:
+                statuses = {index['IndexName']: index.get('IndexStatus')
+                            for index in table.get('GlobalSecondaryIndexes') or []}
+                active = statuses.get(index_name) == 'ACTIVE'
+            if active:
+                return
+            if time.monotonic() >= deadline:
+                target = f"índice '{index_name}'" if index_name else "tabela"
+                raise TimeoutError(f"{target} de '{table_name}' não ficou ACTIVE em {timeout:.0f}s")
+            time.sleep(interval)
     
-    def _clean_value(self, value: Any) -> Any:
+    def _new_stats(self, source: str, table_name: str,
+                   key_attrs: Optional[Dict[str, str]]) -> Dict[str, Any]:
+        """Dicionário de estatísticas de uma importação (também em self.current_stats)."""
+        self.current_stats = {
+            'file': source,
+            'table': table_name,
+            'successful': 0,
+            'failed': 0,
+            'total_items': 0,
+            'start_time': datetime.now(),
+            'end_time': None,
+            'elapsed_seconds': 0,
+            'items_per_second': 0,
+            'key_schema': key_attrs,
+            'workers': self.num_workers,
+            'processes': self.num_processes,
+            'max_wcu_per_second': self.wcu_limiter.rate,
+            'max_items_per_second': self.items_limiter.rate
+        }
+        self.telemetry = ImportTelemetry(table_name, source)
+        self.coalesced_items = 0
+        self.item_sizes = ItemSizeDistribution() if self.dry_run else None
+        if self.dry_run:
+            self.current_stats['dry_run'] = True
+        return self.current_stats
+    
+    def _new_progress_bar(self, table_name: str, total_bytes: int = 0):
         """
-        Limpa um valor individual (usado em listas).
+        Barra de progresso tqdm (ou None sem tqdm ou com show_progress_bar=False).
         
-        Args:
-            value: Valor a limpar
-            
-        Returns:
-            Valor limpo ou None se deve ser descartado
+        Com total_bytes, a barra é determinada: bytes lidos do arquivo, com
+        itens/s e ETA da média móvel (ProgressEstimate) no final da linha.
         """
-        if value is None:
+        if not (HAS_TQDM and self.show_progress_bar):
             return None
+        if total_bytes:
+            return tqdm(desc=f"Importando {table_name}", total=total_bytes, unit="B",
+                        unit_scale=True, unit_divisor=1024, ncols=110,
+                        bar_format="{desc}: {percentage:3.0f}%|{bar}| {n_fmt}/{total_fmt} [{elapsed}{postfix}]")
+        return tqdm(desc=f"Importando {table_name}", unit="items", ncols=100, disable=False)
+    
+    def _batch_done_callback(self, stats: Dict[str, Any], pbar,
+                             progress_callback: Optional[Callable],
+                             byte_progress: Optional[ProgressEstimate] = None,
+                             telemetry_callback: Optional[Callable] = None) -> Callable[[int, int, int], None]:
+        """
+        Callback(tamanho_do_lote, sucesso, falhas) que atualiza stats e progresso.
         
-        if isinstance(value, str):
-            return value if value != '' else None
-        
-        if isinstance(value, bool):
-            return value
-        
-        if isinstance(value, int):
-            return value
-        
-        if isinstance(value, float):
-            if math.isnan(value) or math.isinf(value):
-                return None
-            return Decimal(str(value))
-        
-        if isinstance(value, Decimal):
-            return value
-        
-        if isinstance(value, datetime):
-            return value.isoformat()
+        Com byte_progress (leitura de um arquivo), o progresso segue os bytes
+        lidos e o callback recebe como total a estimativa de itens do arquivo
+        (itens lidos / fração de bytes lidos). telemetry_callback recebe
+        ImportTelemetry.snapshot() no máximo uma vez por segundo.
+        """
+        stats_lock = threading.Lock()
+        items_progress = ProgressEstimate()
+        last_telemetry = [0.0]
         
-        if isinstance(value, (bytes, bytearray)):
-            return value
+        def on_batch_done(batch_size: int, success: int, failed: int):
+            total = None
+            send_telemetry = False
+            with stats_lock:
+                if telemetry_callback and self.telemetry is not None:
+                    now = time.monotonic()
+                    send_telemetry = now - last_telemetry[0] >= 1.0
+                    if send_telemetry:
+                        last_telemetry[0] = now
+                stats['successful'] += success
+                stats['failed'] += failed
+                imported = stats['successful']
+                if byte_progress is not None:
+                    read_bytes, read_items = self.read_bytes, self.read_items
+                    byte_progress.update(read_bytes)
+                    if read_bytes:
+                        total = max(read_items, round(read_items * byte_progress.total / read_bytes))
+                if pbar is not None:
+                    if byte_progress is None:
+                        pbar.update(batch_size)
+                    elif byte_progress.done > pbar.n:
+                        items_progress.update(imported)
+                        pbar.set_postfix_str(f"{imported:,} itens, {items_progress.rate:,.0f} itens/s, "
+                                             f"ETA {format_eta(byte_progress.eta_seconds)}", refresh=False)
+                        pbar.update(byte_progress.done - pbar.n)
+            
+            if progress_callback:
+                progress_callback(imported, total, None)
+            if send_telemetry:
+                telemetry_callback(self.telemetry.snapshot())
         
-        if isinstance(value, list):
-            cleaned_list = []
-            for item in value:
-                cleaned_item = self._clean_value(item)
-                if cleaned_item is not None:
-                    cleaned_list.append(cleaned_item)
-            return cleaned_list if cleaned_list else None
+        return on_batch_done
+    
+    def _open_dead_letter(self, source: str, table_name: str):
+        """Prepara o arquivo dead-letter (criado só na primeira rejeição)."""
+        if self.dry_run:
+            # Dry-run não grava nada ao lado do dump: rejeições só no log e nas estatísticas
+            self.dead_letter = None
+            return
+        self.dead_letter = DeadLetterWriter(DeadLetterWriter.path_for(source), table_name, source)
+    
+    def _close_dead_letter(self, stats: Dict[str, Any]):
+        """Fecha o dead-letter e registra seu caminho em stats se algo foi rejeitado."""
+        dead_letter, self.dead_letter = self.dead_letter, None
+        if dead_letter is None:
+            return
+        dead_letter.close()
+        if dead_letter.count:
+            stats['dead_letter'] = dead_letter.path
+            logger.warning(f"⚠️  {dead_letter.count} item(ns) rejeitado(s) gravado(s) em {dead_letter.path}")
+    
+    def _finish_stats(self, stats: Dict[str, Any]):
+        """Calcula tempo/vazão finais e registra o resumo."""
+        stats['end_time'] = datetime.now()
+        stats['elapsed_seconds'] = (stats['end_time'] - stats['start_time']).total_seconds()
+        stats['items_per_second'] = stats['successful'] / stats['elapsed_seconds'] if stats['elapsed_seconds'] > 0 else 0
         
-        if isinstance(value, dict):
-            cleaned_dict = self._clean_item(value)
-            return cleaned_dict if cleaned_dict else None
+        logger.info(f"✅ Importação concluída para '{stats['table']}'")
+        logger.info(f"   Itens: {stats['successful']} sucesso, {stats['failed']} falhas")
+        logger.info(f"   Tempo: {stats['elapsed_seconds']:.2f}s ({stats['items_per_second']:.1f} itens/s, "
+                    f"{self.num_workers} thread(s) escritora(s), "
+                    f"{self.num_processes} processo(s) de conversão)")
         
-        # Tipo desconhecido - converter para string
-        return str(value)
+        stats['concurrency'] = self.concurrency.snapshot()
+        if stats['concurrency']['throttle_events']:
+            logger.info(f"   Concorrência: {stats['concurrency']['limit']}/{stats['concurrency']['max_limit']} "
+                        f"(mínimo {stats['concurrency']['lowest']}, "
+                        f"{stats['concurrency']['throttle_events']} sinal(is) de throttling)")
+        if self.coalesced_items:
+            stats['coalesced'] = self.coalesced_items
+            logger.info(f"   Chaves repetidas: {self.coalesced_items} escrita(s) substituída(s) pela seguinte no mesmo lote")
+        if self.item_sizes is not None:
+            stats['item_sizes'] = self.item_sizes.summary()
+        self._write_telemetry_report(stats)
+    
+    def _write_telemetry_report(self, stats: Dict[str, Any]):
+        """Resume a telemetria em stats e grava o relatório JSON completo ao lado do log."""
+        if self.telemetry is None or not self.telemetry.calls:
+            return
+        telemetry = stats['telemetry'] = self.telemetry.summary()
+        latency = telemetry['call_latency_ms']
+        logger.info(f"   Latência batch_write_item: p50 {latency['p50']:.0f} ms, p95 {latency['p95']:.0f} ms, "
+                    f"p99 {latency['p99']:.0f} ms | {telemetry['retries']} retry(s), "
+                    f"{telemetry['unprocessed_rate']:.1%} UnprocessedItems")
+        try:
+            stats['telemetry_report'] = self.telemetry.write_report()
+            logger.info(f"   Telemetria: {stats['telemetry_report']}")
+        except OSError as e:
+            logger.warning(f"⚠️  Não foi possível gravar o relatório de telemetria: {e}")
+    
+    @staticmethod
+    def table_name_for(file_path: str) -> str:
+        """Nome da tabela a partir do nome do arquivo (ex: messages-dump.json.gz -> messages)."""
+        filename = compressed_input.strip_compression_suffix(Path(file_path).name)
+        for extension in ndjson_reader.NDJSON_EXTENSIONS + ('.json',):
+            if filename.endswith(extension):
+                filename = filename[:-len(extension)]
+                break
+        return filename.replace('-dump', '')
     
     def import_file(self, file_path: str, table_name: str = None,
-                   progress_callback: Optional[Callable[[int, int, Optional[str]], None]] = None) -> Dict[str, Any]:
+                   progress_callback: Optional[Callable[[int, int, Optional[str]], None]] = None,
+                   resume: bool = False, schema_file: str = None,
+                   telemetry_callback: Optional[Callable[[Dict[str, Any]], None]] = None) -> Dict[str, Any]:
         """
         Importa um arquivo JSON para uma tabela DynamoDB.
         
+        O progresso confirmado é salvo periodicamente num checkpoint
+        (ImportCheckpoint); com resume=True a importação continua da última
+        posição confirmada em vez de começar do primeiro item.
+        
+        Com create_tables, uma tabela ausente é criada antes da carga e os
+        GSIs do schema são criados só depois que todos os itens foram escritos.
+        
         Args:
             file_path: Caminho do arquivo
             table_name: Nome da tabela (se None, extrai do nome do arquivo)
-            progress_callback: Função para reportar progresso: callback(imported, total, error)
+            progress_callback: Função para reportar progresso: callback(imported, total, error),
+                com total estimado pelos bytes já lidos do arquivo (None até haver estimativa)
+            resume: Continuar do checkpoint, se existir
+            schema_file: Schema da tabela para create_tables (padrão: <dump>.schema.json, se existir)
+            telemetry_callback: Recebe ImportTelemetry.snapshot() a cada segundo (ex: gráfico ao vivo)
             
         Returns:
             Dicionário com estatísticas
         """
         # Determinar nome da tabela
         if not table_name:
-            filename = Path(file_path).name
-            table_name = filename.replace('-dump.json', '').replace('.json', '')
+            table_name = self.table_name_for(file_path)
         
         logger.info(f"📥 Iniciando importação de {file_path} para tabela '{table_name}'")
         
-        # Validar informações da tabela
-        logger.info(f"   Validando tabela '{table_name}'...")
-        try:
-            table = self.resource.Table(table_name)
-            table.reload()
-            
-            # Obter schema da tabela
-            key_schema = table.key_schema
-            key_attrs = {key['AttributeName']: key['KeyType'] for key in key_schema}
-            logger.info(f"   Chaves da tabela: {key_attrs}")
-        except Exception as e:
-            logger.warning(f"   ⚠️  Não foi possível validar tabela: {e}")
-            key_attrs = None
+        if self.dry_run:
+            logger.info("🧪 Dry-run: nada será escrito no DynamoDB")
+            key_attrs = self._offline_key_schema(file_path, table_name, schema_file)
+        else:
+            key_attrs = self._get_key_schema(table_name)
         
         try:
-            file_size_mb = os.path.getsize(file_path) / (1024 * 1024)
-            logger.info(f"   Tamanho do arquivo: {file_size_mb:.2f} MB")
-        except:
-            file_size_mb = 0
+            file_size = os.path.getsize(file_path)
+            logger.info(f"   Tamanho do arquivo: {file_size / (1024 * 1024):.2f} MB")
+        except OSError:
+            file_size = 0
         
-        stats = {
-            'file': file_path,
-            'table': table_name,
-            'successful': 0,
-            'failed': 0,
-            'total_items': 0,
-            'start_time': datetime.now(),
-            'end_time': None,
-            'elapsed_seconds': 0,
-            'items_per_second': 0,
-            'key_schema': key_attrs
-        }
+        stats = self._new_stats(file_path, table_name, key_attrs)
+        checkpoint = None
         
         try:
-            # Processar em lotes SEM contar antecipadamente (evita travamento)
-            batch = []
-            processed_count = 0
+            if self.create_tables:
+                schema_file = schema_file or table_schema.find_schema_sidecar(file_path, table_name)
+                if key_attrs is None:
+                    key_attrs = self._create_table(table_name, file_path, schema_file)
+                    stats['key_schema'] = key_attrs
+                    stats['table_created'] = True
+            
+            self._open_dead_letter(file_path, table_name)
             
-            # Setup progress bar
-            if HAS_TQDM:
-                pbar = tqdm(desc=f"Importando {table_name}", unit="items", ncols=100, disable=False)
+            # JSON Lines descompactado com processos: faixas de bytes (posição = byte)
+            use_ranges = (self.num_processes > 0
+                          and compressed_input.detect_compression(file_path) is None
+                          and ndjson_reader.is_ndjson(file_path))
+            
+            checkpoint_path = None
+            if self.dry_run:
+                # Checkpoint próprio: o dry-run não apaga nem avança o de uma importação real
+                default_path = ImportCheckpoint.checkpoint_path_for(file_path, table_name)
+                checkpoint_path = os.path.splitext(default_path)[0] + '.dry-run.json'
+            checkpoint = ImportCheckpoint(file_path, table_name, 'bytes' if use_ranges else 'items',
+                                          checkpoint_path)
+            if resume:
+                problem = checkpoint.load()
+                if problem:
+                    raise ValueError(f"Não é possível retomar: {problem}")
+                if checkpoint.position:
+                    unit = 'bytes' if use_ranges else 'itens'
+                    logger.info(f"⏩ Retomando a partir de {checkpoint.position:,} {unit} "
+                                f"({checkpoint.successful:,} sucesso, {checkpoint.failed:,} falhas)")
             else:
-                pbar = None
+                checkpoint.discard()
             
-            for item in self.stream_json_items(file_path):
-                batch.append(item)
-                processed_count += 1
-                
-                if len(batch) >= self.BATCH_SIZE:
-                    success, failed = self.batch_write_items(table_name, batch, key_attrs)
-                    stats['successful'] += success
-                    stats['failed'] += failed
-                    
-                    if pbar:
-                        pbar.update(len(batch))
-                    
-                    if progress_callback:
-                        progress_callback(stats['successful'], None, None)
-                    
-                    batch = []
+            stats['successful'] = checkpoint.successful
+            stats['failed'] = checkpoint.failed
+            stats['resumed_from'] = checkpoint.position
             
-            # Processar lote final
-            if batch:
-                success, failed = self.batch_write_items(table_name, batch, key_attrs)
-                stats['successful'] += success
-                stats['failed'] += failed
-                
-                if pbar:
-                    pbar.update(len(batch))
-                
-                if progress_callback:
-                    progress_callback(stats['successful'], None, None)
+            # Processar em lotes SEM contar antecipadamente (evita travamento)
+            processed_count = checkpoint.successful + checkpoint.failed
+            position = checkpoint.position
+            invalid_counted = 0  # Linhas inválidas já contadas em alguma unidade do checkpoint
+            
+            # Progresso pelos bytes lidos do arquivo (tamanho conhecido antes de ler)
+            self.read_items = processed_count
+            self.read_bytes = position if use_ranges else 0
+            byte_progress = ProgressEstimate(file_size)
+            self.current_progress = byte_progress
+            pbar = self._new_progress_bar(table_name, file_size)
+            on_batch_done = self._batch_done_callback(stats, pbar, progress_callback, byte_progress,
+                                                      telemetry_callback)
+            
+            def read_chunks(size: int, skip: int = position) -> Iterator[Tuple[List[Dict[str, Any]], int]]:
+                """Blocos de itens e quantas linhas inválidas foram lidas junto com cada um"""
+                items = self.stream_json_items(file_path)
+                if skip:
+                    # Pular os itens já confirmados no checkpoint (e as linhas
+                    # inválidas entre eles, já contadas nele)
+                    self._skipping_lines = True
+                    try:
+                        next(islice(items, skip - 1, None), None)
+                    finally:
+                        self._skipping_lines = False
+                chunk = []
+                invalid_before = 0
+                for item in items:
+                    chunk.append(item)
+                    if len(chunk) >= size:
+                        invalid = self.parse_stats.get('invalid_lines', 0)
+                        yield chunk, invalid - invalid_before
+                        chunk, invalid_before = [], invalid
+                if chunk:
+                    invalid = self.parse_stats.get('invalid_lines', 0)
+                    yield chunk, invalid - invalid_before
             
-            if pbar:
+            def count_invalid(invalid: int):
+                # Linhas inválidas entram na unidade do bloco em que foram lidas
+                nonlocal processed_count, invalid_counted
+                if invalid:
+                    processed_count += invalid
+                    invalid_counted += invalid
+                    on_batch_done(invalid, 0, invalid)
+            
+            # Reordenação opcional por chave de partição (precisa da chave da tabela)
+            hash_key = hash_key_name(key_attrs) if self.spread_window else None
+            if self.spread_window and not hash_key:
+                logger.warning("⚠️  Chave de partição desconhecida: itens enviados na ordem do arquivo")
+            elif hash_key:
+                logger.info(f"   Alternando chaves de partição ('{hash_key}') em janelas de "
+                            f"{self.spread_window:,} itens")
+            
+            def submit_unit(batches: List[List[Any]], end: int, rejected: int = 0, coalesced: int = 0):
+                unit = checkpoint.begin_unit(end, len(batches), rejected, coalesced)
+                for batch in batches:
+                    writers.submit(
+                        batch,
+                        lambda success, failed: checkpoint.batch_done(unit, success, failed)
+                    )
+            
+            if self.num_processes > 0:
+                # Pipeline: leitura -> conversão em processos -> threads escritoras
+                writers = _BatchWriterPool(
+                    lambda b: self.write_put_requests(table_name, b),
+                    self.num_workers,
+                    on_batch_done,
+                    _batch_key_function(key_attrs)
+                )
+                try:
+                    if use_ranges:
+                        # Faixas de bytes exigem o arquivo descompactado (mmap)
+                        converted = self._iter_converted_ranges(file_path, key_attrs, position)
+                    else:
+                        # Linhas inválidas de cada bloco, na ordem das tarefas (e dos resultados)
+                        chunk_invalid = deque()
+                        
+                        def tasks():
+                            for chunk, invalid in read_chunks(max(self.CONVERT_CHUNK_SIZE, self.spread_window)
+                                                              if hash_key else self.CONVERT_CHUNK_SIZE):
+                                chunk_invalid.append(invalid)
+                                yield chunk, key_attrs, self.on_duplicate, bool(hash_key)
+                        
+                        converted = (
+                            (batches, rejects, coalesced, None)
+                            for batches, rejects, coalesced in self._iter_in_processes(convert_chunk, tasks())
+                        )
+                    for batches, rejects, coalesced, end in converted:
+                        rejected = len(rejects)
+                        unit_items = sum(len(batch) for batch in batches) + rejected + coalesced
+                        processed_count += unit_items
+                        if end is not None:
+                            position = end
+                            self.read_items, self.read_bytes = processed_count, end
+                        else:
+                            position += unit_items
+                            invalid = chunk_invalid.popleft()
+                            count_invalid(invalid)
+                            rejected += invalid
+                        if rejects:
+                            self._record_rejects(rejects)
+                            on_batch_done(len(rejects), 0, len(rejects))
+                        if coalesced:
+                            self._count_coalesced(coalesced)
+                            on_batch_done(coalesced, coalesced, 0)
+                        submit_unit(batches, position, rejected, coalesced)
+                finally:
+                    writers.close()
+            else:
+                # Threads escritoras convertem e enviam os lotes enquanto o arquivo é lido
+                writers = _BatchWriterPool(
+                    lambda b: self.batch_write_items(table_name, b, key_attrs),
+                    self.num_workers,
+                    on_batch_done,
+                    _batch_key_function(key_attrs)
+                )
+                try:
+                    if hash_key:
+                        # Uma janela por unidade do checkpoint: a reordenação não cruza a posição salva
+                        for window, invalid in read_chunks(self.spread_window):
+                            processed_count += len(window)
+                            position += len(window)
+                            count_invalid(invalid)
+                            window, coalesced = reorder_window(
+                                window, key_attrs, self.on_duplicate == ON_DUPLICATE_COALESCE)
+                            if coalesced:
+                                self._count_coalesced(coalesced)
+                                on_batch_done(coalesced, coalesced, 0)
+                            submit_unit([window[i:i + self.BATCH_SIZE]
+                                         for i in range(0, len(window), self.BATCH_SIZE)],
+                                        position, invalid, coalesced)
+                    else:
+                        for batch, invalid in read_chunks(self.BATCH_SIZE):
+                            processed_count += len(batch)
+                            position += len(batch)
+                            count_invalid(invalid)
+                            submit_unit([batch], position, invalid)
+                finally:
+                    writers.close()
+            
+            if pbar is not None:
+                byte_progress.update(self.read_bytes)
+                pbar.update(max(0, byte_progress.done - pbar.n))
                 pbar.close()
             
+            # Linhas inválidas depois do último item (nas faixas já vêm como rejeições)
+            invalid_lines = self.parse_stats.get('invalid_lines', 0) - invalid_counted
+            processed_count += invalid_lines
+            stats['failed'] += invalid_lines
+            
             stats['total_items'] = processed_count
+            stats['parser'] = dict(self.parse_stats)
+            self._close_dead_letter(stats)
+            
+            if self.parse_stats.get('error'):
+                # Leitura interrompida: manter o checkpoint para retomar depois
+                checkpoint.save()
+                stats['completed'] = False
+                if progress_callback:
+                    progress_callback(stats['successful'], None, self.parse_stats['error'])
+            else:
+                checkpoint.discard()
+                stats['completed'] = True
             
             if processed_count == 0:
                 logger.warning(f"⚠️  Nenhum item encontrado em {file_path}")
@@ -884,19 +1393,224 @@ class DynamoDBBatchImporter:
                     progress_callback(0, 0, "Nenhum item encontrado")
                 return stats
             
-            stats['end_time'] = datetime.now()
-            stats['elapsed_seconds'] = (stats['end_time'] - stats['start_time']).total_seconds()
-            stats['items_per_second'] = stats['successful'] / stats['elapsed_seconds'] if stats['elapsed_seconds'] > 0 else 0
-            
-            logger.info(f"✅ Importação concluída para '{table_name}'")
-            logger.info(f"   Itens: {stats['successful']} sucesso, {stats['failed']} falhas")
-            logger.info(f"   Tempo: {stats['elapsed_seconds']:.2f}s ({stats['items_per_second']:.1f} itens/s)")
+            self._finish_stats(stats)
+            if self.dry_run and stats['elapsed_seconds'] > 0:
+                stats['mb_per_second'] = file_size / (1024 * 1024) / stats['elapsed_seconds']
+                logger.info(f"🧪 Dry-run: {stats['items_per_second']:.0f} itens/s, "
+                            f"{stats['mb_per_second']:.1f} MB/s, {stats['failed']} rejeitado(s)")
             
+            if self.create_tables and schema_file and stats['completed']:
+                try:
+                    stats['indexes_created'] = self._create_indexes(table_name, schema_file)
+                except Exception as e:
+                    # Os itens já foram escritos: o erro do índice não invalida a carga
+                    logger.error(f"❌ Erro ao criar índices de '{table_name}': {e}")
+                    stats['index_error'] = str(e)
             return stats
         
         except Exception as e:
             logger.error(f"❌ Erro crítico ao importar {file_path}: {e}")
+            if checkpoint is not None and checkpoint.position:
+                checkpoint.save()
+                logger.info(f"   Checkpoint salvo: use a opção de retomar para continuar")
+            self._close_dead_letter(stats)
             stats['end_time'] = datetime.now()
+            stats['completed'] = False
+            stats['error'] = str(e)
+            self._write_telemetry_report(stats)
             if progress_callback:
                 progress_callback(stats['successful'], None, str(e))
             return stats
+    
+    def import_s3_export(self, export_dir: str, table_name: str = None,
+                         progress_callback: Optional[Callable[[int, int, Optional[str]], None]] = None) -> Dict[str, Any]:
+        """
+        Importa um "Export to S3" do DynamoDB baixado para o disco.
+        
+        Segue o manifest-files.json, descompacta os arquivos data/*.json.gz
+        (vários em paralelo, maiores primeiro) e envia os itens, que já vêm em
+        DynamoDB JSON, sem limpeza/reserialização.
+        
+        Args:
+            export_dir: Diretório do export (ou uma pasta acima dele)
+            table_name: Nome da tabela (se None, usa a tabela de origem do export)
+            progress_callback: Função para reportar progresso: callback(imported, total, error)
+            
+        Returns:
+            Dicionário com estatísticas
+        """
+        manifest_path = s3_export.find_manifest(export_dir)
+        data_files = s3_export.list_data_files(manifest_path)
+        if not table_name:
+            table_name = s3_export.table_name_from_summary(s3_export.read_summary(manifest_path))
+        if not table_name:
+            raise s3_export.S3ExportError("Nome da tabela não informado e ausente no manifest-summary.json")
+        
+        expected_items = sum(entry['item_count'] for entry in data_files)
+        logger.info(f"📥 Iniciando importação do export {os.path.dirname(manifest_path)} para tabela '{table_name}'")
+        logger.info(f"   {len(data_files)} arquivo(s) de dados, {expected_items:,} itens no manifest")
+        
+        key_attrs = self._get_key_schema(table_name)
+        stats = self._new_stats(export_dir, table_name, key_attrs)
+        stats['data_files'] = len(data_files)
+        self._open_dead_letter(os.path.dirname(manifest_path), table_name)
+        
+        pbar = self._new_progress_bar(table_name)
+        on_batch_done = self._batch_done_callback(stats, pbar, progress_callback)
+        
+        files_queue = queue.Queue()
+        for entry in data_files:
+            files_queue.put(entry['path'])
+        count_lock = threading.Lock()
+        errors = []
+        
+        def read_files():
+            while True:
+                try:
+                    path = files_queue.get_nowait()
+                except queue.Empty:
+                    return
+                count = 0
+                try:
+                    batch = []
+                    for item in s3_export.iter_export_items(path):
+                        batch.append(item)
+                        count += 1
+                        if len(batch) >= self.BATCH_SIZE:
+                            self._submit_typed(batch, key_attrs, writers, on_batch_done)
+                            batch = []
+                    if batch:
+                        self._submit_typed(batch, key_attrs, writers, on_batch_done)
+                except Exception as e:
+                    logger.error(f"❌ Erro ao ler {path}: {e}")
+                    errors.append(f"{os.path.basename(path)}: {e}")
+                finally:
+                    with count_lock:
+                        stats['total_items'] += count
+        
+        writers = _BatchWriterPool(
+            lambda b: self.write_put_requests(table_name, b),
+            self.num_workers,
+            on_batch_done,
+            _batch_key_function(key_attrs)
+        )
+        try:
+            readers = [
+                threading.Thread(target=read_files, name=f"export-reader-{i}", daemon=True)
+                for i in range(min(self.EXPORT_FILE_READERS, len(data_files)))
+            ]
+            for reader in readers:
+                reader.start()
+            for reader in readers:
+                reader.join()
+        finally:
+            writers.close()
+            if pbar is not None:
+                pbar.close()
+            self._close_dead_letter(stats)
+        
+        stats['errors'] = errors
+        self._finish_stats(stats)
+        if errors and progress_callback:
+            progress_callback(stats['successful'], None, f"{len(errors)} arquivo(s) com erro")
+        return stats
+    
+    def import_dead_letters(self, dead_letter_path: str, table_name: str = None,
+                            progress_callback: Optional[Callable[[int, int, Optional[str]], None]] = None) -> Dict[str, Any]:
+        """
+        Reimporta só os itens de um arquivo dead-letter (ex: depois de corrigir
+        a tabela ou os dados).
+        
+        Itens que falharam na escrita já estão em DynamoDB JSON e são enviados
+        direto; os rejeitados na conversão passam pela conversão de novo. Linhas
+        que não eram JSON válido não podem ser reimportadas e, como as novas
+        falhas, vão para um novo arquivo dead-letter.
+        
+        Args:
+            dead_letter_path: Arquivo dead-letter (.jsonl)
+            table_name: Nome da tabela (se None, usa a tabela registrada no arquivo)
+            progress_callback: Função para reportar progresso: callback(imported, total, error)
+            
+        Returns:
+            Dicionário com estatísticas
+        """
+        table_name = table_name or dead_letter.table_from_dead_letters(dead_letter_path)
+        if not table_name:
+            raise ValueError(f"Nome da tabela não informado e ausente em {dead_letter_path}")
+        
+        logger.info(f"📥 Reimportando dead-letter {dead_letter_path} para tabela '{table_name}'")
+        
+        key_attrs = self._get_key_schema(table_name)
+        stats = self._new_stats(dead_letter_path, table_name, key_attrs)
+        self._open_dead_letter(dead_letter_path, table_name)
+        
+        pbar = self._new_progress_bar(table_name)
+        on_batch_done = self._batch_done_callback(stats, pbar, progress_callback)
+        
+        writers = _BatchWriterPool(
+            lambda b: self.write_put_requests(table_name, b),
+            self.num_workers,
+            on_batch_done,
+            _batch_key_function(key_attrs)
+        )
+        try:
+            typed_batch = []
+            raw_batch = []
+            for record in dead_letter.iter_dead_letters(dead_letter_path):
+                stats['total_items'] += 1
+                if 'item' not in record:
+                    # Linha que nunca foi JSON válido: manter para correção manual
+                    self._record_rejects([record])
+                    on_batch_done(1, 0, 1)
+                elif record.get('format') == 'dynamodb':
+                    typed_batch.append(s3_export.decode_binary_values(record['item']))
+                    if len(typed_batch) >= self.BATCH_SIZE:
+                        self._submit_typed(typed_batch, key_attrs, writers, on_batch_done)
+                        typed_batch = []
+                else:
+                    raw_batch.append(record['item'])
+                    if len(raw_batch) >= self.BATCH_SIZE:
+                        self._submit_converted(raw_batch, key_attrs, writers, on_batch_done)
+                        raw_batch = []
+            if typed_batch:
+                self._submit_typed(typed_batch, key_attrs, writers, on_batch_done)
+            if raw_batch:
+                self._submit_converted(raw_batch, key_attrs, writers, on_batch_done)
+        finally:
+            writers.close()
+            if pbar is not None:
+                pbar.close()
+            self._close_dead_letter(stats)
+        
+        self._finish_stats(stats)
+        return stats
+    
+    def _submit_converted(self, items: List[Dict[str, Any]], key_attrs: Optional[Dict[str, str]],
+                          writers: _BatchWriterPool, on_batch_done: Callable[[int, int, int], None]):
+        """Converte itens e envia os lotes de PutRequests para as threads escritoras."""
+        batches, rejects, coalesced = self.prepare_put_batches(items, key_attrs, self.BATCH_SIZE,
+                                                               self.on_duplicate)
+        if rejects:
+            self._record_rejects(rejects)
+            on_batch_done(len(rejects), 0, len(rejects))
+        if coalesced:
+            self._count_coalesced(coalesced)
+            on_batch_done(coalesced, coalesced, 0)
+        for batch in batches:
+            writers.submit(batch)
+    
+    def _submit_typed(self, items: List[Dict[str, Any]], key_attrs: Optional[Dict[str, str]],
+                      writers: _BatchWriterPool, on_batch_done: Callable[[int, int, int], None]):
+        """Envia itens já em DynamoDB JSON para as threads escritoras."""
+        batches, rejects, coalesced = self.prepare_typed_put_batches(items, key_attrs, self.BATCH_SIZE,
+                                                                     self.on_duplicate)
+        if rejects:
+            for reject in rejects:
+                reject['format'] = 'dynamodb'
+            self._record_rejects(rejects)
+            on_batch_done(len(rejects), 0, len(rejects))
+        if coalesced:
+            self._count_coalesced(coalesced)
+            on_batch_done(coalesced, coalesced, 0)
+        for batch in batches:
+            writers.submit(batch)
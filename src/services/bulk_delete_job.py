@@ -0,0 +1,259 @@
+"""Bulk delete-by-filter job for DynamoDB Local"""
+
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, wait
+from decimal import Decimal
+
+from boto3.dynamodb.conditions import ConditionExpressionBuilder
+from boto3.dynamodb.types import TypeSerializer
+
+from src.services.rate_limiter import RateLimiter
+
+
+class BulkDeleteJob:
+    """Deleta todos os itens que atendem a um filtro
+
+    Faz um scan paralelo (Segment/TotalSegments) projetando apenas as chaves,
+    e envia as chaves em lotes de 25 DeleteRequests por um pool de threads,
+    respeitando um orçamento de escrita (itens/s). Cada segmento grava um
+    checkpoint depois que todas as chaves de uma página foram deletadas, então
+    a execução pode ser retomada do ponto em que parou.
+    """
+
+    BATCH_SIZE = 25
+    PAGE_SIZE = 1000
+
+    def __init__(self, client, table_name, key_attributes, delete_batch,
+                 filter_expression=None, total_segments=4, delete_workers=8,
+                 write_budget=0, checkpoint_path=None, progress_callback=None):
+        """
+        Args:
+            client: Low-level DynamoDB client (thread-safe)
+            table_name: Table name
+            key_attributes: Primary key attribute names (PK and optional SK)
+            delete_batch: Callable(batch) -> (deleted, errors), where batch is a list
+                of (key, serialized_key) tuples (see DynamoDBService._delete_batch)
+            filter_expression: Optional boto3 condition (Attr(...)) for the scan
+            total_segments: Number of parallel scan segments
+            delete_workers: Number of parallel BatchWriteItem requests
+            write_budget: Maximum deletes per second (0 = unlimited)
+            checkpoint_path: File used to save/resume progress
+            progress_callback: Optional callback(deleted, scanned), called from worker threads
+        """
+        self.client = client
+        self.table_name = table_name
+        self.key_attributes = list(key_attributes)
+        self.delete_batch = delete_batch
+        self.filter_expression = filter_expression
+        self.total_segments = max(1, int(total_segments))
+        self.delete_workers = max(1, int(delete_workers))
+        self.rate_limiter = RateLimiter(write_budget)
+        self.checkpoint_path = checkpoint_path
+        self.progress_callback = progress_callback
+
+        self._lock = threading.Lock()
+        self._cancel = threading.Event()
+        self._state = None
+        self.errors = []
+
+    @staticmethod
+    def checkpoint_path_for(table_name, filters):
+        """Default checkpoint file for a table + filter combination"""
+        signature = json.dumps(filters or [], sort_keys=True, default=str)
+        digest = hashlib.sha1(f"{table_name}:{signature}".encode('utf-8')).hexdigest()[:12]
+        return os.path.join(tempfile.gettempdir(), f"dynamodb_delete_{table_name}_{digest}.json")
+
+    def has_checkpoint(self):
+        """Return True if a compatible checkpoint exists"""
+        return self._load_checkpoint() is not None
+
+    def discard_checkpoint(self):
+        """Remove the checkpoint file, if any"""
+        if self.checkpoint_path and os.path.exists(self.checkpoint_path):
+            os.remove(self.checkpoint_path)
+
+    def cancel(self):
+        """Stop after the pages currently in progress (progress is kept)"""
+        self._cancel.set()
+
+    @property
+    def cancelled(self):
+        return self._cancel.is_set()
+
+    def run(self, resume=True):
+        """
+        Executa o job até o fim, cancelamento ou erro.
+
+        Args:
+            resume: Continue from the checkpoint when one exists
+
+        Returns:
+            dict: Stats with deleted, scanned, errors, elapsed_seconds, completed
+        """
+        start_time = time.time()
+        state = self._load_checkpoint() if resume else None
+        if state is None:
+            state = {
+                'table': self.table_name,
+                'total_segments': self.total_segments,
+                'deleted': 0,
+                'scanned': 0,
+                'segments': {str(i): {'last_key': None, 'done': False} for i in range(self.total_segments)},
+            }
+        self._state = state
+
+        scan_kwargs = self._build_scan_kwargs()
+
+        with ThreadPoolExecutor(max_workers=self.delete_workers) as delete_executor:
+            with ThreadPoolExecutor(max_workers=self.total_segments) as segment_executor:
+                futures = [
+                    segment_executor.submit(self._run_segment, segment, scan_kwargs, delete_executor)
+                    for segment in range(self.total_segments)
+                    if not state['segments'][str(segment)]['done']
+                ]
+                for future in futures:
+                    try:
+                        future.result()
+                    except Exception as e:
+                        self._fail(f"Erro no segmento: {str(e)}")
+
+        completed = all(seg['done'] for seg in state['segments'].values())
+        if completed:
+            self.discard_checkpoint()
+
+        return {
+            'deleted': state['deleted'],
+            'scanned': state['scanned'],
+            'errors': list(self.errors),
+            'elapsed_seconds': time.time() - start_time,
+            'completed': completed,
+        }
+
+    def _build_scan_kwargs(self):
+        """Build keys-only scan parameters (projection + optional filter)"""
+        serializer = TypeSerializer()
+        names = {}
+        projection = []
+        for i, attr in enumerate(self.key_attributes):
+            placeholder = f"#k{i}"
+            names[placeholder] = attr
+            projection.append(placeholder)
+
+        kwargs = {
+            'TableName': self.table_name,
+            'TotalSegments': self.total_segments,
+            'ProjectionExpression': ', '.join(projection),
+            'Limit': self.PAGE_SIZE,
+        }
+
+        if self.filter_expression is not None:
+            built = ConditionExpressionBuilder().build_expression(self.filter_expression)
+            names.update(built.attribute_name_placeholders)
+            kwargs['FilterExpression'] = built.condition_expression
+            if built.attribute_value_placeholders:
+                kwargs['ExpressionAttributeValues'] = {
+                    placeholder: serializer.serialize(
+                        Decimal(str(value)) if isinstance(value, float) else value
+                    )
+                    for placeholder, value in built.attribute_value_placeholders.items()
+                }
+
+        kwargs['ExpressionAttributeNames'] = names
+        return kwargs
+
+    def _run_segment(self, segment, scan_kwargs, delete_executor):
+        """Scan one segment page by page, deleting each page before checkpointing"""
+        segment_state = self._state['segments'][str(segment)]
+
+        while not self._cancel.is_set():
+            kwargs = dict(scan_kwargs, Segment=segment)
+            if segment_state['last_key']:
+                kwargs['ExclusiveStartKey'] = segment_state['last_key']
+
+            page = self.client.scan(**kwargs)
+            keys = page.get('Items', [])
+
+            batches = [
+                [(key, key) for key in keys[i:i + self.BATCH_SIZE]]
+                for i in range(0, len(keys), self.BATCH_SIZE)
+            ]
+            futures = [delete_executor.submit(self._delete_throttled, batch) for batch in batches]
+            wait(futures)
+
+            page_deleted = 0
+            page_errors = []
+            page_cancelled = False
+            for future in futures:
+                result = future.result()
+                if result is None:
+                    page_cancelled = True
+                    continue
+                deleted, errors = result
+                page_deleted += len(deleted)
+                page_errors.extend(errors)
+
+            with self._lock:
+                self._state['deleted'] += page_deleted
+                self._state['scanned'] += page.get('ScannedCount', 0)
+                deleted_total = self._state['deleted']
+                scanned_total = self._state['scanned']
+
+            if self.progress_callback:
+                self.progress_callback(deleted_total, scanned_total)
+
+            # Não avançar o checkpoint se a página ficou incompleta: ela será refeita ao retomar
+            if page_errors:
+                for error in page_errors:
+                    self._fail(error)
+                return
+            if page_cancelled:
+                return
+
+            last_key = page.get('LastEvaluatedKey')
+            with self._lock:
+                segment_state['last_key'] = last_key
+                segment_state['done'] = last_key is None
+                self._save_checkpoint()
+
+            if last_key is None:
+                return
+
+    def _delete_throttled(self, batch):
+        """Delete a batch after acquiring write budget (None if cancelled)"""
+        if self._cancel.is_set():
+            return None
+        self.rate_limiter.acquire(len(batch))
+        return self.delete_batch(batch)
+
+    def _fail(self, error):
+        """Record an error and stop the other segments"""
+        with self._lock:
+            self.errors.append(error)
+        self._cancel.set()
+
+    def _load_checkpoint(self):
+        """Load a checkpoint matching this table/segment layout"""
+        if not self.checkpoint_path or not os.path.exists(self.checkpoint_path):
+            return None
+        try:
+            with open(self.checkpoint_path, 'r', encoding='utf-8') as f:
+                state = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if state.get('table') != self.table_name or state.get('total_segments') != self.total_segments:
+            return None
+        return state
+
+    def _save_checkpoint(self):
+        """Atomically write the checkpoint (caller holds the lock)"""
+        if not self.checkpoint_path:
+            return
+        tmp_path = f"{self.checkpoint_path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(self._state, f)
+        os.replace(tmp_path, self.checkpoint_path)
@@ -0,0 +1,187 @@
+"""
+Leitura transparente de arquivos compactados (gzip, bz2, xz).
+
+A compressão é detectada pela extensão ou pelos magic bytes. A
+descompactação roda numa thread que lê adiante e entrega blocos por uma
+fila limitada, então o parser não espera pelo inflate (zlib/bz2/lzma
+liberam o GIL enquanto descompactam).
+"""
+
+import bz2
+import gzip
+import io
+import lzma
+import queue
+import threading
+from typing import Optional
+
+
+COMPRESSION_EXTENSIONS = {
+    '.gz': 'gzip',
+    '.gzip': 'gzip',
+    '.bz2': 'bz2',
+    '.xz': 'xz',
+}
+
+MAGIC_BYTES = (
+    (b'\x1f\x8b', 'gzip'),
+    (b'BZh', 'bz2'),
+    (b'\xfd7zXZ\x00', 'xz'),
+)
+
+_OPENERS = {
+    'gzip': gzip.open,
+    'bz2': bz2.open,
+    'xz': lzma.open,
+}
+
+
+def detect_compression(file_path: str) -> Optional[str]:
+    """
+    Detecta a compressão de um arquivo.
+
+    Returns:
+        'gzip', 'bz2', 'xz' ou None (não compactado)
+    """
+    lower = file_path.lower()
+    for extension, compression in COMPRESSION_EXTENSIONS.items():
+        if lower.endswith(extension):
+            return compression
+
+    with open(file_path, 'rb') as f:
+        header = f.read(6)
+    for magic, compression in MAGIC_BYTES:
+        if header.startswith(magic):
+            return compression
+    return None
+
+
+def strip_compression_suffix(file_name: str) -> str:
+    """Remove a extensão de compressão (ex: 'a-dump.json.gz' -> 'a-dump.json')."""
+    lower = file_name.lower()
+    for extension in COMPRESSION_EXTENSIONS:
+        if lower.endswith(extension):
+            return file_name[:-len(extension)]
+    return file_name
+
+
+def open_input(file_path: str, compression: Optional[str] = None):
+    """
+    Abre um arquivo para leitura binária, descompactando se necessário.
+
+    Args:
+        file_path: Caminho do arquivo
+        compression: Compressão já detectada (None = detectar)
+
+    Returns:
+        Arquivo binário (com read/readline/iteração por linhas)
+    """
+    compression = compression or detect_compression(file_path)
+    if compression is None:
+        return open(file_path, 'rb')
+    raw = open(file_path, 'rb')
+    return io.BufferedReader(
+        _ReadAheadReader(_OPENERS[compression](raw, 'rb'), raw),
+        buffer_size=_ReadAheadReader.CHUNK_SIZE
+    )
+
+
+def source_position(f) -> int:
+    """
+    Bytes do arquivo em disco já consumidos por um arquivo de open_input.
+
+    Nos compactados é a posição no arquivo compactado (comparável com
+    os.path.getsize), não no conteúdo descompactado.
+    """
+    raw = getattr(f, 'raw', None)
+    if isinstance(raw, _ReadAheadReader):
+        return raw.source_position
+    return f.tell()
+
+
+def read_sample(file_path: str, size: int, compression: Optional[str] = None) -> bytes:
+    """Lê os primeiros bytes (descompactados) de um arquivo."""
+    compression = compression or detect_compression(file_path)
+    opener = _OPENERS[compression] if compression else open
+    with opener(file_path, 'rb') as f:
+        return f.read(size)
+
+
+class _ReadAheadReader(io.RawIOBase):
+    """Stream somente leitura que descompacta numa thread em segundo plano."""
+
+    CHUNK_SIZE = 1024 * 1024
+    MAX_CHUNKS = 8
+
+    def __init__(self, source, raw=None):
+        super().__init__()
+        self._source = source
+        self._raw = raw  # Arquivo compactado em disco (fechado junto)
+        self.source_position = 0  # Bytes do arquivo compactado já entregues ao leitor
+        self._chunks = queue.Queue(maxsize=self.MAX_CHUNKS)
+        self._stop = threading.Event()
+        self._current = memoryview(b'')
+        self._position = 0
+        self._eof = False
+        self._thread = threading.Thread(target=self._read_ahead, name="decompress-read-ahead", daemon=True)
+        self._thread.start()
+
+    def readable(self):
+        return True
+
+    def tell(self):
+        return self._position
+
+    def readinto(self, buffer):
+        while not self._current:
+            if self._eof:
+                return 0
+            chunk = self._chunks.get()
+            if chunk is None:
+                self._eof = True
+                return 0
+            if isinstance(chunk, Exception):
+                self._eof = True
+                raise chunk
+            chunk, self.source_position = chunk
+            self._current = memoryview(chunk)
+
+        size = min(len(buffer), len(self._current))
+        buffer[:size] = self._current[:size]
+        self._current = self._current[size:]
+        self._position += size
+        return size
+
+    def close(self):
+        if not self.closed:
+            self._stop.set()
+            # Liberar a thread se ela estiver bloqueada na fila cheia
+            while self._thread.is_alive():
+                try:
+                    self._chunks.get(timeout=0.1)
+                except queue.Empty:
+                    pass
+            self._source.close()
+            if self._raw is not None:
+                self._raw.close()
+        super().close()
+
+    def _read_ahead(self):
+        try:
+            while not self._stop.is_set():
+                chunk = self._source.read(self.CHUNK_SIZE)
+                if not chunk:
+                    break
+                # Posição no arquivo compactado ao fim deste bloco (progresso do consumidor)
+                self._put((chunk, self._raw.tell() if self._raw is not None else 0))
+            self._put(None)
+        except Exception as e:
+            self._put(e)
+
+    def _put(self, value):
+        while not self._stop.is_set():
+            try:
+                self._chunks.put(value, timeout=0.1)
+                return
+            except queue.Full:
+                continue
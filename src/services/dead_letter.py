@@ -0,0 +1,139 @@
+"""Dead-letter file for items rejected during an import"""
+
+import base64
+import json
+import os
+import re
+import threading
+import uuid
+from datetime import datetime
+from decimal import Decimal
+from typing import Any, Dict, Iterator, List, Optional
+
+
+# Decimais não inteiros saem de _json_default como uma string marcada, que
+# _dumps troca pelos dígitos de str(value): um número JSON sem passar por
+# float (lido de volta como Decimal em iter_dead_letters)
+_DECIMAL_MARK = f'\x00{uuid.uuid4().hex}:'
+_DECIMAL_MARK_JSON = json.dumps(_DECIMAL_MARK)[:-1]
+_DECIMAL_MARK_RE = re.compile(re.escape(_DECIMAL_MARK_JSON) + r'([^"]*)"')
+
+
+def _json_default(value):
+    """Serialize the non-JSON types that items may carry"""
+    if isinstance(value, Decimal):
+        if value.is_finite() and value == value.to_integral_value():
+            return int(value)
+        return _DECIMAL_MARK + str(value)
+    if isinstance(value, (bytes, bytearray)):
+        # Mesmo formato do DynamoDB JSON para binários
+        return base64.b64encode(bytes(value)).decode('ascii')
+    if isinstance(value, (set, frozenset)):
+        return list(value)
+    return str(value)
+
+
+def _dumps(record: Dict[str, Any]) -> str:
+    """json.dumps de um registro, com Decimais como números exatos"""
+    text = json.dumps(record, ensure_ascii=False, default=_json_default)
+    if _DECIMAL_MARK_JSON in text:
+        text = _DECIMAL_MARK_RE.sub(r'\1', text)
+    return text
+
+
+class DeadLetterWriter:
+    """Grava itens rejeitados num arquivo JSON Lines, com o motivo
+
+    Cada linha é {"reason", "table", "source", "time", "item"} (ou "line"
+    para linhas que nem chegaram a ser JSON válido). O arquivo só é criado
+    na primeira rejeição, e cada gravação é descarregada (flush) antes de a
+    importação considerar o lote concluído.
+    """
+
+    def __init__(self, path: str, table_name: str, source: str):
+        """
+        Args:
+            path: Arquivo de saída (.jsonl)
+            table_name: Tabela de destino da importação
+            source: Arquivo de origem dos itens
+        """
+        self.path = path
+        self.table_name = table_name
+        self.source = source
+        self.count = 0
+        self._file = None
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def path_for(source_path: str) -> str:
+        """Default dead-letter file next to the source (one per run)"""
+        directory = os.path.dirname(os.path.abspath(source_path))
+        stem = os.path.basename(source_path).split('.')[0] or 'import'
+        timestamp = datetime.now().strftime('%Y%m%d-%H%M%S')
+        path = os.path.join(directory, f"{stem}.dead-letter-{timestamp}.jsonl")
+        # Nunca reutilizar um arquivo existente (ex: o dead-letter sendo reimportado)
+        suffix = 1
+        while os.path.exists(path):
+            path = os.path.join(directory, f"{stem}.dead-letter-{timestamp}-{suffix}.jsonl")
+            suffix += 1
+        return path
+
+    def write(self, rejects: List[Dict[str, Any]]):
+        """
+        Grava rejeições.
+
+        Args:
+            rejects: Lista de {'reason': str, 'item': dict} ou {'reason': str, 'line': str}
+        """
+        if not rejects:
+            return
+
+        now = datetime.now().isoformat(timespec='seconds')
+        lines = []
+        for reject in rejects:
+            record = {
+                'reason': reject.get('reason', 'desconhecido'),
+                'table': self.table_name,
+                'source': self.source,
+                'time': now,
+            }
+            for field in ('item', 'format', 'line', 'byte'):
+                if field in reject:
+                    record[field] = reject[field]
+            lines.append(_dumps(record))
+
+        with self._lock:
+            if self._file is None:
+                self._file = open(self.path, 'a', encoding='utf-8')
+            self._file.write('\n'.join(lines) + '\n')
+            self._file.flush()
+            self.count += len(rejects)
+
+    def close(self):
+        """Close the file (if it was created)"""
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+
+def iter_dead_letters(path: str) -> Iterator[Dict[str, Any]]:
+    """
+    Lê os registros de um arquivo dead-letter.
+
+    Números com casas decimais voltam como Decimal, sem arredondamento.
+
+    Yields:
+        Registros {'reason', 'table', 'source', 'item'|'line', ...}
+    """
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            if line.strip():
+                yield json.loads(line, parse_float=Decimal)
+
+
+def table_from_dead_letters(path: str) -> Optional[str]:
+    """Tabela de destino registrada no primeiro registro do arquivo"""
+    for record in iter_dead_letters(path):
+        return record.get('table')
+    return None
@@ -0,0 +1,191 @@
+"""Parallel import of many dump files (one table per file) under a global write budget"""
+
+import logging
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Any, Callable, Dict, List
+
+from src.services.batch_importer import DynamoDBBatchImporter
+
+
+logger = logging.getLogger('DynamoDBBatchImporter')
+
+
+class DirectoryImport:
+    """Importa vários arquivos em paralelo, maiores primeiro
+
+    Cada arquivo tem seu próprio importador (estado de parser, checkpoint e
+    dead-letter são por importação), mas todos compartilham o controle de
+    concorrência e os limites de escrita do primeiro: o número de threads
+    escritoras do importador vira um orçamento GLOBAL de chamadas
+    batch_write_item em voo, dividido dinamicamente entre os arquivos ativos.
+    """
+
+    DEFAULT_PARALLEL_FILES = 4
+
+    def __init__(self, files: List[str], create_importer: Callable[[], DynamoDBBatchImporter],
+                 parallel_files: int = DEFAULT_PARALLEL_FILES, resume: bool = False):
+        """
+        Args:
+            files: Arquivos a importar (tabela = nome do arquivo, ver table_name_for)
+            create_importer: Fábrica de importadores já configurados
+            parallel_files: Arquivos importados ao mesmo tempo
+            resume: Retomar cada arquivo do seu checkpoint, se existir
+        """
+        self.create_importer = create_importer
+        self.parallel_files = max(1, int(parallel_files or 1))
+        self.resume = resume
+
+        # Orçamento global: concorrência adaptativa e limites de escrita compartilhados
+        self._budget = create_importer()
+
+        self.jobs = []
+        for file_path in files:
+            try:
+                size = os.path.getsize(file_path)
+            except OSError:
+                size = 0
+            self.jobs.append({
+                'file': file_path,
+                'table': DynamoDBBatchImporter.table_name_for(file_path),
+                'size': size,
+                'status': 'waiting',
+                'importer': None,
+                'stats': None,
+            })
+        # Maiores primeiro: o arquivo mais longo não fica para o final sozinho
+        self.jobs.sort(key=lambda job: job['size'], reverse=True)
+
+        self.started_at = None
+        self.finished_at = None
+        self._lock = threading.Lock()
+
+    @property
+    def concurrency(self):
+        """Controle de concorrência compartilhado por todos os arquivos"""
+        return self._budget.concurrency
+
+    def run(self) -> List[Dict[str, Any]]:
+        """
+        Importa todos os arquivos.
+
+        Returns:
+            Estatísticas de cada arquivo (import_file), maiores primeiro
+        """
+        self.started_at = datetime.now()
+        logger.info(f"📂 Importando {len(self.jobs)} arquivo(s), até {self.parallel_files} em paralelo, "
+                    f"{self._budget.num_workers} escrita(s) simultânea(s) no total")
+
+        with ThreadPoolExecutor(max_workers=self.parallel_files, thread_name_prefix="file-import") as executor:
+            list(executor.map(self._import_job, self.jobs))
+
+        self.finished_at = datetime.now()
+        return [job['stats'] for job in self.jobs]
+
+    def _import_job(self, job: Dict[str, Any]):
+        importer = self.create_importer()
+        importer.concurrency = self._budget.concurrency
+        importer.wcu_limiter = self._budget.wcu_limiter
+        importer.items_limiter = self._budget.items_limiter
+        importer.show_progress_bar = False
+
+        with self._lock:
+            job['importer'] = importer
+            job['status'] = 'running'
+
+        try:
+            stats = importer.import_file(job['file'], job['table'], resume=self.resume)
+        except Exception as e:
+            logger.error(f"❌ Erro ao importar {job['file']}: {e}")
+            stats = importer.current_stats or {'file': job['file'], 'table': job['table'],
+                                               'successful': 0, 'failed': 0, 'total_items': 0,
+                                               'elapsed_seconds': 0, 'items_per_second': 0}
+            stats['error'] = str(e)
+
+        with self._lock:
+            job['stats'] = stats
+            if stats.get('error') or not stats.get('completed', True):
+                job['status'] = 'error'
+            elif stats['failed']:
+                job['status'] = 'warning'
+            else:
+                job['status'] = 'done'
+
+    def snapshot(self) -> List[Dict[str, Any]]:
+        """
+        Estado atual de cada arquivo, para painéis.
+
+        Returns:
+            Lista de {'table', 'file', 'size', 'status', 'successful', 'failed',
+            'elapsed_seconds', 'items_per_second', 'fraction', 'eta_seconds'}
+        """
+        rows = []
+        with self._lock:
+            for job in self.jobs:
+                stats = job['stats'] or (job['importer'].current_stats if job['importer'] else None) or {}
+                progress = job['importer'].current_progress if job['importer'] else None
+                if job['stats']:
+                    fraction, eta_seconds = 1.0, 0.0
+                elif progress is not None:
+                    fraction, eta_seconds = progress.fraction, progress.eta_seconds
+                else:
+                    fraction, eta_seconds = 0.0, None
+                successful = stats.get('successful', 0)
+                if job['stats']:
+                    elapsed = stats.get('elapsed_seconds', 0)
+                elif stats.get('start_time'):
+                    elapsed = (datetime.now() - stats['start_time']).total_seconds()
+                else:
+                    elapsed = 0
+                rows.append({
+                    'table': job['table'],
+                    'file': job['file'],
+                    'size': job['size'],
+                    'status': job['status'],
+                    'successful': successful,
+                    'failed': stats.get('failed', 0),
+                    'elapsed_seconds': elapsed,
+                    'items_per_second': successful / elapsed if elapsed > 0 else 0,
+                    'fraction': fraction,
+                    'eta_seconds': eta_seconds,
+                })
+        return rows
+
+    def summary(self) -> Dict[str, Any]:
+        """Totais de todos os arquivos (tempo = tempo real, não a soma dos arquivos)"""
+        rows = self.snapshot()
+        end = self.finished_at or datetime.now()
+        elapsed = (end - self.started_at).total_seconds() if self.started_at else 0
+        successful = sum(row['successful'] for row in rows)
+        return {
+            'files': len(rows),
+            'files_with_errors': sum(1 for row in rows if row['status'] == 'error'),
+            'successful': successful,
+            'failed': sum(row['failed'] for row in rows),
+            'elapsed_seconds': elapsed,
+            'items_per_second': successful / elapsed if elapsed > 0 else 0,
+            'concurrency': self.concurrency.snapshot(),
+        }
+
+    def run_with_monitor(self, on_tick: Callable[['DirectoryImport'], None],
+                         interval: float = 1.0) -> List[Dict[str, Any]]:
+        """run() chamando on_tick(self) a cada ``interval`` segundos (ex: painel ao vivo)"""
+        done = threading.Event()
+
+        def monitor():
+            while not done.wait(interval):
+                try:
+                    on_tick(self)
+                except Exception as e:
+                    logger.debug(f"Erro ao atualizar painel: {e}")
+
+        thread = threading.Thread(target=monitor, name="import-dashboard", daemon=True)
+        thread.start()
+        try:
+            return self.run()
+        finally:
+            done.set()
+            thread.join()
+            on_tick(self)
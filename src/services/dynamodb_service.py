@@ -4,16 +4,32 @@ import json
 import time
 import boto3
 import os
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from decimal import Decimal
 from boto3.dynamodb.conditions import Key, Attr
+from boto3.dynamodb.types import TypeSerializer
 from botocore.exceptions import ClientError
 from src.utils.encoders import DecimalEncoder
 from src.config import config
 from src.services.batch_importer import DynamoDBBatchImporter
+from src.services.bulk_delete_job import BulkDeleteJob
 
 
 class DynamoDBService:
     """Service class for DynamoDB operations"""
     
+    BATCH_DELETE_SIZE = 25  # Limite do BatchWriteItem
+    BATCH_DELETE_WORKERS = 4
+    BATCH_DELETE_MAX_RETRIES = 5
+    BATCH_DELETE_INITIAL_BACKOFF = 0.1  # segundos
+    RETRYABLE_ERROR_CODES = (
+        'ProvisionedThroughputExceededException',
+        'ThrottlingException',
+        'RequestLimitExceeded',
+        'InternalServerError',
+    )
+    
     def __init__(self):
         """Initialize DynamoDB service"""
         self.dynamodb = None
@@ -606,44 +622,25 @@ class DynamoDBService:
             print(f"Erro ao executar query: {e}")
             return [], 0, elapsed
     
-    def import_data_from_file(self, file_path, table_name=None, progress_callback=None):
-        """Import data from JSON file to DynamoDB table - OTIMIZADO para arquivos grandes
-        
-        IMPORTANTE: Esta função SÓ funciona em modo LOCAL.
-        NUNCA será executada em produção para evitar conexões acidentais.
-        
-        Otimizações aplicadas:
-        - Streaming de arquivo (não carrega tudo na memória)
-        - Batch write (25 itens por batch)
-        - Retry automático com backoff exponencial
-        - Suporte a diferentes estruturas JSON
+    def _check_local_mode(self, operation):
+        """Check that a destructive/bulk operation targets DynamoDB Local
         
         Args:
-            file_path: Path to JSON file containing items
-            table_name: Name of the table to import to (if None, uses current_table)
-            progress_callback: Optional callback function(imported_count, total_count, error)
+            operation: Operation name used in the error message (e.g. "Importação")
             
         Returns:
-            tuple: (success: bool, imported_count: int, error_message: str)
+            str or None: Error message if blocked, None if allowed
         """
         # SEGURANÇA: Verificar se está em modo local
         if not config.DYNAMODB_LOCAL:
-            error_msg = "❌ ERRO DE SEGURANÇA: Importação só é permitida em modo LOCAL!"
-            print(f"[DynamoDBService.import_data_from_file] {error_msg}")
-            if progress_callback:
-                progress_callback(0, 0, error_msg)
-            return False, 0, error_msg
+            return f"❌ ERRO DE SEGURANÇA: {operation} só é permitida em modo LOCAL!"
         
         # SEGURANÇA: Verificar se endpoint é local (não pode ser AWS)
         endpoint_lower = (config.DYNAMODB_ENDPOINT or "").lower()
         
         # Verificar se é endpoint AWS (bloquear)
         if 'amazonaws.com' in endpoint_lower or 'dynamodb' in endpoint_lower and 'aws' in endpoint_lower:
-            error_msg = "❌ ERRO DE SEGURANÇA: Endpoint parece ser AWS! Importação bloqueada."
-            print(f"[DynamoDBService.import_data_from_file] {error_msg}")
-            if progress_callback:
-                progress_callback(0, 0, error_msg)
-            return False, 0, error_msg
+            return f"❌ ERRO DE SEGURANÇA: Endpoint parece ser AWS! {operation} bloqueada."
         
         # Verificar se é endpoint local válido
         is_local_endpoint = (
@@ -652,7 +649,46 @@ class DynamoDBService:
         )
         
         if not is_local_endpoint:
-            error_msg = "❌ ERRO DE SEGURANÇA: Endpoint não é local (localhost ou 127.0.0.1)!"
+            return "❌ ERRO DE SEGURANÇA: Endpoint não é local (localhost ou 127.0.0.1)!"
+        
+        return None
+    
+    def import_data_from_file(self, file_path, table_name=None, progress_callback=None,
+                              num_workers=DynamoDBBatchImporter.DEFAULT_WORKERS, num_processes=0,
+                              resume=False, max_wcu_per_second=0, max_items_per_second=0,
+                              create_table=False, telemetry_callback=None):
+        """Import data from JSON file to DynamoDB table - OTIMIZADO para arquivos grandes
+        
+        IMPORTANTE: Esta função SÓ funciona em modo LOCAL.
+        NUNCA será executada em produção para evitar conexões acidentais.
+        
+        Otimizações aplicadas:
+        - Streaming de arquivo (não carrega tudo na memória)
+        - Batch write (25 itens por batch) com threads escritoras em paralelo
+        - Retry automático com backoff exponencial
+        - Suporte a diferentes estruturas JSON
+        
+        Args:
+            file_path: Path to JSON file containing items
+            table_name: Name of the table to import to (if None, uses current_table)
+            progress_callback: Optional callback function(imported_count, total_count, error);
+                total_count is estimated from the bytes read so far (None until known)
+            num_workers: Number of parallel batch writer threads
+            num_processes: Number of item conversion processes (0 = convert in the writer threads)
+            resume: Continue an interrupted import from its checkpoint
+            max_wcu_per_second: Write limit in WCU/s (0 = unlimited)
+            max_items_per_second: Write limit in items/s (0 = unlimited)
+            create_table: Create the table if it does not exist (schema from
+                <dump>.schema.json or inferred from the dump; GSIs after the load)
+            telemetry_callback: Optional callback(snapshot) called about once per second
+                with latency percentiles, retries and the recent items/s series
+            
+        Returns:
+            tuple: (success: bool, imported_count: int, error_message: str)
+        """
+        # SEGURANÇA: Verificar se está em modo local com endpoint local
+        error_msg = self._check_local_mode("Importação")
+        if error_msg:
             print(f"[DynamoDBService.import_data_from_file] {error_msg}")
             if progress_callback:
                 progress_callback(0, 0, error_msg)
@@ -674,7 +710,12 @@ class DynamoDBService:
                 endpoint_url=config.DYNAMODB_ENDPOINT,
                 region_name=config.DYNAMODB_REGION,
                 access_key_id=config.DYNAMODB_ACCESS_KEY,
-                secret_access_key=config.DYNAMODB_SECRET_KEY
+                secret_access_key=config.DYNAMODB_SECRET_KEY,
+                num_workers=num_workers,
+                num_processes=num_processes,
+                max_wcu_per_second=max_wcu_per_second,
+                max_items_per_second=max_items_per_second,
+                create_tables=create_table
             )
             
             # Importar com callback de progresso
@@ -682,21 +723,37 @@ class DynamoDBService:
                 if progress_callback:
                     progress_callback(imported_count, total_count, error)
             
-            stats = importer.import_file(file_path, table_name, progress_wrapper)
+            stats = importer.import_file(file_path, table_name, progress_wrapper, resume=resume,
+                                         telemetry_callback=telemetry_callback)
             
             # Retornar resultado no formato antigo para compatibilidade
             success = stats['successful'] > 0
             imported_count = stats['successful']
             error_msg = None
             
-            if stats['failed'] > 0:
+            if not stats.get('completed', True):
+                success = False
+                reason = stats.get('error') or stats.get('parser', {}).get('error') or "erro desconhecido"
+                error_msg = (f"Importação interrompida após {imported_count} itens ({reason}). "
+                             f"Marque 'Retomar' para continuar de onde parou")
+            elif stats['failed'] > 0:
                 error_msg = f"Importados {imported_count} itens com {stats['failed']} falhas em {stats['elapsed_seconds']:.1f}s"
+                if stats.get('dead_letter'):
+                    error_msg += f". Itens rejeitados em {stats['dead_letter']}"
             elif success:
                 error_msg = f"✅ Importados {imported_count} itens em {stats['elapsed_seconds']:.1f}s ({stats['items_per_second']:.1f} itens/s)"
+                if stats.get('table_created'):
+                    error_msg += f". Tabela criada com chaves {stats['key_schema']}"
+                if stats.get('indexes_created'):
+                    error_msg += f". Índices criados: {', '.join(stats['indexes_created'])}"
+                if stats.get('index_error'):
+                    error_msg += f". Erro ao criar índices: {stats['index_error']}"
             else:
                 error_msg = "Nenhum item foi importado"
             
             print(f"[DynamoDBService.import_data_from_file] {error_msg}")
+            if stats.get('telemetry_report'):
+                print(f"[DynamoDBService.import_data_from_file] Telemetria: {stats['telemetry_report']}")
             
             return success, imported_count, error_msg
         
@@ -726,4 +783,182 @@ class DynamoDBService:
         except Exception as e:
             error_msg = f"Erro ao deletar item: {str(e)}"
             print(f"[DynamoDBService.delete_item] {error_msg}")
-            return False, error_msg
\ No newline at end of file
+            return False, error_msg
+    
+    def batch_delete_items(self, keys, progress_callback=None, max_workers=None):
+        """Delete many items with parallel BatchWriteItem requests
+        
+        As chaves são agrupadas em lotes de 25 DeleteRequests e enviadas por um
+        pool de threads. UnprocessedItems são reenviados com backoff exponencial.
+        
+        Args:
+            keys: List of key dictionaries (e.g. [{'pk': '1', 'sk': 'a'}, ...])
+            progress_callback: Optional callback(deleted_count, total_count), called
+                from worker threads
+            max_workers: Number of parallel requests (default: BATCH_DELETE_WORKERS)
+        
+        Returns:
+            tuple: (deleted_keys: list, errors: list of str)
+        """
+        if not self.current_table:
+            return [], ["Nenhuma tabela selecionada"]
+        
+        table_name = self.current_table.name
+        client = self.dynamodb.meta.client
+        serializer = TypeSerializer()
+        
+        # BatchWriteItem rejeita chaves repetidas no mesmo lote
+        requests = {}
+        for key in keys:
+            serialized = {
+                name: serializer.serialize(self._to_dynamodb_value(value))
+                for name, value in key.items()
+            }
+            requests.setdefault(self._request_key(serialized), (key, serialized))
+        
+        pending = list(requests.values())
+        total = len(pending)
+        batches = [
+            pending[i:i + self.BATCH_DELETE_SIZE]
+            for i in range(0, total, self.BATCH_DELETE_SIZE)
+        ]
+        
+        deleted_keys = []
+        errors = []
+        lock = threading.Lock()
+        
+        def on_batch_done(batch_deleted, batch_errors):
+            with lock:
+                deleted_keys.extend(batch_deleted)
+                errors.extend(batch_errors)
+                deleted_count = len(deleted_keys)
+            if progress_callback:
+                progress_callback(deleted_count, total)
+        
+        workers = max(1, max_workers or self.BATCH_DELETE_WORKERS)
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = [
+                executor.submit(self._delete_batch, client, table_name, batch)
+                for batch in batches
+            ]
+            for future in as_completed(futures):
+                try:
+                    batch_deleted, batch_errors = future.result()
+                except Exception as e:
+                    batch_deleted, batch_errors = [], [f"Erro inesperado no lote: {str(e)}"]
+                on_batch_done(batch_deleted, batch_errors)
+        
+        print(f"[DynamoDBService.batch_delete_items] {len(deleted_keys)}/{total} itens deletados")
+        return deleted_keys, errors
+    
+    def create_delete_by_filter_job(self, filters, progress_callback=None, write_budget=None,
+                                    total_segments=None):
+        """Create a job that deletes every item of the current table matching filters
+        
+        IMPORTANTE: Assim como a importação, SÓ funciona em modo LOCAL.
+        
+        Args:
+            filters: List of filter dictionaries (same format as query_with_filters)
+            progress_callback: Optional callback(deleted_count, scanned_count)
+            write_budget: Max deletes per second (default: config.BULK_DELETE_WRITE_BUDGET)
+            total_segments: Parallel scan segments (default: config.BULK_DELETE_SEGMENTS)
+        
+        Returns:
+            tuple: (job: BulkDeleteJob or None, error_message: str or None)
+        """
+        error_msg = self._check_local_mode("Deleção em massa")
+        if error_msg:
+            print(f"[DynamoDBService.create_delete_by_filter_job] {error_msg}")
+            return None, error_msg
+        
+        if not self.current_table:
+            return None, "Nenhuma tabela selecionada"
+        
+        pk_key, sk_key = self._get_key_schema_safe()
+        if not pk_key:
+            return None, "Não foi possível obter a chave primária da tabela"
+        
+        table_name = self.current_table.name
+        client = self.dynamodb.meta.client
+        job = BulkDeleteJob(
+            client,
+            table_name,
+            [k for k in (pk_key, sk_key) if k],
+            delete_batch=lambda batch: self._delete_batch(client, table_name, batch),
+            filter_expression=self.build_filter_expression(filters),
+            total_segments=total_segments or config.BULK_DELETE_SEGMENTS,
+            write_budget=config.BULK_DELETE_WRITE_BUDGET if write_budget is None else write_budget,
+            checkpoint_path=BulkDeleteJob.checkpoint_path_for(table_name, filters),
+            progress_callback=progress_callback
+        )
+        return job, None
+    
+    def _delete_batch(self, client, table_name, batch):
+        """Send one BatchWriteItem with DeleteRequests, retrying UnprocessedItems
+        
+        Args:
+            client: Low-level DynamoDB client (thread-safe)
+            table_name: Table name
+            batch: List of (original_key, serialized_key) tuples
+        
+        Returns:
+            tuple: (deleted_keys: list, errors: list of str)
+        """
+        by_serialized = {self._request_key(serialized): key for key, serialized in batch}
+        remaining = [{'DeleteRequest': {'Key': serialized}} for _, serialized in batch]
+        deleted = []
+        retries = 0
+        
+        while remaining:
+            try:
+                response = client.batch_write_item(RequestItems={table_name: remaining})
+            except ClientError as e:
+                code = e.response.get('Error', {}).get('Code', '')
+                if code in self.RETRYABLE_ERROR_CODES and retries < self.BATCH_DELETE_MAX_RETRIES:
+                    retries += 1
+                    time.sleep(self.BATCH_DELETE_INITIAL_BACKOFF * (2 ** retries))
+                    continue
+                error = f"Erro ao deletar lote de {len(remaining)} itens: {str(e)}"
+                print(f"[DynamoDBService.batch_delete_items] {error}")
+                return deleted, [error]
+            
+            unprocessed = response.get('UnprocessedItems', {}).get(table_name, [])
+            unprocessed_ids = {
+                self._request_key(request['DeleteRequest']['Key'])
+                for request in unprocessed
+            }
+            for request in remaining:
+                request_id = self._request_key(request['DeleteRequest']['Key'])
+                if request_id not in unprocessed_ids:
+                    deleted.append(by_serialized[request_id])
+            
+            remaining = unprocessed
+            if remaining:
+                if retries >= self.BATCH_DELETE_MAX_RETRIES:
+                    error = f"{len(remaining)} itens não processados após {retries} tentativas"
+                    print(f"[DynamoDBService.batch_delete_items] {error}")
+                    return deleted, [error]
+                retries += 1
+                time.sleep(self.BATCH_DELETE_INITIAL_BACKOFF * (2 ** retries))
+        
+        return deleted, []
+    
+    @staticmethod
+    def _request_key(serialized):
+        """Build a hashable identity for a serialized key
+        
+        Usa tuplas (nome, tipo, valor) em vez de json.dumps, que falha em
+        chaves binárias (B chega como bytes).
+        """
+        return tuple(sorted(
+            (name, type_, value)
+            for name, attribute in serialized.items()
+            for type_, value in attribute.items()
+        ))
+    
+    @staticmethod
+    def _to_dynamodb_value(value):
+        """Convert floats (from the JSON-decoded items shown in the UI) to Decimal"""
+        if isinstance(value, float):
+            return Decimal(str(value))
+        return value
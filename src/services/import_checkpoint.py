@@ -0,0 +1,175 @@
+"""Durable checkpoints for resumable file imports"""
+
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
+from collections import deque
+from typing import Any, Dict, Optional
+
+
+class _Unit:
+    """Trecho do arquivo (lote, bloco ou faixa de bytes) ainda não confirmado"""
+
+    __slots__ = ('end', 'pending', 'successful', 'failed')
+
+    def __init__(self, end: int, pending: int, failed: int, successful: int = 0):
+        self.end = end
+        self.pending = pending
+        self.successful = successful
+        self.failed = failed
+
+
+class ImportCheckpoint:
+    """Checkpoint de uma importação, avançado só depois das escritas confirmadas
+
+    O arquivo é consumido em unidades (lotes, blocos ou faixas de bytes), na
+    ordem do arquivo. Cada unidade termina numa posição (ordinal do item ou
+    byte) e é confirmada quando todos os seus lotes foram escritos ou
+    contados como falha. A posição salva é a do fim da última unidade de um
+    prefixo contínuo confirmado, então ao retomar nada é perdido; unidades
+    escritas fora de ordem depois dela são reenviadas (PutItem é idempotente).
+    """
+
+    SAVE_INTERVAL = 5.0  # segundos
+
+    def __init__(self, file_path: str, table_name: str, mode: str, checkpoint_path: str = None):
+        """
+        Args:
+            file_path: Arquivo importado
+            table_name: Tabela de destino
+            mode: 'items' (posição = ordinal do item) ou 'bytes' (posição = byte)
+            checkpoint_path: Arquivo do checkpoint (padrão: checkpoint_path_for)
+        """
+        self.file_path = os.path.abspath(file_path)
+        self.table_name = table_name
+        self.mode = mode
+        self.checkpoint_path = checkpoint_path or self.checkpoint_path_for(file_path, table_name)
+
+        self.position = 0
+        self.successful = 0
+        self.failed = 0
+
+        self._units = deque()
+        self._lock = threading.Lock()
+        self._last_save = time.monotonic()
+
+    @staticmethod
+    def checkpoint_path_for(file_path: str, table_name: str) -> str:
+        """Default checkpoint file for a file + table combination"""
+        signature = f"{os.path.abspath(file_path)}:{table_name}"
+        digest = hashlib.sha1(signature.encode('utf-8')).hexdigest()[:12]
+        return os.path.join(tempfile.gettempdir(), f"dynamodb_import_{table_name}_{digest}.json")
+
+    def load(self) -> Optional[str]:
+        """
+        Carrega o checkpoint salvo, se for compatível.
+
+        Returns:
+            None se carregou (ou não havia checkpoint), ou o motivo da incompatibilidade
+        """
+        state = self._read()
+        if state is None:
+            return None
+        if state.get('file_signature') != self._file_signature():
+            return "o arquivo mudou desde o checkpoint"
+        if state.get('mode') != self.mode:
+            return (f"checkpoint criado no modo '{state.get('mode')}', importação atual "
+                    f"usa '{self.mode}' (use a mesma opção de processos)")
+
+        self.position = state['position']
+        self.successful = state['successful']
+        self.failed = state['failed']
+        return None
+
+    def exists(self) -> bool:
+        """Return True if a checkpoint file exists for this import"""
+        return os.path.exists(self.checkpoint_path)
+
+    def discard(self):
+        """Remove the checkpoint file, if any"""
+        if os.path.exists(self.checkpoint_path):
+            os.remove(self.checkpoint_path)
+
+    def begin_unit(self, end: int, batches: int, failed: int = 0, successful: int = 0) -> _Unit:
+        """
+        Registra uma unidade antes de enviar seus lotes.
+
+        Args:
+            end: Posição logo após o último item da unidade
+            batches: Quantidade de lotes que serão enviados
+            failed: Itens já rejeitados (ex: na conversão)
+            successful: Itens já contados como escritos (ex: substituídos por uma
+                escrita posterior da mesma chave)
+        """
+        unit = _Unit(end, batches, failed, successful)
+        with self._lock:
+            self._units.append(unit)
+            if batches == 0:
+                self._advance()
+        return unit
+
+    def batch_done(self, unit: _Unit, successful: int, failed: int):
+        """Confirma um lote da unidade (escrito ou contado como falha)"""
+        with self._lock:
+            unit.pending -= 1
+            unit.successful += successful
+            unit.failed += failed
+            if unit.pending == 0:
+                self._advance()
+
+    def save(self):
+        """Grava o checkpoint agora"""
+        with self._lock:
+            self._save()
+
+    def _advance(self):
+        """Avança a posição pelo prefixo de unidades confirmadas (lock já adquirido)"""
+        advanced = False
+        while self._units and self._units[0].pending == 0:
+            unit = self._units.popleft()
+            self.position = unit.end
+            self.successful += unit.successful
+            self.failed += unit.failed
+            advanced = True
+
+        if advanced and time.monotonic() - self._last_save >= self.SAVE_INTERVAL:
+            self._save()
+
+    def _save(self):
+        """Atomically write the checkpoint (caller holds the lock)"""
+        state = {
+            'file': self.file_path,
+            'file_signature': self._file_signature(),
+            'table': self.table_name,
+            'mode': self.mode,
+            'position': self.position,
+            'successful': self.successful,
+            'failed': self.failed,
+            'saved_at': time.time(),
+        }
+        tmp_path = f"{self.checkpoint_path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(state, f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.checkpoint_path)
+        self._last_save = time.monotonic()
+
+    def _read(self) -> Optional[Dict[str, Any]]:
+        if not os.path.exists(self.checkpoint_path):
+            return None
+        try:
+            with open(self.checkpoint_path, 'r', encoding='utf-8') as f:
+                state = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if state.get('file') != self.file_path or state.get('table') != self.table_name:
+            return None
+        return state
+
+    def _file_signature(self):
+        stat = os.stat(self.file_path)
+        return [stat.st_size, int(stat.st_mtime)]
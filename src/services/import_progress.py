@@ -0,0 +1,92 @@
+"""Progress fraction, moving-average throughput and ETA for long imports"""
+
+import threading
+import time
+from collections import deque
+from typing import Any, Dict, Optional
+
+
+class ProgressEstimate:
+    """Progresso (feito/total) com vazão em média móvel e ETA, seguro para várias threads
+
+    A vazão é medida só na janela dos últimos ``window`` segundos, então o ETA
+    acompanha mudanças de ritmo (throttling, limites de escrita, arquivos com
+    itens maiores no final) em vez de arrastar a média desde o início.
+    """
+
+    WINDOW_SECONDS = 30.0
+    SAMPLE_INTERVAL = 0.5  # segundos entre amostras guardadas na janela
+
+    def __init__(self, total: float = 0, window: float = WINDOW_SECONDS):
+        """
+        Args:
+            total: Total esperado (ex: tamanho do arquivo em bytes; 0 = desconhecido)
+            window: Janela da média móvel, em segundos
+        """
+        self.total = total
+        self.window = window
+        self.done = 0
+        self._samples = deque()  # (instante, feito)
+        self._lock = threading.Lock()
+
+    def update(self, done: float, total: Optional[float] = None):
+        """Registra o progresso atual (e o total, se mudou)"""
+        now = time.monotonic()
+        with self._lock:
+            self.done = done
+            if total is not None:
+                self.total = total
+            if not self._samples or now - self._samples[-1][0] >= self.SAMPLE_INTERVAL:
+                self._samples.append((now, done))
+            # Manter uma amostra anterior à janela como base da média
+            while len(self._samples) > 1 and now - self._samples[1][0] > self.window:
+                self._samples.popleft()
+
+    @property
+    def fraction(self) -> Optional[float]:
+        """Fração concluída entre 0 e 1 (None se o total é desconhecido)"""
+        if not self.total:
+            return None
+        return min(1.0, max(0.0, self.done / self.total))
+
+    @property
+    def rate(self) -> float:
+        """Vazão média na janela (unidades por segundo)"""
+        with self._lock:
+            if not self._samples:
+                return 0.0
+            first_time, first_done = self._samples[0]
+            seconds = time.monotonic() - first_time
+            return (self.done - first_done) / seconds if seconds > 0 else 0.0
+
+    @property
+    def eta_seconds(self) -> Optional[float]:
+        """Segundos restantes no ritmo atual (None se ainda não dá para estimar)"""
+        rate = self.rate
+        if not self.total or rate <= 0:
+            return None
+        return max(0.0, (self.total - self.done) / rate)
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Estado atual para estatísticas e painéis"""
+        return {
+            'done': self.done,
+            'total': self.total,
+            'fraction': self.fraction,
+            'rate': self.rate,
+            'eta_seconds': self.eta_seconds,
+        }
+
+
+def format_eta(seconds: Optional[float]) -> str:
+    """Formata um ETA: '1h05m', '4m30s', '12s' ou '--' (desconhecido)"""
+    if seconds is None:
+        return "--"
+    seconds = int(round(seconds))
+    hours, rest = divmod(seconds, 3600)
+    minutes, seconds = divmod(rest, 60)
+    if hours:
+        return f"{hours}h{minutes:02d}m"
+    if minutes:
+        return f"{minutes}m{seconds:02d}s"
+    return f"{seconds}s"
@@ -0,0 +1,278 @@
+"""Import telemetry: batch write latency histograms, retries, a per-second throughput timeline and item sizes"""
+
+import json
+import logging
+import math
+import os
+import tempfile
+import threading
+import time
+from collections import Counter
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+
+class LatencyHistogram:
+    """Histograma de latências em faixas logarítmicas (memória fixa em importações longas)
+
+    Cada faixa cobre 1/BUCKETS_PER_DOUBLING de uma potência de 2 em
+    milissegundos (~9% de largura), então os percentis têm esse erro
+    relativo, seja a importação de minutos ou de horas.
+    """
+
+    BUCKETS_PER_DOUBLING = 8
+
+    def __init__(self):
+        self.buckets = Counter()
+        self.count = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+
+    def add(self, seconds: float):
+        ms = max(seconds * 1000.0, 0.001)
+        self.buckets[math.ceil(math.log2(ms) * self.BUCKETS_PER_DOUBLING)] += 1
+        self.count += 1
+        self.total_ms += ms
+        self.max_ms = max(self.max_ms, ms)
+
+    def _upper_ms(self, bucket: int) -> float:
+        return 2 ** (bucket / self.BUCKETS_PER_DOUBLING)
+
+    def percentile(self, percent: float) -> float:
+        """Latência (ms) abaixo da qual estão ``percent``% das amostras"""
+        if not self.count:
+            return 0.0
+        rank = self.count * percent / 100.0
+        seen = 0
+        for bucket in sorted(self.buckets):
+            seen += self.buckets[bucket]
+            if seen >= rank:
+                return min(self._upper_ms(bucket), self.max_ms)
+        return self.max_ms
+
+    def summary(self, include_buckets: bool = False) -> Dict[str, Any]:
+        summary = {
+            'count': self.count,
+            'mean': self.total_ms / self.count if self.count else 0.0,
+            'p50': self.percentile(50),
+            'p95': self.percentile(95),
+            'p99': self.percentile(99),
+            'max': self.max_ms,
+        }
+        if include_buckets:
+            # [limite superior da faixa em ms, amostras]
+            summary['histogram'] = [[round(self._upper_ms(bucket), 3), self.buckets[bucket]]
+                                    for bucket in sorted(self.buckets)]
+        return summary
+
+
+class ItemSizeDistribution:
+    """Distribuição de tamanhos de item (bytes, regras do DynamoDB), segura para várias threads
+
+    Faixas em potências de 2 de 1 KB a 256 KB, mais até o limite do DynamoDB
+    (400 KB) e acima dele.
+    """
+
+    LIMITS_KB = (1, 2, 4, 8, 16, 32, 64, 128, 256, 400)
+
+    def __init__(self):
+        self.counts = [0] * (len(self.LIMITS_KB) + 1)
+        self.count = 0
+        self.total_bytes = 0
+        self.max_bytes = 0
+        self._lock = threading.Lock()
+
+    def add(self, sizes: List[int]):
+        """Registra os tamanhos (bytes) de um lote de itens"""
+        with self._lock:
+            for size in sizes:
+                kb = size / 1024
+                index = 0
+                while index < len(self.LIMITS_KB) and kb > self.LIMITS_KB[index]:
+                    index += 1
+                self.counts[index] += 1
+                self.total_bytes += size
+                self.max_bytes = max(self.max_bytes, size)
+            self.count += len(sizes)
+
+    def summary(self) -> Dict[str, Any]:
+        """{'count', 'mean_bytes', 'max_bytes', 'total_bytes', 'oversize', 'buckets': [[rótulo, itens]]}"""
+        with self._lock:
+            labels = [f"<= {limit} KB" for limit in self.LIMITS_KB] + [f"> {self.LIMITS_KB[-1]} KB"]
+            return {
+                'count': self.count,
+                'mean_bytes': self.total_bytes / self.count if self.count else 0.0,
+                'max_bytes': self.max_bytes,
+                'total_bytes': self.total_bytes,
+                'oversize': self.counts[-1],
+                'buckets': [[label, count] for label, count in zip(labels, self.counts) if count],
+            }
+
+
+class ImportTelemetry:
+    """Telemetria de uma importação, alimentada pelas threads escritoras
+
+    Registra cada chamada batch_write_item (latência, itens enviados,
+    UnprocessedItems, erro) e cada lote concluído (latência total com
+    retries), além de uma linha do tempo com um ponto por segundo.
+    """
+
+    LIVE_SECONDS = 120  # Pontos da linha do tempo em snapshot() (gráficos ao vivo)
+
+    def __init__(self, table_name: str = None, source: str = None):
+        self.table_name = table_name
+        self.source = source
+        self.started_at = datetime.now()
+        self._started = time.monotonic()
+        self._lock = threading.Lock()
+
+        self.call_latency = LatencyHistogram()
+        self.batch_latency = LatencyHistogram()
+        self.calls = 0
+        self.batches = 0
+        self.items_sent = 0
+        self.items_written = 0
+        self.items_failed = 0
+        self.unprocessed_items = 0
+        self.errors = Counter()  # código do erro -> chamadas
+        # Um ponto por segundo: [itens escritos, chamadas, soma das latências (ms),
+        # itens não processados, erros, concorrência permitida]
+        self._timeline: List[List[float]] = []
+
+    def _slot(self, now: float) -> List[float]:
+        second = int(now - self._started)
+        while len(self._timeline) <= second:
+            self._timeline.append([0, 0, 0.0, 0, 0, 0])
+        return self._timeline[second]
+
+    def record_call(self, seconds: float, items: int, unprocessed: int,
+                    error: Optional[str] = None, concurrency: int = 0):
+        """
+        Registra uma chamada batch_write_item.
+
+        Args:
+            seconds: Duração da chamada
+            items: Itens enviados
+            unprocessed: Itens devolvidos em UnprocessedItems (todos, se a chamada falhou)
+            error: Código do erro, se a chamada falhou
+            concurrency: Chamadas simultâneas permitidas no momento
+        """
+        with self._lock:
+            self.call_latency.add(seconds)
+            self.calls += 1
+            self.items_sent += items
+            written = items - unprocessed
+            self.items_written += written
+            slot = self._slot(time.monotonic())
+            slot[0] += written
+            slot[1] += 1
+            slot[2] += seconds * 1000.0
+            slot[5] = concurrency
+            if error:
+                self.errors[error] += 1
+                slot[4] += 1
+            else:
+                self.unprocessed_items += unprocessed
+                slot[3] += unprocessed
+
+    def record_batch(self, seconds: float, failed: int = 0):
+        """Registra um lote concluído (duração total, com retries e backoff)"""
+        with self._lock:
+            self.batch_latency.add(seconds)
+            self.batches += 1
+            self.items_failed += failed
+
+    @property
+    def retries(self) -> int:
+        """Chamadas além da primeira de cada lote"""
+        return max(0, self.calls - self.batches)
+
+    def _totals(self) -> Dict[str, Any]:
+        return {
+            'elapsed_seconds': time.monotonic() - self._started,
+            'calls': self.calls,
+            'batches': self.batches,
+            'retries': self.retries,
+            'items_sent': self.items_sent,
+            'items_written': self.items_written,
+            'items_failed': self.items_failed,
+            'unprocessed_items': self.unprocessed_items,
+            'unprocessed_rate': self.unprocessed_items / self.items_sent if self.items_sent else 0.0,
+            'errors': dict(self.errors),
+        }
+
+    def summary(self) -> Dict[str, Any]:
+        """Totais e percentis (sem a linha do tempo), para as estatísticas"""
+        with self._lock:
+            summary = self._totals()
+            summary['call_latency_ms'] = self.call_latency.summary()
+            summary['batch_latency_ms'] = self.batch_latency.summary()
+        return summary
+
+    def snapshot(self, last_seconds: int = LIVE_SECONDS) -> Dict[str, Any]:
+        """summary() mais os itens/s dos últimos segundos completos, para gráficos ao vivo"""
+        summary = self.summary()
+        with self._lock:
+            # O segundo atual ainda está incompleto
+            complete = self._timeline[:int(time.monotonic() - self._started)]
+            summary['items_per_second'] = [slot[0] for slot in complete[-last_seconds:]]
+        return summary
+
+    def report(self) -> Dict[str, Any]:
+        """Relatório completo: totais, histogramas e a linha do tempo segundo a segundo"""
+        with self._lock:
+            report = {
+                'table': self.table_name,
+                'source': self.source,
+                'started_at': self.started_at.isoformat(timespec='seconds'),
+            }
+            report.update(self._totals())
+            report['call_latency_ms'] = self.call_latency.summary(include_buckets=True)
+            report['batch_latency_ms'] = self.batch_latency.summary(include_buckets=True)
+            report['timeline'] = [
+                {
+                    'second': second,
+                    'items': slot[0],
+                    'calls': slot[1],
+                    'latency_ms': round(slot[2] / slot[1], 2) if slot[1] else None,
+                    'unprocessed': slot[3],
+                    'errors': slot[4],
+                    'concurrency': slot[5] or None,
+                }
+                for second, slot in enumerate(self._timeline)
+            ]
+        return report
+
+    def write_report(self, path: str = None) -> str:
+        """
+        Grava report() em JSON.
+
+        Args:
+            path: Arquivo de destino (padrão: report_path_for(tabela))
+
+        Returns:
+            Caminho do relatório
+        """
+        path = path or report_path_for(self.table_name or 'import')
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(self.report(), f, ensure_ascii=False, indent=1)
+        return path
+
+
+def log_directory() -> str:
+    """Diretório do arquivo de log configurado (ou o diretório temporário)"""
+    for name in ('DynamoDBBatchImporter', None):
+        for handler in logging.getLogger(name).handlers:
+            if isinstance(handler, logging.FileHandler):
+                return os.path.dirname(handler.baseFilename)
+    return tempfile.gettempdir()
+
+
+def report_path_for(table_name: str) -> str:
+    """<diretório do log>/dynamodb_import-<tabela>-<data>.telemetry.json (sem sobrescrever)"""
+    stamp = datetime.now().strftime('%Y%m%d-%H%M%S')
+    base = os.path.join(log_directory(), f"dynamodb_import-{table_name}-{stamp}")
+    path, counter = f"{base}.telemetry.json", 1
+    while os.path.exists(path):
+        path, counter = f"{base}-{counter}.telemetry.json", counter + 1
+    return path
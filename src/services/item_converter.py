@@ -0,0 +1,1085 @@
+"""
+Conversão de itens JSON para PutRequests do DynamoDB.
+
+Separado do importador para que a conversão (limpeza + TypeSerializer), que
+é CPU-bound, possa rodar em processos auxiliares sem depender dos clientes
+boto3 do importador.
+"""
+
+import json
+import logging
+import math
+from datetime import datetime
+from decimal import Decimal
+from typing import Any, Dict, List, Optional, Tuple
+
+from boto3.dynamodb.types import DYNAMODB_CONTEXT, TypeSerializer
+
+from src.services.partition_spread import reorder_window
+
+
+logger = logging.getLogger('DynamoDBBatchImporter')
+
+ATTRIBUTE_TYPES = frozenset(('S', 'N', 'B', 'SS', 'NS', 'BS', 'M', 'L', 'BOOL', 'NULL'))
+MAX_ITEM_SIZE = 400 * 1024  # Limite de tamanho de item do DynamoDB (bytes)
+MAX_BATCH_ITEMS = 25  # Itens por chamada BatchWriteItem
+MAX_BATCH_BYTES = 16 * 1024 * 1024  # Tamanho máximo de uma chamada BatchWriteItem (bytes)
+_PUT_REQUEST_WRAPPER_SIZE = 26  # {"PutRequest":{"Item":...}},
+_PUT_REQUEST_SIZE = _PUT_REQUEST_WRAPPER_SIZE + 2  # ... com as chaves do item vazio
+
+# Chave repetida num lote (o BatchWriteItem recusaria o lote inteiro):
+# 'coalesce' mantém só a última escrita, 'flush' fecha o lote e começa outro
+ON_DUPLICATE_COALESCE = 'coalesce'
+ON_DUPLICATE_FLUSH = 'flush'
+DUPLICATE_POLICIES = (ON_DUPLICATE_COALESCE, ON_DUPLICATE_FLUSH)
+
+
+def _serialize_number(value) -> str:
+    """Número -> string N, com as mesmas validações do TypeSerializer."""
+    number = str(DYNAMODB_CONTEXT.create_decimal(value))
+    if number in ('Infinity', 'NaN'):
+        raise TypeError('Infinity and NaN not supported')
+    return number
+
+
+def _is_attribute_value(value: Any) -> bool:
+    """True se value parece um AttributeValue ({'S': ...}, {'N': ...}, ...)."""
+    return type(value) is dict and len(value) == 1 and next(iter(value)) in ATTRIBUTE_TYPES
+
+
+class ItemConverter:
+    """Converte, limpa e valida itens para o formato AttributeValue do DynamoDB.
+
+    Não guarda estado, então pode ser usado (e serializado) livremente em
+    processos de conversão.
+    """
+
+    def prepare_put_requests(self, items: List[Dict[str, Any]],
+                             key_schema: Optional[Dict[str, str]] = None) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+        """
+        Converte uma lista de itens em PutRequests prontos para batch_write_item.
+        
+        Cada item é convertido numa única passada (ver _encode_item), que já
+        limpa os atributos; as chaves da tabela e o limite de 400 KB são
+        conferidos no resultado.
+        
+        Args:
+            items: Itens em formato Python ou DynamoDB JSON
+            key_schema: Dicionário com schema de chaves da tabela {attr_name: 'HASH'|'RANGE'}
+            
+        Returns:
+            (lista de {'PutRequest': {'Item': ...}}, lista de rejeições {'reason', 'item'})
+        """
+        requests, _, rejects = self._prepare_put_requests(items, key_schema)
+        return requests, rejects
+    
+    def prepare_put_batches(self, items: List[Dict[str, Any]],
+                            key_schema: Optional[Dict[str, str]] = None,
+                            max_items: int = MAX_BATCH_ITEMS,
+                            on_duplicate: str = ON_DUPLICATE_COALESCE) -> Tuple[List[List[Dict[str, Any]]], List[Dict[str, Any]], int]:
+        """
+        Como prepare_put_requests, mas já agrupa os PutRequests em lotes que
+        respeitam os limites de BatchWriteItem, sem chaves repetidas num lote
+        (ver pack_batches).
+        
+        Returns:
+            (lista de lotes de PutRequests, lista de rejeições {'reason', 'item'},
+            escritas substituídas por uma posterior da mesma chave)
+        """
+        requests, sizes, rejects = self._prepare_put_requests(items, key_schema)
+        batches, coalesced = pack_batches(requests, sizes, max_items, key_schema=key_schema,
+                                          on_duplicate=on_duplicate)
+        return batches, rejects, coalesced
+    
+    def _prepare_put_requests(self, items: List[Dict[str, Any]],
+                              key_schema: Optional[Dict[str, str]]) -> Tuple[List[Dict[str, Any]], List[int], List[Dict[str, Any]]]:
+        """(PutRequests, tamanho serializado de cada um, rejeições)"""
+        requests = []
+        sizes = []
+        rejects = []
+        
+        for idx, item in enumerate(items):
+            try:
+                if not isinstance(item, dict):
+                    logger.warning(f"⚠️  Item não é dict: {type(item).__name__}")
+                    rejects.append({'reason': 'item vazio ou não é um objeto JSON', 'item': item})
+                    continue
+                
+                # Limpar atributos inválidos (strings vazias, NULL, etc) em vez de rejeitar
+                cleaned, size = self._encode_sized_item(item)
+                if not cleaned:
+                    logger.warning(f"⚠️  Item {idx} ficou vazio após limpeza, pulando")
+                    rejects.append({'reason': 'item vazio ou ficou vazio após limpeza', 'item': item})
+                    continue
+                
+                # Validar que item tem as chaves obrigatórias
+                missing_keys = self._missing_keys(cleaned, key_schema)
+                if missing_keys:
+                    logger.error(f"❌ Item {idx}: falta chave(s) obrigatória(s): {', '.join(missing_keys)}")
+                    rejects.append({
+                        'reason': f"falta chave(s) obrigatória(s): {', '.join(missing_keys)}",
+                        'item': item
+                    })
+                    continue
+                
+                # Itens acima de 400 KB fariam o DynamoDB recusar o lote inteiro
+                oversize = _oversize(cleaned, size) if size > MAX_ITEM_SIZE else 0
+                if oversize:
+                    logger.error(f"❌ Item {idx}: {oversize_reason(oversize)}")
+                    rejects.append({'reason': oversize_reason(oversize), 'item': item, 'size': oversize})
+                    continue
+                
+                requests.append({
+                    'PutRequest': {'Item': cleaned}
+                })
+                sizes.append(size)
+            except Exception as e:
+                logger.error(f"❌ Erro ao converter item {idx}: {e}")
+                if logger.isEnabledFor(logging.DEBUG):
+                    logger.debug(f"   Item problemático: {json.dumps(item, default=str)[:500]}")
+                rejects.append({'reason': f"erro de conversão: {e}", 'item': item})
+                continue
+        
+        return requests, sizes, rejects
+    
+    def prepare_typed_put_requests(self, items: List[Dict[str, Any]],
+                                   key_schema: Optional[Dict[str, str]] = None) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+        """
+        Fast path para itens que já são DynamoDB JSON válido (ex: export para S3).
+        
+        Não limpa nem reserializa atributos; só descarta itens sem as chaves da
+        tabela ou acima de 400 KB.
+        
+        Returns:
+            (lista de {'PutRequest': {'Item': ...}}, lista de rejeições {'reason', 'item'})
+        """
+        requests, _, rejects = self._prepare_typed_put_requests(items, key_schema)
+        return requests, rejects
+    
+    def prepare_typed_put_batches(self, items: List[Dict[str, Any]],
+                                  key_schema: Optional[Dict[str, str]] = None,
+                                  max_items: int = MAX_BATCH_ITEMS,
+                                  on_duplicate: str = ON_DUPLICATE_COALESCE) -> Tuple[List[List[Dict[str, Any]]], List[Dict[str, Any]], int]:
+        """prepare_typed_put_requests agrupado em lotes (ver prepare_put_batches)."""
+        requests, sizes, rejects = self._prepare_typed_put_requests(items, key_schema)
+        batches, coalesced = pack_batches(requests, sizes, max_items, key_schema=key_schema,
+                                          on_duplicate=on_duplicate)
+        return batches, rejects, coalesced
+    
+    def _prepare_typed_put_requests(self, items: List[Dict[str, Any]],
+                                    key_schema: Optional[Dict[str, str]]) -> Tuple[List[Dict[str, Any]], List[int], List[Dict[str, Any]]]:
+        """(PutRequests, tamanho serializado de cada um, rejeições)"""
+        requests = []
+        sizes = []
+        rejects = []
+        
+        for idx, item in enumerate(items):
+            missing_keys = self._missing_keys(item, key_schema)
+            if missing_keys:
+                logger.error(f"❌ Item {idx}: falta chave(s) obrigatória(s): {', '.join(missing_keys)}")
+                rejects.append({
+                    'reason': f"falta chave(s) obrigatória(s): {', '.join(missing_keys)}",
+                    'item': item
+                })
+                continue
+            size = request_size(item)
+            oversize = _oversize(item, size)
+            if oversize:
+                logger.error(f"❌ Item {idx}: {oversize_reason(oversize)}")
+                rejects.append({'reason': oversize_reason(oversize), 'item': item, 'size': oversize})
+                continue
+            requests.append({'PutRequest': {'Item': item}})
+            sizes.append(size)
+        
+        return requests, sizes, rejects
+    
+    @staticmethod
+    def _missing_keys(item: Dict[str, Any], key_schema: Optional[Dict[str, str]]) -> List[str]:
+        """Chaves da tabela ausentes no item, formatadas para log."""
+        if not key_schema:
+            return []
+        return [f"'{key_attr}' ({key_type})" for key_attr, key_type in key_schema.items()
+                if key_attr not in item]
+    
+    def _encode_item(self, item: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Converte e limpa um item numa única passada.
+        
+        Equivale a _convert_to_dynamodb_format seguido de _clean_dynamodb_item,
+        sem percorrer o item duas vezes nem criar um TypeSerializer por item.
+        O formato é detectado no próprio percurso: se o primeiro valor parece
+        um AttributeValue, o item é tratado como DynamoDB JSON (e volta para o
+        caminho Python se um dos 3 primeiros valores não for).
+        
+        Returns:
+            Item em formato DynamoDB, limpo ({} se ficou vazio)
+        """
+        return self._encode_sized_item(item)[0]
+    
+    def _encode_sized_item(self, item: Dict[str, Any]) -> Tuple[Dict[str, Any], int]:
+        """
+        _encode_item que também soma request_size do resultado no mesmo
+        percurso (cada valor devolve seu tamanho junto com o AttributeValue).
+        
+        Returns:
+            (item em formato DynamoDB, limpo, request_size do item)
+        """
+        if item and _is_attribute_value(next(iter(item.values()))):
+            cleaned = self._clean_sized_typed_item(item)
+            if cleaned is not None:
+                return cleaned
+        
+        encoded = {}
+        size = _PUT_REQUEST_SIZE
+        for key, value in item.items():
+            if value is None:
+                continue
+            if not key or not isinstance(key, str):
+                logger.warning(f"⚠️  Chave inválida: {key}, pulando")
+                continue
+            if type(value) is str:
+                # Caminho rápido para o caso mais comum (ver _encode_value)
+                if value:
+                    encoded[key] = {'S': value}
+                    size += ((len(key) + 4 if key.isascii() else _json_string_size(key) + 2)
+                             + (len(value) + 8 if value.isascii() else _json_string_size(value) + 6))
+                continue
+            try:
+                sized = self._encode_value(value, key)
+            except Exception as e:
+                logger.warning(f"⚠️  Erro ao converter atributo '{key}' (tipo {type(value).__name__}): {e}")
+                continue  # Pular atributos que não podem ser serializados
+            if sized is not None:
+                encoded[key] = sized[0]
+                # "nome":<valor>,
+                size += (len(key) + 4 if key.isascii() else _json_string_size(key) + 2) + sized[1]
+        return encoded, size
+    
+    def _clean_typed_item(self, item: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """
+        Limpa um item em DynamoDB JSON (mesmas regras de _clean_dynamodb_item).
+        
+        Returns:
+            Item limpo, ou None se o item não está em DynamoDB JSON
+        """
+        sized = self._clean_sized_typed_item(item)
+        return sized[0] if sized is not None else None
+    
+    def _clean_sized_typed_item(self, item: Dict[str, Any]) -> Optional[Tuple[Dict[str, Any], int]]:
+        """_clean_typed_item somando também request_size do resultado (ver _encode_sized_item)."""
+        cleaned = {}
+        size = _PUT_REQUEST_SIZE
+        for index, (key, value) in enumerate(item.items()):
+            # Mesmo critério de _is_dynamodb_format: os 3 primeiros valores
+            if index < 3 and not _is_attribute_value(value):
+                return None
+            if not isinstance(key, str) or not key:
+                continue
+            sized = self._clean_sized_attribute_value(value)
+            if sized is not None:
+                cleaned[key] = sized[0]
+                size += (len(key) + 4 if key.isascii() else _json_string_size(key) + 2) + sized[1]
+        return cleaned, size
+    
+    def _encode_value(self, value: Any, key: Optional[str] = None) -> Optional[Tuple[Dict[str, Any], int]]:
+        """
+        Limpa e serializa um valor Python (regras de _clean_item/_clean_value).
+        
+        Args:
+            value: Valor a converter
+            key: Nome do atributo, ou None para elementos de lista
+            
+        Returns:
+            (AttributeValue, tamanho em JSON), ou None se o valor deve ser descartado
+        """
+        if value is None:
+            return None
+        
+        if type(value) is int:
+            number = _serialize_number(value)
+            return {'N': number}, len(number) + 8
+        
+        if isinstance(value, str):
+            if not value:
+                return None
+            # {"S":"valor"}
+            return {'S': value}, (len(value) + 8 if value.isascii() else _json_string_size(value) + 6)
+        
+        # bool deve vir ANTES de int, pois bool é subclass de int
+        if isinstance(value, bool):
+            return {'BOOL': value}, 14
+        
+        if isinstance(value, int):
+            number = _serialize_number(value)
+            return {'N': number}, len(number) + 8
+        
+        if isinstance(value, float):
+            if math.isnan(value) or math.isinf(value):
+                if key is not None:
+                    logger.warning(f"⚠️  Valor inválido em '{key}': {value}, pulando")
+                return None
+            number = _serialize_number(Decimal(str(value)))
+            return {'N': number}, len(number) + 8
+        
+        if isinstance(value, Decimal):
+            number = _serialize_number(value)
+            return {'N': number}, len(number) + 8
+        
+        if isinstance(value, datetime):
+            text = value.isoformat()
+            return {'S': text}, _json_string_size(text) + 6
+        
+        if isinstance(value, (bytes, bytearray)):
+            # Bytes vazios só são descartados como atributo de mapa
+            if not value and key is not None:
+                return None
+            return {'B': value}, _base64_size(value) + 6
+        
+        if isinstance(value, list):
+            encoded_list = []
+            # {"L":[...]} e uma vírgula por elemento
+            size = 8
+            for item_in_list in value:
+                sized = self._encode_value(item_in_list)
+                if sized is not None:
+                    encoded_list.append(sized[0])
+                    size += sized[1] + 1
+            return ({'L': encoded_list}, size) if encoded_list else None
+        
+        if isinstance(value, dict):
+            encoded_map = {}
+            # {"M":{...}}
+            size = 8
+            for nested_key, nested_value in value.items():
+                if nested_value is None:
+                    continue
+                if not nested_key or not isinstance(nested_key, str):
+                    logger.warning(f"⚠️  Chave inválida: {nested_key}, pulando")
+                    continue
+                sized = self._encode_value(nested_value, nested_key)
+                if sized is not None:
+                    encoded_map[nested_key] = sized[0]
+                    size += _json_string_size(nested_key) + 2 + sized[1]
+            return ({'M': encoded_map}, size) if encoded_map else None
+        
+        # Tipo desconhecido - converter para string
+        if key is None:
+            str_value = str(value)
+        else:
+            str_value = str(value).strip()
+            if str_value:
+                logger.warning(f"⚠️  Tipo desconhecido em '{key}': {type(value).__name__}, convertendo para string")
+        return ({'S': str_value}, _json_string_size(str_value) + 6) if str_value else None
+    
+    def _convert_to_dynamodb_format(self, item: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Converte item do formato Python para formato DynamoDB nativo.
+        
+        Args:
+            item: Item em formato Python
+            
+        Returns:
+            Item em formato DynamoDB
+        """
+        if not isinstance(item, dict):
+            logger.warning(f"⚠️  Item não é dict: {type(item).__name__}")
+            return {}
+        
+        if not item:  # Item vazio
+            return item
+        
+        # Verificar se já está no formato DynamoDB (tem tipos como 'S', 'N', etc)
+        # Formato DynamoDB tem estrutura: {'field1': {'S': 'value'}, 'field2': {'N': '123'}}
+        if self._is_dynamodb_format(item):
+            logger.debug("ℹ️  Item já está em formato DynamoDB, validando e limpando...")
+            # Validar e limpar atributos problemáticos
+            cleaned = {}
+            for key, value in item.items():
+                if not isinstance(value, dict):
+                    continue  # Pular valores inválidos
+                
+                # Remover atributos NULL (DynamoDB pode rejeitar em alguns contextos)
+                if 'NULL' in value:
+                    logger.debug(f"   Removendo atributo NULL: {key}")
+                    continue
+                
+                # Remover strings vazias (DynamoDB não aceita)
+                if 'S' in value and value['S'] == '':
+                    logger.debug(f"   Removendo string vazia: {key}")
+                    continue
+                
+                # Remover sets vazios
+                if any(t in value for t in ['SS', 'NS', 'BS']) and len(value.get(list(value.keys())[0], [])) == 0:
+                    logger.debug(f"   Removendo set vazio: {key}")
+                    continue
+                
+                cleaned[key] = value
+            return cleaned if cleaned else {}
+        
+        # Limpar e validar item antes de serializar
+        cleaned_item = self._clean_item(item)
+        
+        if not cleaned_item:
+            logger.warning(f"⚠️  Item ficou vazio após limpeza")
+            return {}
+        
+        # Usar TypeSerializer do boto3 para conversão correta
+        serializer = TypeSerializer()
+        converted_item = {}
+        
+        for key, value in cleaned_item.items():
+            try:
+                # TypeSerializer converte tipos Python para DynamoDB
+                converted_item[key] = serializer.serialize(value)
+            except Exception as e:
+                logger.warning(f"⚠️  Erro ao converter atributo '{key}' (tipo {type(value).__name__}): {e}")
+                continue  # Pular atributos que não podem ser serializados
+        
+        if not converted_item:
+            logger.warning(f"⚠️  Item sem atributos válidos após conversão")
+            return {}
+        
+        return converted_item
+    
+    def _clean_dynamodb_item(self, item: Dict[str, Any], item_index: int = 0) -> Dict[str, Any]:
+        """
+        Remove atributos inválidos de um item em formato DynamoDB.
+        Remove strings vazias, NULL, sets vazios, etc.
+        
+        Args:
+            item: Item em formato DynamoDB
+            item_index: Índice do item para logs
+            
+        Returns:
+            Item limpo ou {} se ficou vazio
+        """
+        if not isinstance(item, dict):
+            return {}
+        
+        cleaned = {}
+        removed_count = 0
+        
+        for key, value in item.items():
+            if not isinstance(key, str) or not key:
+                continue
+            
+            cleaned_value = self._clean_attribute_value(value)
+            if cleaned_value is not None:
+                cleaned[key] = cleaned_value
+            else:
+                removed_count += 1
+        
+        if removed_count > 0:
+            logger.debug(f"   Item {item_index}: removidos {removed_count} atributo(s) inválido(s)")
+        
+        return cleaned
+    
+    def _clean_attribute_value(self, av: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Limpa recursivamente um AttributeValue, retornando None se inválido."""
+        sized = self._clean_sized_attribute_value(av)
+        return sized[0] if sized is not None else None
+    
+    def _clean_sized_attribute_value(self, av: Dict[str, Any]) -> Optional[Tuple[Dict[str, Any], int]]:
+        """_clean_attribute_value devolvendo também o tamanho em JSON do resultado."""
+        if not isinstance(av, dict) or len(av) != 1:
+            return None
+        
+        (type_key, type_value), = av.items()
+        
+        # Caminho rápido para os tipos escalares mais comuns ({"S":"valor"})
+        if type_key == 'S':
+            if not type_value or not isinstance(type_value, str):
+                return None
+            return av, (len(type_value) + 8 if type_value.isascii() else _json_string_size(type_value) + 6)
+        if type_key == 'N':
+            # Números são ASCII: {"N":"123"}
+            return av, (len(type_value) + 8 if type(type_value) is str else _attribute_value_wire_size(av))
+        if type_key == 'BOOL':
+            return av, 14
+        if type_key == 'B':
+            return av, _base64_size(type_value) + 6
+        
+        # Remover NULL
+        if type_key == 'NULL':
+            return None
+        
+        # Remover sets vazios
+        if type_key in ('SS', 'NS', 'BS'):
+            if not isinstance(type_value, list) or len(type_value) == 0:
+                return None
+            # Limpar elementos vazios do set ({"SS":[...]} e uma vírgula por elemento)
+            cleaned_set = []
+            size = 9
+            for v in type_value:
+                if type_key == 'SS' and isinstance(v, str) and v != '':
+                    cleaned_set.append(v)
+                    size += _json_string_size(v) + 1
+                elif type_key == 'NS' and isinstance(v, str):
+                    try:
+                        float(v)
+                        cleaned_set.append(v)
+                        size += _json_string_size(v) + 1
+                    except (TypeError, ValueError):
+                        pass
+                elif type_key == 'BS' and isinstance(v, (str, bytes, bytearray)):
+                    cleaned_set.append(v)
+                    size += _base64_size(v) + 1
+            if not cleaned_set:
+                return None
+            return {type_key: cleaned_set}, size
+        
+        # Limpar listas recursivamente ({"L":[...]} e uma vírgula por elemento)
+        if type_key == 'L':
+            if not isinstance(type_value, list):
+                return None
+            cleaned_list = []
+            size = 8
+            for inner_av in type_value:
+                sized = self._clean_sized_attribute_value(inner_av)
+                if sized is not None:
+                    cleaned_list.append(sized[0])
+                    size += sized[1] + 1
+            if not cleaned_list:
+                return None
+            return {type_key: cleaned_list}, size
+        
+        # Limpar mapas recursivamente ({"M":{...}})
+        if type_key == 'M':
+            if not isinstance(type_value, dict):
+                return None
+            cleaned_map = {}
+            size = 8
+            for nested_key, nested_av in type_value.items():
+                if not isinstance(nested_key, str) or not nested_key:
+                    continue
+                sized = self._clean_sized_attribute_value(nested_av)
+                if sized is not None:
+                    cleaned_map[nested_key] = sized[0]
+                    size += _json_string_size(nested_key) + 2 + sized[1]
+            if not cleaned_map:
+                return None
+            return {type_key: cleaned_map}, size
+        
+        # Outros tipos (não validados aqui)
+        return av, _attribute_value_wire_size(av)
+    
+    def _validate_dynamodb_item(self, item: Dict[str, Any], item_index: int = 0) -> bool:
+        """
+        Valida se um item convertido está em formato válido para DynamoDB.
+        
+        Args:
+            item: Item em formato DynamoDB (AttributeValue)
+            item_index: Índice do item para logs
+            
+        Returns:
+            True se válido, False caso contrário
+        """
+        if not isinstance(item, dict):
+            logger.warning(f"⚠️  Item {item_index} não é dict: {type(item).__name__}")
+            return False
+        
+        def _validate_av(attr_key: str, av: Dict[str, Any], path: str) -> bool:
+            """Valida recursivamente um AttributeValue."""
+            # Valor deve ser um dict com exatamente 1 chave
+            if not isinstance(av, dict):
+                logger.error(f"❌ {path}: valor não é dict - {type(av).__name__}")
+                return False
+            if len(av) != 1:
+                logger.error(f"❌ {path}: dict com múltiplas chaves - {list(av.keys())}")
+                return False
+            
+            type_key = next(iter(av.keys()))
+            type_value = av[type_key]
+            
+            valid_types = ['S', 'N', 'B', 'SS', 'NS', 'BS', 'M', 'L', 'BOOL', 'NULL']
+            if type_key not in valid_types:
+                logger.error(f"❌ {path}: tipo inválido - {type_key}")
+                return False
+            
+            # Tipos escalares simples
+            if type_key == 'S':
+                if not isinstance(type_value, str):
+                    logger.error(f"❌ {path}: S deve ser string, got {type(type_value).__name__}")
+                    return False
+                if type_value == '':
+                    logger.error(f"❌ {path}: string vazia não permitida")
+                    return False
+            
+            elif type_key == 'N':
+                if not isinstance(type_value, str):
+                    logger.error(f"❌ {path}: N deve ser string, got {type(type_value).__name__}")
+                    return False
+                try:
+                    float(type_value)
+                except (TypeError, ValueError):
+                    logger.error(f"❌ {path}: N valor inválido - {type_value}")
+                    return False
+            
+            elif type_key == 'BOOL':
+                if not isinstance(type_value, bool):
+                    logger.error(f"❌ {path}: BOOL deve ser bool, got {type(type_value).__name__}")
+                    return False
+            
+            elif type_key == 'NULL':
+                # DynamoDB espera literalmente true
+                if type_value is not True:
+                    logger.error(f"❌ {path}: NULL deve ser true, got {type_value}")
+                    return False
+            
+            # Sets (SS/NS/BS)
+            elif type_key in ('SS', 'NS', 'BS'):
+                if not isinstance(type_value, list):
+                    logger.error(f"❌ {path}: {type_key} deve ser list, got {type(type_value).__name__}")
+                    return False
+                if len(type_value) == 0:
+                    logger.error(f"❌ {path}: {type_key} não pode ser lista vazia")
+                    return False
+                
+                for i, v in enumerate(type_value):
+                    elem_path = f"{path}[{i}]"
+                    if type_key == 'SS':
+                        if not isinstance(v, str) or v == '':
+                            logger.error(f"❌ {elem_path}: SS deve conter strings não vazias, got {repr(v)}")
+                            return False
+                    elif type_key == 'NS':
+                        if not isinstance(v, str):
+                            logger.error(f"❌ {elem_path}: NS deve conter strings numéricas, got {type(v).__name__}")
+                            return False
+                        try:
+                            float(v)
+                        except (TypeError, ValueError):
+                            logger.error(f"❌ {elem_path}: NS valor inválido - {v}")
+                            return False
+                    elif type_key == 'BS':
+                        # Em JSON normalmente vem como base64 string
+                        if not isinstance(v, (str, bytes, bytearray)):
+                            logger.error(f"❌ {elem_path}: BS deve conter strings/bytes, got {type(v).__name__}")
+                            return False
+            
+            # Lista
+            elif type_key == 'L':
+                if not isinstance(type_value, list):
+                    logger.error(f"❌ {path}: L deve ser list, got {type(type_value).__name__}")
+                    return False
+                for i, inner_av in enumerate(type_value):
+                    if not _validate_av(attr_key, inner_av, f"{path}[{i}]"):
+                        return False
+            
+            # Mapa
+            elif type_key == 'M':
+                if not isinstance(type_value, dict):
+                    logger.error(f"❌ {path}: M deve ser dict, got {type(type_value).__name__}")
+                    return False
+                for nested_key, nested_av in type_value.items():
+                    if not isinstance(nested_key, str) or not nested_key:
+                        logger.error(f"❌ {path}: chave de M inválida - {repr(nested_key)}")
+                        return False
+                    if not _validate_av(nested_key, nested_av, f"{path}.{nested_key}"):
+                        return False
+            
+            return True
+        
+        # Validação de cada atributo na raiz
+        for key, value in item.items():
+            # Validar chave
+            if not isinstance(key, str) or not key:
+                logger.error(f"❌ Item {item_index}: chave inválida - {repr(key)}")
+                return False
+            
+            if not _validate_av(key, value, f"Item {item_index}.{key}"):
+                return False
+        
+        return True
+    
+    def _is_dynamodb_format(self, item: Dict[str, Any]) -> bool:
+        """
+        Verifica se um item já está em formato DynamoDB.
+        
+        Formato DynamoDB: cada valor é um dict com EXATAMENTE uma chave de tipo
+        Ex: {'field': {'S': 'string'}} ou {'count': {'N': '42'}}
+        
+        Vs Python dict: {'nested': {'field1': 'value', 'field2': 123}}
+        """
+        if not item:
+            return False
+        
+        # Verificar os primeiros valores para determinar o formato
+        checked = 0
+        for value in item.values():
+            if not isinstance(value, dict):
+                # Se qualquer valor não é dict, não é DynamoDB format
+                return False
+            
+            # DynamoDB format tem exatamente 1 chave de tipo
+            if len(value) != 1:
+                return False
+            
+            # Verificar se tem uma chave de tipo DynamoDB (S, N, B, SS, NS, BS, M, L, BOOL, NULL)
+            has_type_key = any(k in value for k in ['S', 'N', 'B', 'SS', 'NS', 'BS', 'M', 'L', 'BOOL', 'NULL'])
+            
+            if not has_type_key:
+                return False
+            
+            checked += 1
+            if checked >= 3:  # Verificar apenas os 3 primeiros
+                break
+        
+        return checked > 0
+    
+    def _clean_item(self, item: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Limpa e valida um item para garantir compatibilidade com DynamoDB.
+        Remove valores inválidos (strings vazias, NaN, Infinity, None, datetime, floats).
+        
+        Args:
+            item: Item a limpar
+            
+        Returns:
+            Item limpo e validado
+        """
+        cleaned = {}
+        
+        for key, value in item.items():
+            if value is None:
+                # DynamoDB exige NULL explícito, mas vamos pular None por segurança
+                continue
+            
+            # Validar key (não pode ser vazio)
+            if not key or not isinstance(key, str):
+                logger.warning(f"⚠️  Chave inválida: {key}, pulando")
+                continue
+            
+            # Processar strings
+            if isinstance(value, str):
+                if value == '':
+                    continue  # Skip empty strings
+                cleaned[key] = value
+            
+            # Processar números
+            elif isinstance(value, bool):
+                # bool deve vir ANTES de int/float check, pois bool é subclass de int
+                cleaned[key] = value
+            
+            elif isinstance(value, int):
+                cleaned[key] = value
+            
+            elif isinstance(value, float):
+                # Float não é suportado - converter para Decimal ou remover
+                if math.isnan(value) or math.isinf(value):
+                    # Valores inválidos - pular
+                    logger.warning(f"⚠️  Valor inválido em '{key}': {value}, pulando")
+                    continue
+                else:
+                    # Converter float para Decimal para DynamoDB
+                    cleaned[key] = Decimal(str(value))
+            
+            elif isinstance(value, Decimal):
+                cleaned[key] = value
+            
+            elif isinstance(value, datetime):
+                # datetime -> ISO 8601 string
+                cleaned[key] = value.isoformat()
+            
+            elif isinstance(value, (bytes, bytearray)):
+                # Bytes ficam como base64 automaticamente pelo TypeSerializer
+                if len(value) > 0:  # Não permitir bytes vazios
+                    cleaned[key] = value
+            
+            # Processar listas recursivamente
+            elif isinstance(value, list):
+                cleaned_list = []
+                for item_in_list in value:
+                    cleaned_item_value = self._clean_value(item_in_list)
+                    if cleaned_item_value is not None:
+                        cleaned_list.append(cleaned_item_value)
+                
+                if cleaned_list:  # Só adicionar se não vazio
+                    cleaned[key] = cleaned_list
+            
+            # Processar dicts recursivamente
+            elif isinstance(value, dict):
+                cleaned_dict = self._clean_item(value)
+                if cleaned_dict:  # Só adicionar se não vazio
+                    cleaned[key] = cleaned_dict
+            
+            else:
+                # Tipo desconhecido - converter para string
+                str_value = str(value).strip()
+                if str_value:
+                    logger.warning(f"⚠️  Tipo desconhecido em '{key}': {type(value).__name__}, convertendo para string")
+                    cleaned[key] = str_value
+        
+        return cleaned
+    
+    def _clean_value(self, value: Any) -> Any:
+        """
+        Limpa um valor individual (usado em listas).
+        
+        Args:
+            value: Valor a limpar
+            
+        Returns:
+            Valor limpo ou None se deve ser descartado
+        """
+        if value is None:
+            return None
+        
+        if isinstance(value, str):
+            return value if value != '' else None
+        
+        if isinstance(value, bool):
+            return value
+        
+        if isinstance(value, int):
+            return value
+        
+        if isinstance(value, float):
+            if math.isnan(value) or math.isinf(value):
+                return None
+            return Decimal(str(value))
+        
+        if isinstance(value, Decimal):
+            return value
+        
+        if isinstance(value, datetime):
+            return value.isoformat()
+        
+        if isinstance(value, (bytes, bytearray)):
+            return value
+        
+        if isinstance(value, list):
+            cleaned_list = []
+            for item in value:
+                cleaned_item = self._clean_value(item)
+                if cleaned_item is not None:
+                    cleaned_list.append(cleaned_item)
+            return cleaned_list if cleaned_list else None
+        
+        if isinstance(value, dict):
+            cleaned_dict = self._clean_item(value)
+            return cleaned_dict if cleaned_dict else None
+        
+        # Tipo desconhecido - converter para string
+        return str(value)
+
+def dynamodb_item_size(item: Dict[str, Any]) -> int:
+    """
+    Tamanho de um item em DynamoDB JSON, pelas regras de cálculo do DynamoDB
+    (nomes + valores; usado para capacidade e para o limite de 400 KB).
+    """
+    return sum(_utf8_size(name) + _attribute_value_size(av) for name, av in item.items())
+
+
+def write_capacity_units(item: Dict[str, Any]) -> int:
+    """WCUs de um PutItem: 1 por KB (arredondado para cima), no mínimo 1."""
+    return max(1, math.ceil(dynamodb_item_size(item) / 1024))
+
+
+def _utf8_size(value: str) -> int:
+    return len(value) if value.isascii() else len(value.encode('utf-8'))
+
+
+def _binary_size(value: Any) -> int:
+    # Binários lidos de JSON vêm em base64
+    if isinstance(value, str):
+        return len(value) * 3 // 4 - value.count('=', -2)
+    return len(value)
+
+
+def _number_size(value: str) -> int:
+    digits = value.lstrip('-').split('e')[0].split('E')[0].replace('.', '').strip('0')
+    return (len(digits) + 1) // 2 + 1
+
+
+def _attribute_value_size(av: Any) -> int:
+    if not isinstance(av, dict) or len(av) != 1:
+        return 0
+    (type_key, value), = av.items()
+    if type_key == 'S':
+        return _utf8_size(value)
+    if type_key == 'N':
+        return _number_size(str(value))
+    if type_key == 'B':
+        return _binary_size(value)
+    if type_key in ('BOOL', 'NULL'):
+        return 1
+    if type_key == 'SS':
+        return sum(_utf8_size(v) for v in value)
+    if type_key == 'NS':
+        return sum(_number_size(str(v)) for v in value)
+    if type_key == 'BS':
+        return sum(_binary_size(v) for v in value)
+    if type_key == 'L':
+        # 3 bytes do tipo + 1 byte por elemento
+        return 3 + sum(1 + _attribute_value_size(v) for v in value)
+    if type_key == 'M':
+        return 3 + sum(1 + _utf8_size(k) + _attribute_value_size(v) for k, v in value.items())
+    return 0
+
+
+def request_size(item: Dict[str, Any]) -> int:
+    """
+    Tamanho aproximado de {'PutRequest': {'Item': item}} no corpo JSON da
+    chamada BatchWriteItem (limite de 16 MB por chamada).
+    
+    Nunca é menor que dynamodb_item_size(item): nomes e valores contam pelo
+    menos o mesmo tanto, mais aspas, tipos e binários em base64.
+    """
+    return _PUT_REQUEST_WRAPPER_SIZE + _map_wire_size(item)
+
+
+def pack_batches(requests: List[Dict[str, Any]], sizes: Optional[List[int]] = None,
+                 max_items: int = MAX_BATCH_ITEMS, max_bytes: int = MAX_BATCH_BYTES,
+                 key_schema: Optional[Dict[str, str]] = None,
+                 on_duplicate: str = ON_DUPLICATE_COALESCE) -> Tuple[List[List[Dict[str, Any]]], int]:
+    """
+    Agrupa PutRequests, na ordem, em lotes de até max_items itens e max_bytes
+    bytes serializados (request_size).
+    
+    Com key_schema, as chaves de cada lote são acompanhadas: uma chave
+    repetida substitui a escrita anterior no lote ('coalesce', o resultado
+    final na tabela é o mesmo) ou fecha o lote antes dela ('flush', todas as
+    escritas são enviadas, mas lotes diferentes podem ser escritos fora de
+    ordem pelas threads escritoras).
+    
+    Args:
+        requests: Lista de {'PutRequest': {'Item': ...}}
+        sizes: request_size de cada PutRequest (calculado se None)
+        key_schema: Chaves da tabela {attr_name: 'HASH'|'RANGE'} (None = não verificar repetidas)
+        on_duplicate: 'coalesce' ou 'flush'
+    
+    Returns:
+        (lotes, escritas substituídas por uma posterior da mesma chave)
+    """
+    if on_duplicate not in DUPLICATE_POLICIES:
+        raise ValueError(f"on_duplicate inválido: {on_duplicate!r} (use {' ou '.join(DUPLICATE_POLICIES)})")
+    if sizes is None:
+        sizes = [request_size(request['PutRequest']['Item']) for request in requests]
+    key_names = list(key_schema) if key_schema else None
+    
+    batches = []
+    batch = []  # PutRequests do lote (None = substituído por uma escrita posterior)
+    batch_sizes = []
+    batch_count = 0
+    batch_bytes = 0
+    keys = {}  # chave -> posição no lote
+    coalesced = 0
+    
+    def close():
+        batches.append([request for request in batch if request is not None])
+    
+    for request, size in zip(requests, sizes):
+        key = _item_key(request['PutRequest']['Item'], key_names) if key_names else None
+        index = keys.get(key) if key is not None else None
+        if index is not None and on_duplicate == ON_DUPLICATE_COALESCE:
+            batch[index] = None
+            batch_count -= 1
+            batch_bytes -= batch_sizes[index]
+            coalesced += 1
+            del keys[key]
+        if batch_count and (index is not None and on_duplicate == ON_DUPLICATE_FLUSH
+                            or batch_count >= max_items or batch_bytes + size > max_bytes):
+            close()
+            batch, batch_sizes, keys = [], [], {}
+            batch_count = batch_bytes = 0
+        if key is not None:
+            keys[key] = len(batch)
+        batch.append(request)
+        batch_sizes.append(size)
+        batch_count += 1
+        batch_bytes += size
+    if batch_count:
+        close()
+    return batches, coalesced
+
+
+def _item_key(item: Dict[str, Any], key_names: List[str]) -> Optional[tuple]:
+    """Valores da chave primária de um item em DynamoDB JSON (None se falta algum)"""
+    try:
+        return tuple(next(iter(item[name].values())) for name in key_names)
+    except (KeyError, AttributeError, StopIteration):
+        return None
+
+
+def oversize_reason(size: int) -> str:
+    """Motivo de rejeição de um item acima do limite de 400 KB"""
+    return f"item com {size:,} bytes, acima do limite de {MAX_ITEM_SIZE // 1024} KB"
+
+
+def _oversize(item: Dict[str, Any], size: int) -> int:
+    """Tamanho do item se passa de MAX_ITEM_SIZE, senão 0 (size = request_size do item)."""
+    if size <= MAX_ITEM_SIZE:
+        # request_size é um limite superior: o cálculo exato só para itens grandes
+        return 0
+    item_size = dynamodb_item_size(item)
+    return item_size if item_size > MAX_ITEM_SIZE else 0
+
+
+def _json_string_size(value: str) -> int:
+    # ensure_ascii: caracteres fora do ASCII viram escapes \uXXXX no corpo da chamada
+    return len(value) + 2 if value.isascii() else len(json.dumps(value))
+
+
+def _base64_size(value: Any) -> int:
+    if isinstance(value, str):
+        return len(value) + 2
+    return 4 * math.ceil(len(value) / 3) + 2
+
+
+def _map_wire_size(value: Dict[str, Any]) -> int:
+    # {"nome":<valor>,...}, com S/N (a maioria dos atributos) calculados aqui mesmo
+    size = 2
+    for name, av in value.items():
+        size += _json_string_size(name) + 2
+        if type(av) is dict and len(av) == 1:
+            for type_key, v in av.items():
+                if type(v) is str and (type_key == 'S' or type_key == 'N'):
+                    size += 6 + _json_string_size(v)
+                else:
+                    size += _attribute_value_wire_size(av)
+        else:
+            size += 2
+    return size
+
+
+def _attribute_value_wire_size(av: Any) -> int:
+    if not isinstance(av, dict) or len(av) != 1:
+        return 2
+    (type_key, value), = av.items()
+    # {"T":<valor>}
+    size = len(type_key) + 5
+    if type_key in ('S', 'N'):
+        return size + _json_string_size(str(value))
+    if type_key == 'B':
+        return size + _base64_size(value)
+    if type_key in ('BOOL', 'NULL'):
+        return size + 5
+    if type_key in ('SS', 'NS'):
+        return size + 2 + sum(1 + _json_string_size(str(v)) for v in value)
+    if type_key == 'BS':
+        return size + 2 + sum(1 + _base64_size(v) for v in value)
+    if type_key == 'L':
+        return size + 2 + sum(1 + _attribute_value_wire_size(v) for v in value)
+    if type_key == 'M':
+        return size + _map_wire_size(value)
+    return size
+
+
+_converter = ItemConverter()
+
+
+def convert_chunk(items: List[Dict[str, Any]],
+                  key_schema: Optional[Dict[str, str]] = None,
+                  on_duplicate: str = ON_DUPLICATE_COALESCE,
+                  spread_partitions: bool = False) -> Tuple[List[List[Dict[str, Any]]], List[Dict[str, Any]], int]:
+    """
+    Ponto de entrada dos processos de conversão (ver ItemConverter.prepare_put_batches).
+    
+    Com spread_partitions, o bloco é reordenado alternando as chaves de
+    partição antes de formar os lotes (ver partition_spread.reorder_window).
+    """
+    replaced = 0
+    if spread_partitions:
+        items, replaced = reorder_window(items, key_schema, on_duplicate == ON_DUPLICATE_COALESCE)
+    batches, rejects, coalesced = _converter.prepare_put_batches(items, key_schema, on_duplicate=on_duplicate)
+    return batches, rejects, coalesced + replaced
@@ -0,0 +1,157 @@
+"""
+Leitura de arquivos JSON Lines (NDJSON): um item JSON por linha.
+
+Arquivos grandes são divididos em faixas de bytes alinhadas em quebras de
+linha, que podem ser lidas (via mmap) e convertidas em paralelo por
+processos auxiliares. As funções de faixa ficam no nível do módulo para
+poderem ser enviadas a um ProcessPoolExecutor.
+"""
+
+import json
+import logging
+import mmap
+import os
+from decimal import Decimal
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+from src.services.item_converter import ON_DUPLICATE_COALESCE, convert_chunk
+
+
+logger = logging.getLogger('DynamoDBBatchImporter')
+
+NDJSON_EXTENSIONS = ('.jsonl', '.ndjson')
+
+
+def is_ndjson(file_path: str, sample: Optional[bytes] = None) -> bool:
+    """
+    Verifica se um arquivo é JSON Lines.
+
+    Pela extensão (.jsonl/.ndjson) ou, se não houver, pelo conteúdo: a
+    primeira linha é um objeto JSON completo e a próxima começa outro.
+
+    Args:
+        file_path: Caminho do arquivo
+        sample: Início do arquivo já lido (opcional)
+    """
+    if file_path.lower().endswith(NDJSON_EXTENSIONS):
+        return True
+
+    if sample is None:
+        with open(file_path, 'rb') as f:
+            sample = f.read(65536)
+
+    first_line, newline, rest = sample.lstrip().partition(b'\n')
+    if not newline or not first_line.strip().startswith(b'{') or not rest.lstrip().startswith(b'{'):
+        return False
+    try:
+        return isinstance(json.loads(first_line), dict)
+    except ValueError:
+        return False
+
+
+def parse_line(line: bytes) -> Any:
+    """Decodifica uma linha (números como Decimal, igual ao ijson)."""
+    return json.loads(line, parse_float=Decimal)
+
+
+def iter_items(f, on_invalid: Optional[Callable[[Dict[str, Any]], None]] = None) -> Iterator[Dict[str, Any]]:
+    """
+    Faz streaming dos itens de um arquivo JSON Lines aberto em modo binário.
+
+    Linhas vazias são ignoradas; linhas inválidas são registradas no log e
+    puladas.
+
+    Args:
+        f: Arquivo binário
+        on_invalid: Callback(rejeição) para cada linha inválida ({'reason', 'line'})
+    """
+    for line_number, line in enumerate(f, 1):
+        if not line.strip():
+            continue
+        try:
+            yield parse_line(line)
+        except ValueError as e:
+            logger.error(f"❌ Linha {line_number} inválida: {e}")
+            if on_invalid:
+                on_invalid(_invalid_line(line, e))
+
+
+def _invalid_line(line: bytes, error: Exception) -> Dict[str, Any]:
+    """Rejeição de uma linha que não é JSON válido"""
+    return {'reason': f"JSON inválido: {error}", 'line': bytes(line).decode('utf-8', 'replace').rstrip('\r\n')}
+
+
+def split_ranges(file_path: str, range_size: int, start: int = 0) -> List[Tuple[int, int]]:
+    """
+    Divide o arquivo em faixas de ~range_size bytes terminando em quebra de linha.
+
+    Args:
+        file_path: Caminho do arquivo
+        range_size: Tamanho aproximado de cada faixa
+        start: Byte inicial (deve ser início de linha)
+
+    Returns:
+        Lista de (início, fim) cobrindo o arquivo a partir de start, em ordem
+    """
+    size = os.path.getsize(file_path)
+    if size <= start:
+        return []
+
+    ranges = []
+    with open(file_path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        while start < size:
+            end = start + range_size
+            if end >= size:
+                end = size
+            else:
+                newline = mm.find(b'\n', end)
+                end = size if newline == -1 else newline + 1
+            ranges.append((start, end))
+            start = end
+    return ranges
+
+
+def parse_range(file_path: str, start: int, end: int) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+    """
+    Lê os itens de uma faixa de bytes do arquivo (via mmap).
+
+    Returns:
+        (itens, rejeições das linhas inválidas)
+    """
+    items = []
+    invalid = []
+    with open(file_path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        position = start
+        while position < end:
+            newline = mm.find(b'\n', position, end)
+            line_end = end if newline == -1 else newline
+            line = mm[position:line_end]
+            line_start, position = position, line_end + 1
+            if not line.strip():
+                continue
+            try:
+                items.append(parse_line(line))
+            except ValueError as e:
+                logger.error(f"❌ Linha inválida no byte {line_start}: {e}")
+                reject = _invalid_line(line, e)
+                reject['byte'] = line_start
+                invalid.append(reject)
+    return items, invalid
+
+
+def convert_range(file_path: str, start: int, end: int,
+                  key_schema: Optional[Dict[str, str]] = None,
+                  on_duplicate: str = ON_DUPLICATE_COALESCE,
+                  spread_partitions: bool = False) -> Tuple[List[List[Dict[str, Any]]], List[Dict[str, Any]], int]:
+    """
+    Lê e converte uma faixa de bytes em lotes de PutRequests (executado em processos).
+
+    Com spread_partitions, a faixa inteira é a janela de reordenação (ver convert_chunk).
+
+    Returns:
+        (lotes de PutRequests, rejeições, incluindo linhas inválidas, escritas
+        substituídas por uma posterior da mesma chave)
+    """
+    items, invalid = parse_range(file_path, start, end)
+    batches, rejects, coalesced = convert_chunk(items, key_schema, on_duplicate, spread_partitions)
+    return batches, invalid + rejects, coalesced
@@ -0,0 +1,109 @@
+"""Partition-spreading reorder for dumps exported in key order (hot partitions)"""
+
+import json
+from itertools import zip_longest
+from typing import Any, Callable, Dict, List, Optional, Tuple, TypeVar
+
+
+T = TypeVar('T')
+
+_MISSING = object()
+
+
+def hash_key_name(key_schema: Optional[Dict[str, str]]) -> Optional[str]:
+    """Nome da chave de partição (HASH) de {attr_name: 'HASH'|'RANGE'}, ou None"""
+    for name, key_type in (key_schema or {}).items():
+        if key_type == 'HASH':
+            return name
+    return None
+
+
+def interleave_partitions(items: List[T], partition_of: Callable[[T], Any]) -> List[T]:
+    """
+    Reordena uma janela de itens alternando as chaves de partição.
+
+    Cada rodada pega o próximo item de cada partição, na ordem em que as
+    partições aparecem na janela. Assim, lotes consecutivos (escritos ao
+    mesmo tempo pelas threads escritoras) caem em partições diferentes em
+    vez de 25 itens seguidos na mesma. A ordem dentro de cada partição é
+    mantida e a memória fica limitada ao tamanho da janela.
+
+    Args:
+        items: Janela de itens (ex: um bloco lido do dump)
+        partition_of: Função que devolve um valor hashable da chave de partição do item
+
+    Returns:
+        Os mesmos itens em outra ordem (a própria lista se não há o que alternar)
+    """
+    partitions: Dict[Any, List[T]] = {}
+    for item in items:
+        partitions.setdefault(partition_of(item), []).append(item)
+    if len(partitions) <= 1 or len(partitions) == len(items):
+        return items
+    return [item for round_items in zip_longest(*partitions.values(), fillvalue=_MISSING)
+            for item in round_items if item is not _MISSING]
+
+
+def latest_per_key(items: List[T], key_of: Callable[[T], Any]) -> Tuple[List[T], int]:
+    """
+    Mantém só a última escrita de cada chave primária completa da janela
+    (o resultado final na tabela é o mesmo). Itens sem chave ficam todos.
+
+    Returns:
+        (itens restantes na ordem original, escritas substituídas por uma posterior)
+    """
+    keys = [key_of(item) for item in items]
+    last: Dict[Any, int] = {}
+    for index, key in enumerate(keys):
+        if key is not None:
+            last[key] = index
+    replaced = sum(1 for key in keys if key is not None) - len(last)
+    if not replaced:
+        return items, 0
+    return [item for index, (item, key) in enumerate(zip(items, keys))
+            if key is None or last[key] == index], replaced
+
+
+def reorder_window(items: List[Any], key_schema: Optional[Dict[str, str]],
+                   coalesce: bool) -> Tuple[List[Any], int]:
+    """
+    Reordena uma janela de itens ainda não convertidos (--spread-partitions).
+
+    Com coalesce, as escritas substituídas por uma posterior da mesma chave
+    completa saem antes de alternar as partições (latest_per_key), senão a
+    alternância as espalharia por lotes diferentes em vez de juntá-las numa
+    só escrita. Com flush todas são enviadas: as escritas de uma chave em
+    lotes diferentes seguem a ordem do arquivo pelas threads escritoras.
+
+    Args:
+        items: Janela de itens (Python ou DynamoDB JSON)
+        key_schema: Chaves da tabela {attr_name: 'HASH'|'RANGE'}
+        coalesce: True para --on-duplicate coalesce
+
+    Returns:
+        (itens reordenados, escritas substituídas)
+    """
+    hash_key = hash_key_name(key_schema)
+    if not hash_key:
+        return items, 0
+    replaced = 0
+    if coalesce:
+        key_names = list(key_schema)
+        items, replaced = latest_per_key(items, lambda item: raw_item_key(item, key_names))
+    return interleave_partitions(items, lambda item: raw_partition_value(item, hash_key)), replaced
+
+
+def raw_partition_value(item: Any, hash_key: str) -> Any:
+    """Chave de partição de um item ainda não convertido (Python ou DynamoDB JSON)"""
+    if not isinstance(item, dict):
+        return None
+    value = item.get(hash_key)
+    if value is None or isinstance(value, (str, int, float, bool)):
+        return value
+    return json.dumps(value, sort_keys=True, default=str)
+
+
+def raw_item_key(item: Any, key_names: List[str]) -> Optional[tuple]:
+    """Chave primária completa de um item ainda não convertido (None se falta algum atributo)"""
+    key = tuple(raw_partition_value(item, name) for name in key_names)
+    return None if None in key else key
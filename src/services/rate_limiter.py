@@ -0,0 +1,60 @@
+"""Token bucket rate limiter shared by bulk write operations"""
+
+import threading
+import time
+
+
+class RateLimiter:
+    """Limitador de taxa (token bucket) seguro para várias threads
+
+    ``rate`` unidades por segundo são liberadas continuamente, com rajadas de
+    até ``burst`` unidades. Com ``rate`` <= 0 o limitador não bloqueia.
+    """
+
+    def __init__(self, rate: float, burst: float = None):
+        """
+        Args:
+            rate: Unidades liberadas por segundo (<= 0 desativa o limite)
+            burst: Capacidade máxima do balde (padrão: 1 segundo de taxa)
+        """
+        self.rate = float(rate or 0)
+        self.burst = float(burst) if burst else max(self.rate, 1.0)
+        self._tokens = self.burst
+        self._last = time.monotonic()
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        return self.rate > 0
+
+    def acquire(self, amount: float = 1) -> float:
+        """
+        Bloqueia até que ``amount`` unidades estejam disponíveis.
+
+        Pedidos maiores que o balde são liberados quando ele está cheio e
+        deixam o saldo negativo, então a taxa média continua respeitada.
+
+        Args:
+            amount: Unidades a consumir
+
+        Returns:
+            Tempo total de espera em segundos
+        """
+        if not self.enabled:
+            return 0.0
+
+        waited = 0.0
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.burst, self._tokens + (now - self._last) * self.rate)
+                self._last = now
+
+                needed = min(amount, self.burst)
+                if self._tokens >= needed:
+                    self._tokens -= amount
+                    return waited
+                wait = (needed - self._tokens) / self.rate
+
+            time.sleep(wait)
+            waited += wait
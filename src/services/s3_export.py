@@ -0,0 +1,145 @@
+"""
+Leitura de exports "Export to S3" do DynamoDB baixados para o disco local.
+
+Estrutura esperada (formato DYNAMODB_JSON):
+
+    AWSDynamoDB/<export-id>/manifest-summary.json
+    AWSDynamoDB/<export-id>/manifest-files.json   (JSON Lines, um arquivo de dados por linha)
+    AWSDynamoDB/<export-id>/data/<arquivo>.json.gz
+
+Cada linha de um arquivo de dados é {"Item": {...}} com o item em DynamoDB JSON.
+"""
+
+import base64
+import json
+import os
+from typing import Any, Dict, Iterator, List, Optional
+
+from src.services.compressed_input import open_input
+
+
+MANIFEST_FILES = 'manifest-files.json'
+MANIFEST_SUMMARY = 'manifest-summary.json'
+
+
+class S3ExportError(Exception):
+    """Export inválido, incompleto ou em formato não suportado"""
+
+
+def find_manifest(export_dir: str) -> str:
+    """
+    Localiza o manifest-files.json dentro do diretório do export.
+
+    Aceita o próprio diretório do export ou qualquer pasta acima dele
+    (ex: a pasta com AWSDynamoDB/). Com vários exports, usa o mais recente.
+    """
+    candidates = []
+    for root, _dirs, files in os.walk(export_dir):
+        if MANIFEST_FILES in files:
+            candidates.append(os.path.join(root, MANIFEST_FILES))
+
+    if not candidates:
+        raise S3ExportError(f"{MANIFEST_FILES} não encontrado em {export_dir}")
+    return max(candidates, key=os.path.getmtime)
+
+
+def read_summary(manifest_path: str) -> Dict[str, Any]:
+    """Lê o manifest-summary.json ao lado do manifest (ou {} se não existir)."""
+    summary_path = os.path.join(os.path.dirname(manifest_path), MANIFEST_SUMMARY)
+    if not os.path.exists(summary_path):
+        return {}
+    with open(summary_path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def table_name_from_summary(summary: Dict[str, Any]) -> Optional[str]:
+    """Extrai o nome da tabela do tableArn do export."""
+    table_arn = summary.get('tableArn') or ''
+    if '/' not in table_arn:
+        return None
+    return table_arn.split('/', 1)[1].split('/')[0]
+
+
+def list_data_files(manifest_path: str) -> List[Dict[str, Any]]:
+    """
+    Lista os arquivos de dados do export seguindo o manifest.
+
+    Returns:
+        Lista de {'path', 'item_count'}, maiores primeiro
+
+    Raises:
+        S3ExportError: formato não suportado ou arquivos de dados ausentes
+    """
+    summary = read_summary(manifest_path)
+    output_format = summary.get('outputFormat', 'DYNAMODB_JSON')
+    if output_format != 'DYNAMODB_JSON':
+        raise S3ExportError(f"Formato de export não suportado: {output_format} (use DYNAMODB_JSON)")
+
+    export_dir = os.path.dirname(manifest_path)
+    data_files = []
+    missing = []
+
+    with open(manifest_path, 'r', encoding='utf-8') as f:
+        for line in f:
+            if not line.strip():
+                continue
+            entry = json.loads(line)
+            s3_key = entry['dataFileS3Key']
+            file_name = s3_key.rsplit('/', 1)[-1]
+
+            path = None
+            for candidate in (os.path.join(export_dir, 'data', file_name),
+                              os.path.join(export_dir, file_name)):
+                if os.path.exists(candidate):
+                    path = candidate
+                    break
+
+            if path is None:
+                missing.append(s3_key)
+                continue
+            data_files.append({'path': path, 'item_count': entry.get('itemCount', 0)})
+
+    if missing:
+        raise S3ExportError(
+            f"{len(missing)} arquivo(s) de dados do manifest não encontrado(s), ex: {missing[0]}"
+        )
+
+    data_files.sort(key=lambda entry: entry['item_count'], reverse=True)
+    return data_files
+
+
+def iter_export_items(data_file: str) -> Iterator[Dict[str, Any]]:
+    """
+    Faz streaming dos itens (DynamoDB JSON) de um arquivo de dados .json.gz
+    (descompactado numa thread de leitura adiantada).
+
+    Valores binários (B/BS), que vêm em base64 no export, são decodificados
+    para bytes, como o cliente boto3 espera.
+    """
+    with open_input(data_file) as f:
+        for line in f:
+            if not line.strip():
+                continue
+            item = json.loads(line)['Item']
+            yield decode_binary_values(item)
+
+
+def decode_binary_values(item: Dict[str, Any]) -> Dict[str, Any]:
+    """Decodifica B/BS em base64 (recursivamente em M/L), alterando o item."""
+    for value in item.values():
+        _decode_attribute_value(value)
+    return item
+
+
+def _decode_attribute_value(av: Dict[str, Any]):
+    if 'B' in av:
+        if isinstance(av['B'], str):
+            av['B'] = base64.b64decode(av['B'])
+    elif 'BS' in av:
+        av['BS'] = [base64.b64decode(v) if isinstance(v, str) else v for v in av['BS']]
+    elif 'M' in av:
+        for nested in av['M'].values():
+            _decode_attribute_value(nested)
+    elif 'L' in av:
+        for nested in av['L']:
+            _decode_attribute_value(nested)
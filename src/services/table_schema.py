@@ -0,0 +1,203 @@
+"""
+Schema de tabela para criação automática no DynamoDB Local.
+
+O schema vem de um arquivo "sidecar" ao lado do dump (saída de
+``aws dynamodb describe-table`` ou só o objeto Table) ou é inferido de uma
+amostra dos itens. As tabelas são criadas em PAY_PER_REQUEST e sem GSIs;
+os GSIs do sidecar são criados depois da carga (create_index_requests).
+"""
+
+import json
+import math
+import os
+from collections import Counter
+from typing import Any, Dict, List, Optional
+
+from src.services.compressed_input import strip_compression_suffix
+from src.services.item_converter import ItemConverter
+
+
+SCHEMA_SUFFIX = '.schema.json'
+
+# Nomes preferidos para a chave de partição/ordenação inferida, em ordem
+PREFERRED_HASH_KEYS = ('id', 'Id', 'ID', 'pk', 'PK', 'partitionKey', 'key', 'Key')
+PREFERRED_RANGE_KEYS = ('sk', 'SK', 'sortKey', 'timestamp', 'createdAt', 'created_at')
+
+_SCALAR_TYPES = ('S', 'N', 'B')
+MIN_KEY_PRESENCE = 0.99  # Fração mínima dos itens da amostra com o atributo de chave
+
+
+class TableSchemaError(Exception):
+    """Schema ausente, inválido ou impossível de inferir"""
+
+
+def find_schema_sidecar(file_path: str, table_name: str = None) -> Optional[str]:
+    """
+    Procura o schema ao lado do dump.
+
+    Para ``messages-dump.json.gz`` tenta ``messages-dump.json.gz.schema.json``,
+    ``messages-dump.schema.json`` e ``messages.schema.json`` (ou
+    ``<tabela>.schema.json``).
+    """
+    directory = os.path.dirname(os.path.abspath(file_path))
+    file_name = os.path.basename(file_path)
+    stem = strip_compression_suffix(file_name)
+    for extension in ('.jsonl', '.ndjson', '.json'):
+        if stem.endswith(extension):
+            stem = stem[:-len(extension)]
+            break
+
+    candidates = [file_name + SCHEMA_SUFFIX, stem + SCHEMA_SUFFIX, stem.replace('-dump', '') + SCHEMA_SUFFIX]
+    if table_name:
+        candidates.append(table_name + SCHEMA_SUFFIX)
+
+    for candidate in candidates:
+        path = os.path.join(directory, candidate)
+        if os.path.exists(path):
+            return path
+    return None
+
+
+def load_schema(path: str) -> Dict[str, Any]:
+    """
+    Lê um schema (saída de describe-table, com ou sem o objeto "Table").
+
+    Returns:
+        {'KeySchema', 'AttributeDefinitions', 'GlobalSecondaryIndexes', 'LocalSecondaryIndexes'}
+
+    Raises:
+        TableSchemaError: arquivo sem KeySchema/AttributeDefinitions
+    """
+    with open(path, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    table = data.get('Table', data) if isinstance(data, dict) else None
+    if not isinstance(table, dict) or not table.get('KeySchema') or not table.get('AttributeDefinitions'):
+        raise TableSchemaError(f"{path}: schema sem KeySchema/AttributeDefinitions")
+
+    def index_definition(index: Dict[str, Any]) -> Dict[str, Any]:
+        # Só os campos aceitos por CreateTable/UpdateTable (describe traz status, tamanho...)
+        return {
+            'IndexName': index['IndexName'],
+            'KeySchema': index['KeySchema'],
+            'Projection': index.get('Projection') or {'ProjectionType': 'ALL'},
+        }
+
+    return {
+        'KeySchema': table['KeySchema'],
+        'AttributeDefinitions': table['AttributeDefinitions'],
+        'GlobalSecondaryIndexes': [index_definition(i) for i in table.get('GlobalSecondaryIndexes') or []],
+        'LocalSecondaryIndexes': [index_definition(i) for i in table.get('LocalSecondaryIndexes') or []],
+    }
+
+
+def infer_schema(items: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Infere a chave da tabela de uma amostra de itens (Python ou DynamoDB JSON).
+
+    A chave é um atributo escalar (S/N/B) presente em (quase) todos os itens
+    da amostra com valores únicos, ou um par (partição, ordenação) único.
+    Nomes como id/pk (sozinhos ou com sk/timestamp) vêm antes dos demais.
+
+    Raises:
+        TableSchemaError: nenhuma chave possível na amostra
+    """
+    converter = ItemConverter()
+    typed_items = [converter._encode_item(item) for item in items if isinstance(item, dict)]
+    typed_items = [item for item in typed_items if item]
+    if not typed_items:
+        raise TableSchemaError("amostra sem itens válidos para inferir a chave")
+
+    # Atributos escalares presentes (com o mesmo tipo) em quase todos os itens:
+    # alguns itens quebrados na amostra não impedem a inferência
+    counts = Counter((name, next(iter(av))) for item in typed_items for name, av in item.items())
+    minimum = math.ceil(len(typed_items) * MIN_KEY_PRESENCE)
+    candidates = {name: type_key for (name, type_key), count in counts.items()
+                  if type_key in _SCALAR_TYPES and count >= minimum}
+    if not candidates:
+        raise TableSchemaError("nenhum atributo S/N/B presente em (quase) todos os itens da amostra")
+
+    def ranked(names, preferred):
+        return sorted(names, key=lambda name: preferred.index(name) if name in preferred else len(preferred))
+
+    def unique(names):
+        keyed = [item for item in typed_items if all(name in item for name in names)]
+        if len(keyed) < minimum:
+            return False
+        values = {tuple(json.dumps(item[name], sort_keys=True, default=str) for name in names)
+                  for item in keyed}
+        return len(values) == len(keyed)
+
+    preferred = ranked([name for name in candidates if name in PREFERRED_HASH_KEYS], PREFERRED_HASH_KEYS)
+    others = [name for name in candidates if name not in PREFERRED_HASH_KEYS]
+    range_keys = ranked(candidates, PREFERRED_RANGE_KEYS)
+
+    # Nomes conhecidos (sozinhos ou com uma chave de ordenação) antes de atributos quaisquer
+    for hash_keys in (preferred, others):
+        for hash_key in hash_keys:
+            if unique([hash_key]):
+                return _key_schema(hash_key, candidates[hash_key])
+        for hash_key in hash_keys:
+            for range_key in range_keys:
+                if range_key != hash_key and unique([hash_key, range_key]):
+                    return _key_schema(hash_key, candidates[hash_key], range_key, candidates[range_key])
+
+    raise TableSchemaError("nenhum atributo (ou par de atributos) identifica os itens da amostra")
+
+
+def _key_schema(hash_key: str, hash_type: str,
+                range_key: str = None, range_type: str = None) -> Dict[str, Any]:
+    key_schema = [{'AttributeName': hash_key, 'KeyType': 'HASH'}]
+    attributes = [{'AttributeName': hash_key, 'AttributeType': hash_type}]
+    if range_key:
+        key_schema.append({'AttributeName': range_key, 'KeyType': 'RANGE'})
+        attributes.append({'AttributeName': range_key, 'AttributeType': range_type})
+    return {
+        'KeySchema': key_schema,
+        'AttributeDefinitions': attributes,
+        'GlobalSecondaryIndexes': [],
+        'LocalSecondaryIndexes': [],
+    }
+
+
+def key_attributes(schema: Dict[str, Any]) -> Dict[str, str]:
+    """{nome: 'HASH'|'RANGE'} da chave da tabela"""
+    return {key['AttributeName']: key['KeyType'] for key in schema['KeySchema']}
+
+
+def create_table_request(table_name: str, schema: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Parâmetros de CreateTable: PAY_PER_REQUEST, chave e LSIs (que só podem
+    ser criados com a tabela), sem GSIs.
+    """
+    used = {key['AttributeName'] for key in schema['KeySchema']}
+    for index in schema.get('LocalSecondaryIndexes') or []:
+        used.update(key['AttributeName'] for key in index['KeySchema'])
+
+    request = {
+        'TableName': table_name,
+        'KeySchema': schema['KeySchema'],
+        'AttributeDefinitions': [a for a in schema['AttributeDefinitions'] if a['AttributeName'] in used],
+        'BillingMode': 'PAY_PER_REQUEST',
+    }
+    if schema.get('LocalSecondaryIndexes'):
+        request['LocalSecondaryIndexes'] = schema['LocalSecondaryIndexes']
+    return request
+
+
+def create_index_requests(table_name: str, schema: Dict[str, Any],
+                          existing: List[str] = ()) -> List[Dict[str, Any]]:
+    """
+    Parâmetros de UpdateTable para criar cada GSI do schema que ainda não existe
+    (um por chamada, como o DynamoDB exige).
+    """
+    definitions = {a['AttributeName']: a for a in schema['AttributeDefinitions']}
+    requests = []
+    for index in schema.get('GlobalSecondaryIndexes') or []:
+        if index['IndexName'] in existing:
+            continue
+        requests.append({
+            'TableName': table_name,
+            'AttributeDefinitions': [definitions[key['AttributeName']] for key in index['KeySchema']],
+            'GlobalSecondaryIndexUpdates': [{'Create': index}],
+        })
+    return requests
@@ -5,5 +5,6 @@ from .connection_dialog import ConnectionDialog
 from .environment_dialog import EnvironmentDialog
 from .environment_selector import EnvironmentSelector
 from .import_dialog import ImportDialog
+from .json_tree_viewer import JsonTreeViewer
 
-__all__ = ["LoadingIndicator", "ConnectionDialog", "EnvironmentDialog", "EnvironmentSelector", "ImportDialog"]
+__all__ = ["LoadingIndicator", "ConnectionDialog", "EnvironmentDialog", "EnvironmentSelector", "ImportDialog", "JsonTreeViewer"]
@@ -5,6 +5,9 @@ from tkinter import filedialog, messagebox
 import os
 import threading
 from src.config import config
+from src.services.batch_importer import DynamoDBBatchImporter
+from src.services.import_progress import ProgressEstimate, format_eta
+from src.services.import_telemetry import ImportTelemetry
 
 
 class ImportDialog:
@@ -47,17 +50,21 @@ class ImportDialog:
 
         # Center window
         self.dialog.update_idletasks()
-        x = (self.dialog.winfo_screenwidth() // 2) - (350)
-        y = (self.dialog.winfo_screenheight() // 2) - (375)
+        x = max(0, (self.dialog.winfo_screenwidth() // 2) - (350))
+        y = max(0, (self.dialog.winfo_screenheight() // 2) - (375))
         self.dialog.geometry(f"+{x}+{y}")
 
         self.setup_ui()
 
     def setup_ui(self):
         """Setup UI components"""
+        # Buttons frame, packed first at the bottom so it stays visible below the container
+        btn_frame = ctk.CTkFrame(self.dialog, fg_color="transparent")
+        btn_frame.pack(side="bottom", fill="x", padx=15, pady=(5, 15))
+
         # Main scrollable container
-        main_container = ctk.CTkFrame(self.dialog, fg_color="transparent")
-        main_container.pack(fill="both", expand=True, padx=15, pady=15)
+        main_container = ctk.CTkScrollableFrame(self.dialog, fg_color="transparent")
+        main_container.pack(fill="both", expand=True, padx=15, pady=(15, 5))
 
         # Header
         ctk.CTkLabel(
@@ -173,6 +180,104 @@ class ImportDialog:
             text_color="gray"
         ).pack(anchor="w", padx=15, pady=(5, 10))
 
+        # Options frame
+        options_frame = ctk.CTkFrame(main_container)
+        options_frame.pack(fill="x", pady=5)
+
+        ctk.CTkLabel(
+            options_frame,
+            text="Opções",
+            font=ctk.CTkFont(size=12, weight="bold")
+        ).pack(anchor="w", padx=15, pady=(10, 5))
+
+        options_row = ctk.CTkFrame(options_frame, fg_color="transparent")
+        options_row.pack(fill="x", padx=15, pady=(0, 10))
+
+        ctk.CTkLabel(options_row, text="Workers:").pack(side="left", padx=(0, 5))
+
+        self.workers_var = ctk.StringVar(value=str(DynamoDBBatchImporter.DEFAULT_WORKERS))
+        ctk.CTkOptionMenu(
+            options_row,
+            variable=self.workers_var,
+            values=["1", "2", "4", "8", "16"],
+            width=70,
+            height=28
+        ).pack(side="left")
+
+        ctk.CTkLabel(
+            options_row,
+            text="(threads escritoras em paralelo)",
+            font=ctk.CTkFont(size=10),
+            text_color="gray"
+        ).pack(side="left", padx=10)
+
+        ctk.CTkLabel(options_row, text="Processos:").pack(side="left", padx=(10, 5))
+
+        self.processes_var = ctk.StringVar(value="0")
+        ctk.CTkOptionMenu(
+            options_row,
+            variable=self.processes_var,
+            values=["0", "1", "2", "4", "8"],
+            width=70,
+            height=28
+        ).pack(side="left")
+
+        ctk.CTkLabel(
+            options_row,
+            text="(conversão em paralelo)",
+            font=ctk.CTkFont(size=10),
+            text_color="gray"
+        ).pack(side="left", padx=10)
+
+        limit_row = ctk.CTkFrame(options_frame, fg_color="transparent")
+        limit_row.pack(fill="x", padx=15, pady=(0, 10))
+
+        ctk.CTkLabel(limit_row, text="Limite de escrita:").pack(side="left", padx=(0, 5))
+
+        self.write_limit_var = ctk.StringVar(value="0")
+        ctk.CTkEntry(
+            limit_row,
+            textvariable=self.write_limit_var,
+            width=80,
+            height=28
+        ).pack(side="left")
+
+        self.write_limit_unit_var = ctk.StringVar(value="WCU/s")
+        ctk.CTkOptionMenu(
+            limit_row,
+            variable=self.write_limit_unit_var,
+            values=["WCU/s", "itens/s"],
+            width=90,
+            height=28
+        ).pack(side="left", padx=(5, 0))
+
+        ctk.CTkLabel(
+            limit_row,
+            text="(0 = sem limite; 1 WCU por KB de item)",
+            font=ctk.CTkFont(size=10),
+            text_color="gray"
+        ).pack(side="left", padx=10)
+
+        resume_row = ctk.CTkFrame(options_frame, fg_color="transparent")
+        resume_row.pack(fill="x", padx=15, pady=(0, 10))
+
+        self.resume_var = ctk.BooleanVar(value=False)
+        ctk.CTkCheckBox(
+            resume_row,
+            text="Retomar importação interrompida (a partir do último checkpoint)",
+            variable=self.resume_var
+        ).pack(side="left")
+
+        create_table_row = ctk.CTkFrame(options_frame, fg_color="transparent")
+        create_table_row.pack(fill="x", padx=15, pady=(0, 10))
+
+        self.create_table_var = ctk.BooleanVar(value=False)
+        ctk.CTkCheckBox(
+            create_table_row,
+            text="Criar a tabela se não existir (schema do dump; índices após a carga)",
+            variable=self.create_table_var
+        ).pack(side="left")
+
         # Progress frame
         progress_frame = ctk.CTkFrame(main_container)
         progress_frame.pack(fill="x", pady=5)
@@ -191,9 +296,21 @@ class ImportDialog:
         ).pack(anchor="w", padx=15, pady=2)
 
         self.progress_bar = ctk.CTkProgressBar(progress_frame, width=600)
-        self.progress_bar.pack(fill="x", padx=15, pady=(5, 10))
+        self.progress_bar.pack(fill="x", padx=15, pady=(5, 5))
         self.progress_bar.set(0)
 
+        # Live telemetry: latency percentiles and items/s over the last 2 minutes
+        self.telemetry_var = ctk.StringVar(value="")
+        ctk.CTkLabel(
+            progress_frame,
+            textvariable=self.telemetry_var,
+            font=ctk.CTkFont(size=10),
+            text_color="gray"
+        ).pack(anchor="w", padx=15)
+
+        self.throughput_canvas = ctk.CTkCanvas(progress_frame, height=60, bg="#1d1e1e", highlightthickness=0)
+        self.throughput_canvas.pack(fill="x", padx=15, pady=(2, 10))
+
         # Log frame
         log_frame = ctk.CTkFrame(main_container)
         log_frame.pack(fill="both", expand=True, pady=5)
@@ -213,10 +330,7 @@ class ImportDialog:
         self.log_text.insert("0.0", "📋 Pronto para importar. Selecione o arquivo e clique em 'Importar'.\n")
         self.log_text.configure(state="disabled")
 
-        # Buttons frame
-        btn_frame = ctk.CTkFrame(main_container, fg_color="transparent")
-        btn_frame.pack(fill="x", pady=(10, 0))
-
+        # Buttons
         self.import_btn = ctk.CTkButton(
             btn_frame,
             text="▶ Importar",
@@ -265,6 +379,7 @@ class ImportDialog:
             title="Selecionar arquivo JSON",
             filetypes=[
                 ("JSON files", "*.json"),
+                ("JSON Lines", "*.jsonl *.ndjson"),
                 ("Todos os arquivos", "*.*"),
             ],
             initialdir=default_dir,
@@ -325,6 +440,33 @@ class ImportDialog:
                 btn.configure(fg_color="transparent")
         self.log(f"Tabela selecionada: {table_name}")
 
+    def show_telemetry(self, snapshot):
+        """Update the latency line and the items/s chart (ImportTelemetry.snapshot())"""
+        latency = snapshot['call_latency_ms']
+        self.telemetry_var.set(
+            f"Latência p50 {latency['p50']:.0f} ms | p95 {latency['p95']:.0f} ms | "
+            f"p99 {latency['p99']:.0f} ms | Retries: {snapshot['retries']} | "
+            f"UnprocessedItems: {snapshot['unprocessed_rate']:.1%}"
+        )
+
+        canvas = self.throughput_canvas
+        canvas.delete("all")
+        series = snapshot['items_per_second']
+        if len(series) < 2:
+            return
+        width = canvas.winfo_width()
+        height = int(canvas.cget("height"))
+        peak = max(series) or 1
+        # Eixo fixo de LIVE_SECONDS: a linha avança da esquerda até encher o gráfico
+        step = width / (ImportTelemetry.LIVE_SECONDS - 1)
+        offset = ImportTelemetry.LIVE_SECONDS - len(series)
+        points = []
+        for i, value in enumerate(series):
+            points.extend(((offset + i) * step, height - 2 - (height - 16) * value / peak))
+        canvas.create_line(*points, fill="#3d7a37", width=2)
+        canvas.create_text(4, 2, anchor="nw", fill="gray", font=("Courier", 9),
+                           text=f"pico {peak:,.0f} itens/s (últimos {ImportTelemetry.LIVE_SECONDS}s)")
+
     def log(self, message):
         """Add message to log"""
         self.log_text.configure(state="normal")
@@ -354,10 +496,10 @@ class ImportDialog:
             messagebox.showerror("Erro", f"O caminho especificado não é um arquivo: {file_path}")
             return
 
-        if not file_path.lower().endswith('.json'):
+        if not file_path.lower().endswith(('.json', '.jsonl', '.ndjson')):
             response = messagebox.askyesno(
                 "Aviso",
-                f"O arquivo não tem extensão .json:\n{file_path}\n\n"
+                f"O arquivo não tem extensão .json/.jsonl:\n{file_path}\n\n"
                 "Deseja continuar mesmo assim?"
             )
             if not response:
@@ -375,26 +517,51 @@ class ImportDialog:
             )
             return
 
+        try:
+            write_limit = float(self.write_limit_var.get().strip() or 0)
+            if write_limit < 0:
+                raise ValueError
+        except ValueError:
+            messagebox.showerror("Erro", "Limite de escrita deve ser um número maior ou igual a 0")
+            return
+
         # Clear log and reset progress
         self.log_text.configure(state="normal")
         self.log_text.delete("0.0", "end")
         self.log_text.insert("0.0", "🚀 Preparando importação...\n")
         self.log_text.configure(state="disabled")
 
-        # Start progress animation
-        self.progress_bar.configure(mode="indeterminate")
-        self.progress_bar.start()
+        # Progress bar follows the bytes read from the file (estimated item total)
+        self.progress_bar.configure(mode="determinate")
+        self.progress_bar.set(0)
         self.progress_var.set("Importando... (processando itens)")
+        self.telemetry_var.set("")
+        self.throughput_canvas.delete("all")
 
         # Disable import button
         self.import_btn.configure(state="disabled")
 
+        num_workers = int(self.workers_var.get())
+        num_processes = int(self.processes_var.get())
+        resume = self.resume_var.get()
+        create_table = self.create_table_var.get()
+        write_limits = {
+            'max_wcu_per_second': write_limit if self.write_limit_unit_var.get() == "WCU/s" else 0,
+            'max_items_per_second': write_limit if self.write_limit_unit_var.get() == "itens/s" else 0,
+        }
+
         # Start import in thread
-        thread = threading.Thread(target=self._do_import, args=(file_path, table_name), daemon=True)
+        thread = threading.Thread(
+            target=self._do_import,
+            args=(file_path, table_name, num_workers, num_processes, resume, write_limits, create_table),
+            daemon=True
+        )
         thread.start()
 
-    def _do_import(self, file_path, table_name):
+    def _do_import(self, file_path, table_name, num_workers=DynamoDBBatchImporter.DEFAULT_WORKERS,
+                   num_processes=0, resume=False, write_limits=None, create_table=False):
         """Execute import in separate thread"""
+        write_limits = write_limits or {}
         try:
             if not os.path.exists(file_path):
                 error_msg = f"Arquivo não encontrado: {file_path}"
@@ -407,6 +574,17 @@ class ImportDialog:
             self.dialog.after(0, lambda: self.log("🚀 Iniciando importação..."))
             self.dialog.after(0, lambda: self.log(f"📁 Arquivo: {os.path.basename(file_path)}"))
             self.dialog.after(0, lambda: self.log(f"📊 Tabela: {table_name}"))
+            self.dialog.after(0, lambda: self.log(f"⚙️ Workers: {num_workers} | Processos: {num_processes}"))
+            if resume:
+                self.dialog.after(0, lambda: self.log("⏩ Retomando do último checkpoint"))
+            if create_table:
+                self.dialog.after(0, lambda: self.log("🆕 Tabela será criada se não existir"))
+            if write_limits.get('max_wcu_per_second'):
+                self.dialog.after(0, lambda: self.log(
+                    f"🚦 Limite de escrita: {write_limits['max_wcu_per_second']:g} WCU/s"))
+            if write_limits.get('max_items_per_second'):
+                self.dialog.after(0, lambda: self.log(
+                    f"🚦 Limite de escrita: {write_limits['max_items_per_second']:g} itens/s"))
             self.dialog.after(0, lambda: self.log("⏳ Processando..."))
             self.dialog.after(0, lambda: self.log(""))
 
@@ -414,6 +592,8 @@ class ImportDialog:
             start_time = time.time()
             last_update_time = start_time
             last_imported_count = 0
+            # Velocidade e ETA pela média móvel (acompanha throttling e limites)
+            progress = ProgressEstimate()
 
             def progress_callback(imported, total, error):
                 nonlocal last_update_time, last_imported_count
@@ -421,11 +601,17 @@ class ImportDialog:
                 if error:
                     self.dialog.after(0, lambda msg=error: self.log(f"⚠️ {msg}"))
 
+                progress.update(imported, total or None)
                 current_time = time.time()
                 elapsed = current_time - start_time
 
                 if current_time - last_update_time >= 1.0 or imported > last_imported_count + 100:
-                    if elapsed > 0:
+                    if total:
+                        status_text = (f"Importados: {imported:,} de ~{total:,} itens | "
+                                       f"Velocidade: {progress.rate:.0f} itens/s | "
+                                       f"ETA: {format_eta(progress.eta_seconds)}")
+                        self.dialog.after(0, lambda f=progress.fraction: self.progress_bar.set(f))
+                    elif elapsed > 0:
                         velocity = imported / elapsed
                         status_text = f"Importados: {imported:,} itens | Velocidade: {velocity:.0f} itens/s"
                     else:
@@ -438,7 +624,13 @@ class ImportDialog:
             success, imported_count, error_msg = self.db_service.import_data_from_file(
                 file_path,
                 table_name=table_name,
-                progress_callback=progress_callback
+                progress_callback=progress_callback,
+                num_workers=num_workers,
+                num_processes=num_processes,
+                resume=resume,
+                create_table=create_table,
+                telemetry_callback=lambda snapshot: self.dialog.after(0, lambda: self.show_telemetry(snapshot)),
+                **write_limits
             )
 
             # Stop progress animation
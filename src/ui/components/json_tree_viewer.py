@@ -0,0 +1,199 @@
+"""Lazy JSON Tree Viewer Component"""
+
+import base64
+import json
+from decimal import Decimal
+from itertools import islice
+
+import customtkinter as ctk
+import tkinter as tk
+from tkinter import ttk
+from boto3.dynamodb.types import Binary
+
+def _sorted_set(value):
+    """Return the members of a set (SS/NS/BS) in a stable order"""
+    try:
+        return sorted(value)
+    except TypeError:
+        return sorted(value, key=repr)
+
+
+def _json_default(obj):
+    """Serialize the DynamoDB types that json.dumps does not know"""
+    if isinstance(obj, Decimal):
+        return float(obj)
+    if isinstance(obj, (set, frozenset)):
+        return _sorted_set(obj)
+    if isinstance(obj, Binary):
+        obj = obj.value
+    if isinstance(obj, (bytes, bytearray)):
+        return base64.b64encode(obj).decode("ascii")
+    return str(obj)
+
+
+class JsonTreeViewer:
+    """Visualizador de JSON em árvore que expande mapas e listas sob demanda
+
+    Só os nós visíveis são criados: filhos de um mapa/lista são inseridos
+    quando o nó é aberto, em páginas de PAGE_SIZE. Strings longas aparecem
+    truncadas e abrem por completo com duplo clique. Sets (SS/NS/BS) são
+    paginados como listas, em ordem, e binários aparecem em base64.
+    """
+
+    MAX_STRING_PREVIEW = 200
+    PAGE_SIZE = 200
+
+    def __init__(self, parent, data):
+        """Initialize JsonTreeViewer
+
+        Args:
+            parent: Parent widget
+            data: Item (dict/list/scalar) to display
+        """
+        self.parent = parent
+        self.frame = tk.Frame(parent, bg="#2b2b2b")
+
+        vsb = ttk.Scrollbar(self.frame, orient="vertical", style="Dark.Vertical.TScrollbar")
+        hsb = ttk.Scrollbar(self.frame, orient="horizontal", style="Dark.Horizontal.TScrollbar")
+
+        self.tree = ttk.Treeview(
+            self.frame,
+            columns=("value", "type"),
+            yscrollcommand=vsb.set,
+            xscrollcommand=hsb.set,
+            style="Dark.Treeview"
+        )
+        vsb.config(command=self.tree.yview)
+        hsb.config(command=self.tree.xview)
+
+        self.tree.heading("#0", text="Chave")
+        self.tree.heading("value", text="Valor")
+        self.tree.heading("type", text="Tipo")
+        self.tree.column("#0", width=220, minwidth=80)
+        self.tree.column("value", width=420, minwidth=100)
+        self.tree.column("type", width=70, minwidth=50, stretch=False)
+
+        vsb.pack(side="right", fill="y")
+        hsb.pack(side="bottom", fill="x")
+        self.tree.pack(fill="both", expand=True)
+
+        # iid -> container not yet expanded / long string / (parent, container, next index)
+        self._unloaded = {}
+        self._long_strings = {}
+        self._more_nodes = {}
+
+        self.tree.bind("<<TreeviewOpen>>", self._on_open)
+        self.tree.bind("<Double-1>", self._on_double_click)
+
+        if isinstance(data, (set, frozenset)):
+            data = _sorted_set(data)
+        if isinstance(data, (dict, list)):
+            self._load_page("", data, 0)
+        else:
+            self._insert_node("", "valor", data)
+
+    def pack(self, **kwargs):
+        """Pack the viewer frame"""
+        self.frame.pack(**kwargs)
+
+    def _insert_node(self, parent, key, value):
+        """Insert a single node; containers get a placeholder child"""
+        if isinstance(value, dict):
+            iid = self.tree.insert(
+                parent, "end", text=str(key),
+                values=(f"{{…}} {len(value)} chave(s)", "Map")
+            )
+            if value:
+                self._unloaded[iid] = value
+                self.tree.insert(iid, "end", text="…")
+        elif isinstance(value, (list, set, frozenset)):
+            is_set = not isinstance(value, list)
+            iid = self.tree.insert(
+                parent, "end", text=str(key),
+                values=(f"[…] {len(value)} item(s)", "Set" if is_set else "List")
+            )
+            if value:
+                # Ordenado na hora de abrir, para paginar por índice como lista
+                self._unloaded[iid] = value
+                self.tree.insert(iid, "end", text="…")
+        elif isinstance(value, str):
+            preview = value[:self.MAX_STRING_PREVIEW].replace("\n", "⏎")
+            if len(value) > self.MAX_STRING_PREVIEW:
+                hidden = len(value) - self.MAX_STRING_PREVIEW
+                preview += f"… (+{hidden:,} caracteres, duplo clique para ver)"
+            iid = self.tree.insert(parent, "end", text=str(key), values=(preview, "String"))
+            if len(value) > self.MAX_STRING_PREVIEW:
+                self._long_strings[iid] = value
+        else:
+            iid = self.tree.insert(
+                parent, "end", text=str(key),
+                values=self._leaf_values(value)
+            )
+        return iid
+
+    @staticmethod
+    def _leaf_values(value):
+        """Return the (preview, type) columns of a scalar value"""
+        if isinstance(value, bool):
+            value_type = "Boolean"
+        elif value is None:
+            value_type = "Null"
+        elif isinstance(value, (bytes, bytearray, Binary)):
+            value_type = "Binary"
+        elif isinstance(value, (int, float, Decimal)):
+            value_type = "Number"
+        else:
+            value_type = type(value).__name__
+        return json.dumps(value, default=_json_default), value_type
+
+    def _load_page(self, parent, container, start):
+        """Insert up to PAGE_SIZE children of container starting at start"""
+        if isinstance(container, dict):
+            entries = islice(container.items(), start, start + self.PAGE_SIZE)
+        else:
+            entries = ((f"[{i}]", v) for i, v in enumerate(
+                islice(container, start, start + self.PAGE_SIZE), start))
+
+        for key, value in entries:
+            self._insert_node(parent, key, value)
+
+        next_start = start + self.PAGE_SIZE
+        remaining = len(container) - next_start
+        if remaining > 0:
+            more_iid = self.tree.insert(
+                parent, "end", text=f"… mais {remaining:,}",
+                values=("(duplo clique para carregar)", "")
+            )
+            self._more_nodes[more_iid] = (parent, container, next_start)
+
+    def _on_open(self, event=None):
+        """Populate a container node the first time it is opened"""
+        iid = self.tree.focus()
+        container = self._unloaded.pop(iid, None)
+        if container is None:
+            return
+        if isinstance(container, (set, frozenset)):
+            container = _sorted_set(container)
+        self.tree.delete(*self.tree.get_children(iid))
+        self._load_page(iid, container, 0)
+
+    def _on_double_click(self, event):
+        """Load the next page or show a full string"""
+        iid = self.tree.identify_row(event.y)
+        if iid in self._more_nodes:
+            parent, container, start = self._more_nodes.pop(iid)
+            self.tree.delete(iid)
+            self._load_page(parent, container, start)
+        elif iid in self._long_strings:
+            self._show_full_string(self.tree.item(iid, "text"), self._long_strings[iid])
+
+    def _show_full_string(self, key, value):
+        """Open a popup with the complete string value"""
+        popup = ctk.CTkToplevel(self.parent)
+        popup.title(f"Valor completo: {key}")
+        popup.geometry("600x400")
+
+        text = ctk.CTkTextbox(popup, font=ctk.CTkFont(family="Courier", size=12), wrap="word")
+        text.pack(fill="both", expand=True, padx=10, pady=10)
+        text.insert("0.0", value)
+        text.configure(state="disabled")
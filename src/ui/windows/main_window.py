@@ -7,8 +7,8 @@ import threading
 import json
 from decimal import Decimal
 
-from src.models import FilterRow
-from src.ui.components import LoadingIndicator, ImportDialog
+from src.models import FilterRow, ResultStore, SearchIndex
+from src.ui.components import LoadingIndicator, ImportDialog, JsonTreeViewer
 from src.services import DynamoDBService
 from src.utils.encoders import DecimalEncoder
 from src.utils.resource_paths import load_icon_for_ctk
@@ -33,11 +33,19 @@ class MainWindow:
 
         # Services and state
         self.db_service = DynamoDBService()
-        self.current_items = []
+        self.current_items = ResultStore()
         self.filter_rows = []
         self.all_attributes = []
         self.selected_index = None
 
+        # Quick search state (indexed by ResultStore row id)
+        self.search_index = SearchIndex(self.current_items)
+        self._quick_search_job = None
+        self._delete_job = None
+        # Incremented whenever the grid is reloaded (row ids start again at 0)
+        self._result_generation = 0
+        self._multi_delete_running = False
+
         # Configure dark theme for ttk widgets (Treeview)
         self._configure_treeview_style()
 
@@ -269,7 +277,7 @@ class MainWindow:
             height=26
         ).pack(side="left", padx=4)
 
-        ctk.CTkButton(
+        self.execute_btn = ctk.CTkButton(
             filter_actions,
             text="▶ Executar",
             command=self.execute_filters,
@@ -277,7 +285,8 @@ class MainWindow:
             height=26,
             fg_color="#2d5a27",
             hover_color="#3d7a37"
-        ).pack(side="left", padx=4)
+        )
+        self.execute_btn.pack(side="left", padx=4)
 
         ctk.CTkButton(
             filter_actions,
@@ -301,13 +310,14 @@ class MainWindow:
         toolbar = ctk.CTkFrame(parent, fg_color="transparent")
         toolbar.pack(fill="x", padx=10, pady=5)
 
-        ctk.CTkButton(
+        self.load_all_btn = ctk.CTkButton(
             toolbar,
             text="📥 Carregar Tudo",
             command=self.load_all_data,
             width=120,
             height=30
-        ).pack(side="left", padx=2)
+        )
+        self.load_all_btn.pack(side="left", padx=2)
 
         ctk.CTkLabel(toolbar, text="Limite:").pack(side="left", padx=(15, 5))
 
@@ -338,7 +348,7 @@ class MainWindow:
         actions_frame = ctk.CTkFrame(parent, fg_color="transparent")
         actions_frame.pack(fill="x", padx=10, pady=5)
 
-        ctk.CTkButton(
+        self.delete_selected_btn = ctk.CTkButton(
             actions_frame,
             text="🗑️ Deletar Selecionado",
             command=self.delete_selected_item,
@@ -346,9 +356,10 @@ class MainWindow:
             height=30,
             fg_color="#8b0000",
             hover_color="#a52a2a"
-        ).pack(side="left", padx=2)
+        )
+        self.delete_selected_btn.pack(side="left", padx=2)
 
-        ctk.CTkButton(
+        self.delete_multiple_btn = ctk.CTkButton(
             actions_frame,
             text="🗑️ Deletar Vários",
             command=self.delete_multiple_items,
@@ -356,7 +367,21 @@ class MainWindow:
             height=30,
             fg_color="#8b0000",
             hover_color="#a52a2a"
-        ).pack(side="left", padx=2)
+        )
+        self.delete_multiple_btn.pack(side="left", padx=2)
+
+        # Delete-by-filter (only in local mode, like import)
+        if config.DYNAMODB_LOCAL:
+            self.delete_by_filter_btn = ctk.CTkButton(
+                actions_frame,
+                text="🧹 Deletar por Filtro",
+                command=self.delete_by_filter,
+                width=150,
+                height=30,
+                fg_color="#8b0000",
+                hover_color="#a52a2a"
+            )
+            self.delete_by_filter_btn.pack(side="left", padx=2)
 
         ctk.CTkLabel(
             actions_frame,
@@ -373,6 +398,30 @@ class MainWindow:
         )
         self.action_status_label.pack(side="left", padx=10)
 
+        # Quick search over loaded items (no network calls)
+        search_frame = ctk.CTkFrame(parent, fg_color="transparent")
+        search_frame.pack(fill="x", padx=10, pady=(5, 0))
+
+        ctk.CTkLabel(search_frame, text="🔎 Busca rápida:").pack(side="left", padx=(0, 5))
+
+        self.quick_search_var = ctk.StringVar(value="")
+        quick_search_entry = ctk.CTkEntry(
+            search_frame,
+            textvariable=self.quick_search_var,
+            placeholder_text="Filtrar itens carregados...",
+            width=300,
+            height=28
+        )
+        quick_search_entry.pack(side="left")
+        quick_search_entry.bind("<KeyRelease>", self.on_quick_search_changed)
+
+        ctk.CTkLabel(
+            search_frame,
+            text="Filtra apenas os itens já carregados, sem consultar o DynamoDB",
+            font=ctk.CTkFont(size=10, slant="italic"),
+            text_color="gray"
+        ).pack(side="left", padx=10)
+
         # Treeview frame (using ttk.Treeview as CustomTkinter doesn't have one)
         tree_frame = ctk.CTkFrame(parent)
         tree_frame.pack(fill="both", expand=True, padx=5, pady=5)
@@ -655,6 +704,10 @@ class MainWindow:
             messagebox.showwarning("Aviso", "Selecione uma tabela primeiro")
             return
 
+        if self._multi_delete_running:
+            messagebox.showwarning("Aviso", "Aguarde a deleção em andamento terminar")
+            return
+
         self.loading_indicator = LoadingIndicator(self.status_label)
 
         thread = threading.Thread(target=self._do_execute_filters, daemon=True)
@@ -681,10 +734,13 @@ class MainWindow:
                 known_attributes=self.all_attributes
             )
 
-            self.current_items = items
+            store = ResultStore()
+            search_index = SearchIndex(store)
+            search_index.add_many((store.append(item), item) for item in items)
+            del items
 
-            message = f"Items: {len(items)} | Verificados: {scanned_count} | Tempo: {elapsed:.2f}s"
-            self.root.after(0, lambda: self.display_items(items))
+            message = f"Items: {len(store)} | Verificados: {scanned_count} | Tempo: {elapsed:.2f}s"
+            self.root.after(0, lambda: self.display_items(store, search_index))
             self.root.after(0, lambda: self.loading_indicator.stop_success(message))
 
         except Exception as e:
@@ -703,20 +759,29 @@ class MainWindow:
         self.reset_filters()
         self.execute_filters()
 
-    def display_items(self, items):
-        """Display items in treeview"""
+    def display_items(self, store, search_index=None):
+        """Display items in treeview
+
+        Args:
+            store: ResultStore with the items to display
+            search_index: Optional SearchIndex already built for store
+        """
         for item in self.data_tree.get_children():
             self.data_tree.delete(item)
+        self._result_generation += 1
+
+        if search_index is None:
+            search_index = SearchIndex(store)
+            search_index.add_many(store.rows())
+        self.current_items = store
+        self.search_index = search_index
 
-        if not items:
+        if not store:
             self.data_tree["columns"] = []
+            self._update_count_label()
             return
 
-        all_keys = set()
-        for item in items:
-            all_keys.update(item.keys())
-
-        columns = sorted(list(all_keys))
+        columns = store.columns
 
         self.data_tree["columns"] = columns
         self.data_tree["show"] = "headings"
@@ -726,8 +791,7 @@ class MainWindow:
         for col in columns:
             max_width = len(str(col)) + 5
 
-            for item in items:
-                value = item.get(col, "")
+            for value in store.column_values(col):
                 if isinstance(value, Decimal):
                     value = float(value)
                 if isinstance(value, (dict, list)):
@@ -744,33 +808,96 @@ class MainWindow:
             self.data_tree.heading(col, text=col)
             self.data_tree.column(col, width=col_widths[col], minwidth=50)
 
-        # Insert data rows
-        for item in items:
+        # Insert data rows (iid = row id, stable while quick search hides rows)
+        for row_id in store.ids():
             values = []
-            for col in columns:
-                value = item.get(col, "")
+            for value in store.row_values(row_id, columns, ""):
                 if isinstance(value, Decimal):
                     value = float(value)
                 if isinstance(value, (dict, list)):
                     value = json.dumps(value, ensure_ascii=False)[:100] + "..."
                 values.append(str(value))
 
-            self.data_tree.insert("", "end", values=values)
+            self.data_tree.insert("", "end", iid=str(row_id), values=values)
+
+        if self.quick_search_var.get().strip():
+            self._apply_quick_search()
+        else:
+            self._update_count_label()
+
+    def on_quick_search_changed(self, event=None):
+        """Schedule quick search while the user types (debounced)"""
+        if self._quick_search_job is not None:
+            self.root.after_cancel(self._quick_search_job)
+        self._quick_search_job = self.root.after(80, self._apply_quick_search)
+
+    def _apply_quick_search(self):
+        """Show only the loaded rows matching the quick search text"""
+        self._quick_search_job = None
+        hits = self.search_index.search(self.quick_search_var.get())
+
+        if hits is None:
+            wanted = [str(row_id) for row_id in self.current_items.ids()]
+        else:
+            wanted = [str(row_id) for row_id in self.current_items.ids() if row_id in hits]
+
+        visible = self.data_tree.get_children()
+        visible_set = set(visible)
+
+        if visible_set.issuperset(wanted):
+            # Narrowing: only hide rows, the visible order is preserved
+            hidden = visible_set.difference(wanted)
+            if hidden:
+                self.data_tree.detach(*hidden)
+        else:
+            if visible:
+                self.data_tree.detach(*visible)
+            for iid in wanted:
+                self.data_tree.move(iid, "", "end")
+
+        self._update_count_label()
+
+    def _update_count_label(self):
+        """Update item counter, showing visible/total when quick search is active"""
+        total = len(self.current_items)
+        if self.quick_search_var.get().strip():
+            shown = len(self.data_tree.get_children())
+            self.count_label.configure(text=f"Items: {shown} de {total}")
+        else:
+            self.count_label.configure(text=f"Items: {total}")
+
+    def _remove_tree_row(self, iid):
+        """Remove a row from data_tree, current_items and the quick search index"""
+        row_id = int(iid)
+        self.data_tree.delete(iid)
+        self.search_index.remove(row_id)
+        self.current_items.delete(row_id)
+
+    def _set_multi_delete_running(self, running):
+        """Lock delete and re-query actions while a multi-row delete runs"""
+        self._multi_delete_running = running
+        state = "disabled" if running else "normal"
+        for button in (self.execute_btn, self.load_all_btn,
+                       self.delete_selected_btn, self.delete_multiple_btn):
+            button.configure(state=state)
+        if getattr(self, "delete_by_filter_btn", None) is not None and self._delete_job is None:
+            self.delete_by_filter_btn.configure(state=state)
 
     def delete_selected_item(self):
         """Delete the selected item from the table"""
+        if self._multi_delete_running:
+            return
+
         selection = self.data_tree.selection()
         if not selection:
             messagebox.showwarning("Aviso", "Selecione um item para deletar")
             return
 
-        item_index = self.data_tree.index(selection[0])
-        if item_index >= len(self.current_items):
+        item = self.current_items.get(int(selection[0]))
+        if item is None:
             messagebox.showerror("Erro", "Índice do item inválido")
             return
 
-        item = self.current_items[item_index]
-
         try:
             self.db_service.current_table.reload()
             key_schema = self.db_service.current_table.key_schema
@@ -800,9 +927,8 @@ class MainWindow:
             success, message = self.db_service.delete_item(key)
 
             if success:
-                self.data_tree.delete(selection[0])
-                self.current_items.pop(item_index)
-                self.count_label.configure(text=f"Items: {len(self.current_items)}")
+                self._remove_tree_row(selection[0])
+                self._update_count_label()
                 self.action_status_label.configure(
                     text=f"✓ {message}",
                     text_color="#4CAF50"
@@ -821,6 +947,9 @@ class MainWindow:
 
     def delete_multiple_items(self):
         """Delete multiple selected items from the table"""
+        if self._multi_delete_running:
+            return
+
         selection = self.data_tree.selection()
         if not selection:
             messagebox.showwarning("Aviso", "Selecione pelo menos um item para deletar")
@@ -836,12 +965,10 @@ class MainWindow:
 
             items_to_delete = []
             for selection_item in selection:
-                item_index = self.data_tree.index(selection_item)
-                if item_index >= len(self.current_items):
+                item = self.current_items.get(int(selection_item))
+                if item is None:
                     continue
 
-                item = self.current_items[item_index]
-
                 key = {}
                 for key_attr in key_schema:
                     attr_name = key_attr['AttributeName']
@@ -851,8 +978,7 @@ class MainWindow:
                 items_to_delete.append({
                     'item': item,
                     'key': key,
-                    'tree_item': selection_item,
-                    'index': item_index
+                    'tree_item': selection_item
                 })
 
             if not items_to_delete:
@@ -874,56 +1000,190 @@ class MainWindow:
             if not confirm:
                 return
 
-            deleted_count = 0
-            errors = []
-
             self.action_status_label.configure(
                 text=f"Deletando {len(items_to_delete)} itens...",
                 text_color="#2196F3"
             )
-            self.root.update()
 
-            for item_data in items_to_delete:
-                success, message = self.db_service.delete_item(item_data['key'])
-
-                if success:
-                    deleted_count += 1
-                    self.data_tree.delete(item_data['tree_item'])
-                else:
-                    errors.append(f"Erro ao deletar {item_data['key']}: {message}")
+            self._set_multi_delete_running(True)
+            thread = threading.Thread(
+                target=self._do_delete_multiple_items,
+                args=(items_to_delete, self._result_generation),
+                daemon=True
+            )
+            thread.start()
 
-            for item_data in sorted(items_to_delete, key=lambda x: x['index'], reverse=True):
-                self.current_items.pop(item_data['index'])
+        except Exception as e:
+            error_msg = f"Erro ao deletar múltiplos itens: {str(e)}"
+            self.action_status_label.configure(
+                text="✗ Erro ao deletar",
+                text_color="#ef5350"
+            )
+            messagebox.showerror("Erro", error_msg)
 
-            self.count_label.configure(text=f"Items: {len(self.current_items)}")
+    def _do_delete_multiple_items(self, items_to_delete, generation):
+        """Delete items in a separate thread with parallel BatchWriteItem calls
 
-            if deleted_count == len(items_to_delete):
-                result_msg = f"✓ {deleted_count} itens deletados com sucesso!"
-                self.action_status_label.configure(
-                    text=result_msg,
-                    text_color="#4CAF50"
-                )
-                messagebox.showinfo("Sucesso", result_msg)
-            else:
-                result_msg = f"Deletados: {deleted_count}/{len(items_to_delete)} itens"
-                if errors:
-                    result_msg += f"\n\nErros:\n" + "\n".join(errors[:5])
-                    if len(errors) > 5:
-                        result_msg += f"\n... e mais {len(errors) - 5} erros"
+        Args:
+            items_to_delete: Selected rows ({'item', 'key', 'tree_item'})
+            generation: _result_generation when the rows were selected
+        """
+        total = len(items_to_delete)
 
-                self.action_status_label.configure(
-                    text=f"⚠️ {deleted_count}/{len(items_to_delete)} deletados",
-                    text_color="#FFA726"
-                )
-                messagebox.showwarning("Resultado da Deleção", result_msg)
+        def on_progress(deleted, _total):
+            self.root.after(0, lambda: self.action_status_label.configure(
+                text=f"Deletando... {deleted}/{total}",
+                text_color="#2196F3"
+            ))
 
+        try:
+            deleted_keys, errors = self.db_service.batch_delete_items(
+                [item_data['key'] for item_data in items_to_delete],
+                progress_callback=on_progress
+            )
         except Exception as e:
-            error_msg = f"Erro ao deletar múltiplos itens: {str(e)}"
+            deleted_keys, errors = [], [str(e)]
+
+        self.root.after(
+            0,
+            lambda: self._finish_delete_multiple_items(items_to_delete, deleted_keys, errors, generation)
+        )
+
+    def _finish_delete_multiple_items(self, items_to_delete, deleted_keys, errors, generation):
+        """Remove deleted rows from the grid and report the result (Tk thread)"""
+        self._set_multi_delete_running(False)
+
+        def key_id(key):
+            return json.dumps(key, sort_keys=True, cls=DecimalEncoder)
+
+        deleted_ids = {key_id(key) for key in deleted_keys}
+        # Row ids are only valid for the result set they were selected from
+        same_results = generation == self._result_generation
+        deleted_count = 0
+        for item_data in items_to_delete:
+            if key_id(item_data['key']) in deleted_ids:
+                deleted_count += 1
+                if same_results and self.data_tree.exists(item_data['tree_item']):
+                    self._remove_tree_row(item_data['tree_item'])
+
+        self._update_count_label()
+
+        if deleted_count == len(items_to_delete):
+            result_msg = f"✓ {deleted_count} itens deletados com sucesso!"
             self.action_status_label.configure(
-                text="✗ Erro ao deletar",
-                text_color="#ef5350"
+                text=result_msg,
+                text_color="#4CAF50"
+            )
+            messagebox.showinfo("Sucesso", result_msg)
+        else:
+            result_msg = f"Deletados: {deleted_count}/{len(items_to_delete)} itens"
+            if errors:
+                result_msg += f"\n\nErros:\n" + "\n".join(errors[:5])
+                if len(errors) > 5:
+                    result_msg += f"\n... e mais {len(errors) - 5} erros"
+
+            self.action_status_label.configure(
+                text=f"⚠️ {deleted_count}/{len(items_to_delete)} deletados",
+                text_color="#FFA726"
             )
+            messagebox.showwarning("Resultado da Deleção", result_msg)
+
+    def delete_by_filter(self):
+        """Delete every item matching the current filters (local mode only)"""
+        if self._delete_job is not None:
+            self._delete_job.cancel()
+            self.action_status_label.configure(
+                text="Parando deleção (o progresso fica salvo)...",
+                text_color="#FFA726"
+            )
+            return
+
+        if not self.db_service.current_table:
+            messagebox.showwarning("Aviso", "Selecione uma tabela primeiro")
+            return
+
+        filters = [
+            row.get_filter() for row in self.filter_rows
+            if row.get_filter()
+        ]
+
+        def on_progress(deleted, scanned):
+            self.root.after(0, lambda: self.action_status_label.configure(
+                text=f"🧹 Deletados: {deleted:,} | Verificados: {scanned:,}",
+                text_color="#2196F3"
+            ))
+
+        job, error_msg = self.db_service.create_delete_by_filter_job(filters, progress_callback=on_progress)
+        if job is None:
             messagebox.showerror("Erro", error_msg)
+            return
+
+        table_name = self.db_service.current_table.name
+        scope = f"{len(filters)} filtro(s)" if filters else "SEM FILTROS (tabela inteira)"
+        confirm = messagebox.askyesno(
+            "Confirmar Deleção por Filtro",
+            f"Deletar TODOS os itens da tabela '{table_name}' que atendem {scope}?\n\n"
+            f"Limite de escrita: {config.BULK_DELETE_WRITE_BUDGET or 'sem limite'} itens/s\n\n"
+            "Esta ação é irreversível!"
+        )
+        if not confirm:
+            return
+
+        resume = False
+        if job.has_checkpoint():
+            resume = messagebox.askyesno(
+                "Retomar Deleção",
+                "Existe uma deleção anterior interrompida com estes filtros.\n\n"
+                "Deseja retomar de onde parou?"
+            )
+            if not resume:
+                job.discard_checkpoint()
+
+        self._delete_job = job
+        self.delete_by_filter_btn.configure(text="⏹ Parar Deleção")
+        self.action_status_label.configure(text="🧹 Iniciando deleção...", text_color="#2196F3")
+
+        def run_job():
+            try:
+                stats = job.run(resume=resume)
+            except Exception as e:
+                stats = {'deleted': 0, 'scanned': 0, 'errors': [str(e)], 'completed': False, 'elapsed_seconds': 0}
+            self.root.after(0, lambda: self._finish_delete_by_filter(job, stats))
+
+        thread = threading.Thread(target=run_job, daemon=True)
+        thread.start()
+
+    def _finish_delete_by_filter(self, job, stats):
+        """Report the delete-by-filter result (Tk thread)"""
+        self._delete_job = None
+        self.delete_by_filter_btn.configure(text="🧹 Deletar por Filtro")
+
+        # The grid may still list deleted items: re-run the current query
+        current_table = self.db_service.current_table
+        if (stats['deleted'] and len(self.current_items)
+                and current_table is not None and current_table.name == job.table_name):
+            self.execute_filters()
+
+        summary = (
+            f"Deletados: {stats['deleted']:,} | Verificados: {stats['scanned']:,} | "
+            f"Tempo: {stats['elapsed_seconds']:.1f}s"
+        )
+        if stats['completed']:
+            self.action_status_label.configure(text=f"✓ {summary}", text_color="#4CAF50")
+            messagebox.showinfo("Deleção Concluída", f"✓ Deleção concluída!\n\n{summary}")
+        elif stats['errors']:
+            self.action_status_label.configure(text=f"✗ {summary}", text_color="#ef5350")
+            messagebox.showerror(
+                "Erro na Deleção",
+                f"{summary}\n\nErros:\n" + "\n".join(stats['errors'][:5]) +
+                "\n\nO progresso foi salvo; execute novamente para retomar."
+            )
+        else:
+            self.action_status_label.configure(text=f"⚠️ Interrompido: {summary}", text_color="#FFA726")
+            messagebox.showwarning(
+                "Deleção Interrompida",
+                f"{summary}\n\nO progresso foi salvo; execute novamente para retomar."
+            )
 
     def show_item_details(self, event):
         """Show item details in a popup window"""
@@ -931,27 +1191,44 @@ class MainWindow:
         if not selection:
             return
 
-        item_index = self.data_tree.index(selection[0])
-        if item_index >= len(self.current_items):
+        item = self.current_items.get(int(selection[0]))
+        if item is None:
             return
 
-        item = self.current_items[item_index]
-
         popup = ctk.CTkToplevel(self.root)
         popup.title("Detalhes do Item")
-        popup.geometry("600x400")
+        popup.geometry("760x500")
+
+        def copy_json():
+            json_str = json.dumps(
+                item,
+                indent=2,
+                ensure_ascii=False,
+                cls=DecimalEncoder
+            )
+            popup.clipboard_clear()
+            popup.clipboard_append(json_str)
 
-        text = ctk.CTkTextbox(popup, font=ctk.CTkFont(family="Courier", size=12))
-        text.pack(fill="both", expand=True, padx=10, pady=10)
+        actions = ctk.CTkFrame(popup, fg_color="transparent")
+        actions.pack(fill="x", padx=10, pady=(10, 0))
 
-        json_str = json.dumps(
-            item,
-            indent=2,
-            ensure_ascii=False,
-            cls=DecimalEncoder
-        )
-        text.insert("0.0", json_str)
-        text.configure(state="disabled")
+        ctk.CTkButton(
+            actions,
+            text="📋 Copiar JSON",
+            command=copy_json,
+            width=120,
+            height=28
+        ).pack(side="left")
+
+        ctk.CTkLabel(
+            actions,
+            text="Expanda mapas e listas clicando na seta",
+            font=ctk.CTkFont(size=10, slant="italic"),
+            text_color="gray"
+        ).pack(side="left", padx=10)
+
+        viewer = JsonTreeViewer(popup, item)
+        viewer.pack(fill="both", expand=True, padx=10, pady=10)
 
     def show_table_info(self):
         """Display table information"""
@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""
+Script de teste do limite adaptativo de escritas simultâneas
+Verifica a redução multiplicativa no throttling (com cooldown), o aumento
+aditivo nos sucessos e a espera por vaga acima do limite
+"""
+
+import sys
+import os
+import threading
+
+# Add src to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__)))
+
+from src.services.adaptive_concurrency import AdaptiveConcurrency
+
+
+def test_aimd():
+    """Test the AIMD limit updates"""
+    limit = AdaptiveConcurrency(8)
+    test_cases = [(limit.current, 8, "Começa no máximo")]
+
+    decreased = limit.on_throttle()
+    test_cases.append(((decreased, limit.current), (True, 4), "Throttling reduz o limite pela metade"))
+
+    decreased = limit.on_throttle()
+    test_cases.append(((decreased, limit.current, limit.throttle_events), (False, 4, 2),
+                       "Throttling repetido dentro do cooldown não reduz de novo"))
+
+    for _ in range(4):
+        limit.on_success()
+    test_cases.append(((limit.current, round(limit.limit, 2)), (4, 4.92),
+                       "Uma janela de sucessos soma ~1 ao limite"))
+
+    for _ in range(100):
+        limit.on_success()
+    test_cases.append((limit.current, 8, "O aumento para no máximo"))
+
+    floor = AdaptiveConcurrency(8, min_limit=3)
+    floor.DECREASE_COOLDOWN = 0
+    for _ in range(5):
+        floor.on_throttle()
+    test_cases.append(((floor.current, floor.snapshot()["lowest"], floor.decreases), (3, 3, 2),
+                       "O limite não passa do mínimo"))
+
+    print("=" * 80)
+    print("TESTE DO AIMD")
+    print("=" * 80)
+
+    passed = 0
+    failed = 0
+
+    for result, expected, description in test_cases:
+        status = "✓ PASS" if result == expected else "✗ FAIL"
+
+        if result == expected:
+            passed += 1
+        else:
+            failed += 1
+
+        print(f"\n{status} | {description}")
+        print(f"  Expected: {repr(expected)}")
+        print(f"  Got: {repr(result)}")
+
+    print("\n" + "=" * 80)
+    print(f"RESULTADO: {passed} passed, {failed} failed")
+    print("=" * 80)
+
+    return failed == 0
+
+
+def test_blocking():
+    """Test that a call above the limit waits for a free slot"""
+    limit = AdaptiveConcurrency(1)
+    entered = threading.Event()
+
+    def second_call():
+        with limit:
+            entered.set()
+
+    with limit:
+        thread = threading.Thread(target=second_call)
+        thread.start()
+        blocked = not entered.wait(0.1)
+    thread.join(1)
+
+    print("\n" + "=" * 80)
+    print("TESTE DE ESPERA POR VAGA")
+    print("=" * 80)
+
+    ok = blocked and entered.is_set()
+    print(f"\n{'✓ PASS' if ok else '✗ FAIL'} | Segunda chamada espera a primeira terminar")
+    print(f"  Bloqueada: {blocked} | Entrou depois: {entered.is_set()}")
+
+    print("\n" + "=" * 80)
+    print(f"RESULTADO: {int(ok)} passed, {int(not ok)} failed")
+    print("=" * 80)
+
+    return ok
+
+
+if __name__ == "__main__":
+    success = test_aimd()
+    success = test_blocking() and success
+    sys.exit(0 if success else 1)
@@ -0,0 +1,164 @@
+#!/usr/bin/env python3
+"""
+Script de teste do empacotamento de lotes do BatchWriteItem
+Verifica os limites de itens e bytes por lote, a rejeição de itens acima
+de 400 KB antes do envio e o tratamento de chaves repetidas (dentro de um
+lote e entre lotes escritos por threads diferentes)
+"""
+
+import sys
+import os
+import threading
+import time
+
+# Add src to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__)))
+
+from src.services.batch_importer import _BatchWriterPool, _batch_key_function
+from src.services.item_converter import (
+    MAX_ITEM_SIZE, ON_DUPLICATE_COALESCE, ON_DUPLICATE_FLUSH, ItemConverter, pack_batches
+)
+
+
+def put(item):
+    return {"PutRequest": {"Item": item}}
+
+
+def test_batch_limits():
+    """Test item and byte limits per batch"""
+    requests = [put({"id": {"S": str(i)}}) for i in range(60)]
+    by_count, _ = pack_batches(requests)
+
+    # 1 MB por item: 16 itens enchem o limite de 16 MB do BatchWriteItem
+    requests = [put({"id": {"S": str(i)}}) for i in range(40)]
+    by_bytes, _ = pack_batches(requests, [1024 * 1024] * 40)
+
+    converter = ItemConverter()
+    batches, rejects, _ = converter.prepare_put_batches(
+        [{"id": "1", "blob": "x" * (MAX_ITEM_SIZE + 1)}, {"id": "2"}], {"id": "HASH"})
+
+    test_cases = [
+        # (result, expected, description)
+        ([len(batch) for batch in by_count], [25, 25, 10], "Lotes de até 25 itens"),
+        ([len(batch) for batch in by_bytes], [16, 16, 8], "Lotes de até 16 MB"),
+        (len(rejects), 1, "Item acima de 400 KB rejeitado na conversão"),
+        (rejects[0]["size"] > MAX_ITEM_SIZE if rejects else False, True, "Rejeição informa o tamanho"),
+        ([request["PutRequest"]["Item"]["id"] for batch in batches for request in batch], [{"S": "2"}],
+         "Demais itens seguem no lote"),
+    ]
+
+    print("=" * 80)
+    print("TESTE DOS LIMITES DE LOTE")
+    print("=" * 80)
+
+    passed = 0
+    failed = 0
+
+    for result, expected, description in test_cases:
+        status = "✓ PASS" if result == expected else "✗ FAIL"
+
+        if result == expected:
+            passed += 1
+        else:
+            failed += 1
+
+        print(f"\n{status} | {description}")
+        print(f"  Expected: {repr(expected)}")
+        print(f"  Got: {repr(result)}")
+
+    print("\n" + "=" * 80)
+    print(f"RESULTADO: {passed} passed, {failed} failed")
+    print("=" * 80)
+
+    return failed == 0
+
+
+def test_duplicate_keys():
+    """Test repeated keys inside a batch and across writer threads"""
+    key_schema = {"id": "HASH"}
+    requests = [put({"id": {"S": "a"}, "v": {"N": "1"}}),
+                put({"id": {"S": "b"}, "v": {"N": "2"}}),
+                put({"id": {"S": "a"}, "v": {"N": "3"}})]
+
+    coalesced_batches, coalesced = pack_batches(requests, key_schema=key_schema,
+                                                on_duplicate=ON_DUPLICATE_COALESCE)
+    flushed_batches, flushed = pack_batches(requests, key_schema=key_schema, on_duplicate=ON_DUPLICATE_FLUSH)
+    try:
+        pack_batches(requests, key_schema=key_schema, on_duplicate="x")
+        invalid_refused = False
+    except ValueError:
+        invalid_refused = True
+
+    single = _batch_key_function(key_schema)
+    composite = _batch_key_function({"pk": "HASH", "sk": "RANGE"})
+    single_keys = single([put({"id": {"S": "a"}}), put({"v": {"N": "1"}}), {"id": "b"}, {"id": None}])
+    composite_keys = composite([put({"pk": {"S": "a"}, "sk": {"N": "1"}}), put({"pk": {"S": "a"}}),
+                                {"pk": "b", "sk": 2}, {"sk": 3}])
+
+    # Lotes só com itens sem chave não esperam uns pelos outros
+    writes = []
+    lock = threading.Lock()
+
+    def write_batch(batch):
+        with lock:
+            writes.append(("start", batch[0]["PutRequest"]["Item"]["v"]["N"]))
+        time.sleep(0.1)
+        with lock:
+            writes.append(("end", batch[0]["PutRequest"]["Item"]["v"]["N"]))
+        return len(batch), 0
+
+    pool = _BatchWriterPool(write_batch, 2, lambda *args: None, single)
+    pool.submit([put({"v": {"N": "1"}})])
+    pool.submit([put({"v": {"N": "2"}})])
+    pool.close()
+    keyless_overlap = [event for event, _ in writes[:2]] == ["start", "start"]
+
+    writes.clear()
+    pool = _BatchWriterPool(write_batch, 2, lambda *args: None, single)
+    pool.submit([put({"id": {"S": "a"}, "v": {"N": "1"}})])
+    pool.submit([put({"id": {"S": "a"}, "v": {"N": "2"}})])
+    pool.close()
+
+    test_cases = [
+        # (result, expected, description)
+        (([r["PutRequest"]["Item"]["v"]["N"] for b in coalesced_batches for r in b], coalesced), (["2", "3"], 1),
+         "coalesce mantém só a última escrita da chave"),
+        (([len(b) for b in flushed_batches], flushed), ([2, 1], 0), "flush fecha o lote antes da chave repetida"),
+        (invalid_refused, True, "on_duplicate inválido é recusado"),
+        (single_keys, {"a", "b"}, "Chaves de PutRequests e itens, sem os itens sem chave"),
+        (composite_keys, {("a", "1"), ("b", 2)}, "Chave composta, sem os itens com parte da chave"),
+        (keyless_overlap, True, "Lotes com itens sem chave são escritos em paralelo"),
+        (writes, [("start", "1"), ("end", "1"), ("start", "2"), ("end", "2")],
+         "Lotes com a mesma chave são escritos na ordem"),
+    ]
+
+    print("\n" + "=" * 80)
+    print("TESTE DE CHAVES REPETIDAS")
+    print("=" * 80)
+
+    passed = 0
+    failed = 0
+
+    for result, expected, description in test_cases:
+        status = "✓ PASS" if result == expected else "✗ FAIL"
+
+        if result == expected:
+            passed += 1
+        else:
+            failed += 1
+
+        print(f"\n{status} | {description}")
+        print(f"  Expected: {repr(expected)}")
+        print(f"  Got: {repr(result)}")
+
+    print("\n" + "=" * 80)
+    print(f"RESULTADO: {passed} passed, {failed} failed")
+    print("=" * 80)
+
+    return failed == 0
+
+
+if __name__ == "__main__":
+    success = test_batch_limits()
+    success = test_duplicate_keys() and success
+    sys.exit(0 if success else 1)
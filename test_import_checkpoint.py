@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""
+Script de teste do checkpoint de importação
+Verifica que a posição salva só avança pelo prefixo contínuo de unidades
+confirmadas e que o checkpoint é recusado quando o arquivo muda
+"""
+
+import sys
+import os
+import tempfile
+import time
+
+# Add src to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__)))
+
+from src.services.import_checkpoint import ImportCheckpoint
+
+
+def report(title, test_cases):
+    """Print (result, expected, description) cases and return True if all passed"""
+    print("\n" + "=" * 80)
+    print(title)
+    print("=" * 80)
+
+    passed = 0
+    failed = 0
+
+    for result, expected, description in test_cases:
+        status = "✓ PASS" if result == expected else "✗ FAIL"
+
+        if result == expected:
+            passed += 1
+        else:
+            failed += 1
+
+        print(f"\n{status} | {description}")
+        print(f"  Expected: {repr(expected)}")
+        print(f"  Got: {repr(result)}")
+
+    print("\n" + "=" * 80)
+    print(f"RESULTADO: {passed} passed, {failed} failed")
+    print("=" * 80)
+
+    return failed == 0
+
+
+def test_contiguous_prefix(directory):
+    """Test that the position only moves when every earlier unit is done"""
+    data_file = os.path.join(directory, "dump.jsonl")
+    with open(data_file, "w") as f:
+        f.write('{"id": "1"}\n')
+
+    checkpoint = ImportCheckpoint(data_file, "tabela", "items", os.path.join(directory, "cp.json"))
+    first = checkpoint.begin_unit(25, 1)
+    second = checkpoint.begin_unit(50, 2)
+    third = checkpoint.begin_unit(75, 1, failed=1, successful=2)
+    test_cases = []
+
+    checkpoint.batch_done(second, 25, 0)
+    checkpoint.batch_done(third, 22, 0)
+    test_cases.append((checkpoint.position, 0, "Unidades fora de ordem não avançam a posição"))
+
+    checkpoint.batch_done(first, 24, 1)
+    test_cases.append((checkpoint.position, 25, "Primeira unidade confirmada avança só até ela"))
+
+    checkpoint.batch_done(second, 0, 0)
+    test_cases.append((checkpoint.position, 75, "Prefixo completo avança até a última unidade"))
+    test_cases.append(((checkpoint.successful, checkpoint.failed), (73, 2),
+                       "Sucessos e falhas somados das unidades (incluindo os já contados)"))
+
+    checkpoint.begin_unit(80, 0, failed=5)
+    test_cases.append(((checkpoint.position, checkpoint.failed), (80, 7),
+                       "Unidade sem lotes (tudo rejeitado) é confirmada na hora"))
+
+    return report("TESTE DO PREFIXO CONTÍNUO", test_cases)
+
+
+def test_save_and_load(directory):
+    """Test resuming a saved checkpoint and refusing incompatible ones"""
+    data_file = os.path.join(directory, "dump.json")
+    with open(data_file, "w") as f:
+        f.write('[{"id": "1"}]')
+    checkpoint_path = os.path.join(directory, "cp-load.json")
+
+    checkpoint = ImportCheckpoint(data_file, "tabela", "bytes", checkpoint_path)
+    unit = checkpoint.begin_unit(1000, 1)
+    checkpoint.batch_done(unit, 10, 2)
+    checkpoint.save()
+
+    loaded = ImportCheckpoint(data_file, "tabela", "bytes", checkpoint_path)
+    problem = loaded.load()
+    other_mode = ImportCheckpoint(data_file, "tabela", "items", checkpoint_path)
+    other_table = ImportCheckpoint(data_file, "outra", "bytes", checkpoint_path)
+
+    test_cases = [
+        # (result, expected, description)
+        ((problem, loaded.position, loaded.successful, loaded.failed), (None, 1000, 10, 2),
+         "Checkpoint salvo é carregado"),
+        (other_mode.load() is not None, True, "Checkpoint de outro modo é recusado"),
+        ((other_table.load(), other_table.position), (None, 0), "Checkpoint de outra tabela é ignorado"),
+    ]
+
+    # Arquivo alterado depois do checkpoint
+    with open(data_file, "w") as f:
+        f.write('[{"id": "1"}, {"id": "2"}]')
+    stamp = time.time() + 10
+    os.utime(data_file, (stamp, stamp))
+    changed = ImportCheckpoint(data_file, "tabela", "bytes", checkpoint_path)
+    test_cases.append((changed.load() is not None, True, "Checkpoint de um arquivo alterado é recusado"))
+
+    changed.discard()
+    test_cases.append((changed.exists(), False, "discard remove o arquivo do checkpoint"))
+
+    return report("TESTE DE GRAVAÇÃO E RETOMADA", test_cases)
+
+
+if __name__ == "__main__":
+    with tempfile.TemporaryDirectory() as directory:
+        success = test_contiguous_prefix(directory)
+        success = test_save_and_load(directory) and success
+    sys.exit(0 if success else 1)
@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""
+Script de teste da conversão de itens em passada única
+Verifica que _encode_item produz o mesmo item que o caminho antigo
+(_convert_to_dynamodb_format + _clean_dynamodb_item), para itens Python e
+itens já em DynamoDB JSON
+"""
+
+import sys
+import os
+from datetime import datetime
+from decimal import Decimal
+
+# Add src to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__)))
+
+from src.services.item_converter import ItemConverter, request_size
+
+
+def test_encode_item():
+    """Test _encode_item against the two-pass conversion"""
+    converter = ItemConverter()
+
+    test_cases = [
+        # (item, description)
+        ({"id": "1", "price": 19.99, "rating": 4.5, "qty": 3, "active": True}, "Números e booleanos"),
+        ({"id": "2", "created": datetime(2026, 1, 20, 10, 30)}, "Datetime"),
+        ({"id": "3", "nan": float("nan"), "inf": float("inf"), "normal": 3.14}, "NaN e Infinity"),
+        ({"id": "4", "description": "", "tags": ["python", "", "dynamodb"], "none": None}, "Strings vazias e None"),
+        ({"id": "5", "metadata": {"views": 1000, "score": 8.5, "extra": None, "tags": ["a", "", "b"]},
+          "prices": [19.99, 29.99]}, "Estruturas aninhadas"),
+        ({"id": "6", "amount": Decimal("12345678901234567890.123"), "data": b"\x00\x01"}, "Decimal e bytes"),
+        ({"id": "7", "nome": "João", "cidade": "São Paulo"}, "Texto fora do ASCII"),
+        ({"id": {"S": "8"}, "n": {"N": "42"}, "null": {"NULL": True}, "empty": {"S": ""},
+          "set": {"SS": ["a", ""]}, "no_set": {"SS": []}}, "DynamoDB JSON com atributos inválidos"),
+        ({"id": {"S": "9"}, "list": {"L": [{"S": ""}, {"N": "1"}, {"M": {"k": {"BOOL": False}}}]},
+          "map": {"M": {"a": {"NULL": True}, "b": {"S": "x"}}}}, "DynamoDB JSON aninhado"),
+        ({"id": {"S": "10"}, "name": "Ana", "qty": 2}, "Primeiro valor parece AttributeValue, os demais não"),
+    ]
+
+    print("=" * 80)
+    print("TESTE DA CONVERSÃO EM PASSADA ÚNICA")
+    print("=" * 80)
+
+    passed = 0
+    failed = 0
+
+    for item, description in test_cases:
+        expected = converter._clean_dynamodb_item(converter._convert_to_dynamodb_format(item))
+        result = converter._encode_item(item)
+        sized, size = converter._encode_sized_item(item)
+        ok = result == expected and sized == expected and size == request_size(expected)
+        status = "✓ PASS" if ok else "✗ FAIL"
+
+        if ok:
+            passed += 1
+        else:
+            failed += 1
+
+        print(f"\n{status} | {description}")
+        print(f"  Expected: {repr(expected)[:200]} ({request_size(expected)} bytes)")
+        print(f"  Got: {repr(result)[:200]} ({size} bytes)")
+
+    print("\n" + "=" * 80)
+    print(f"RESULTADO: {passed} passed, {failed} failed")
+    print("=" * 80)
+
+    return failed == 0
+
+
+if __name__ == "__main__":
+    success = test_encode_item()
+    sys.exit(0 if success else 1)
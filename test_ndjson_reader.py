@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""
+Script de teste da leitura de arquivos JSON Lines
+Verifica que as faixas de bytes terminam em quebra de linha e que, lidas
+uma a uma, devolvem todos os itens do arquivo na ordem, uma vez cada
+"""
+
+import sys
+import os
+import json
+import tempfile
+from decimal import Decimal
+
+# Add src to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__)))
+
+from src.services.ndjson_reader import is_ndjson, parse_range, split_ranges
+
+
+def test_ranges():
+    """Test split_ranges and parse_range over a small JSON Lines file"""
+    lines = [json.dumps({"id": str(i), "name": "x" * (i % 7), "price": 1.5}) for i in range(200)]
+    lines.insert(50, "")
+    lines.insert(120, "{invalido")
+
+    with tempfile.TemporaryDirectory() as directory:
+        file_path = os.path.join(directory, "dump.jsonl")
+        with open(file_path, "w") as f:
+            f.write("\n".join(lines))  # última linha sem quebra de linha
+        size = os.path.getsize(file_path)
+
+        ranges = split_ranges(file_path, 256)
+        items = []
+        invalid = []
+        for start, end in ranges:
+            range_items, range_invalid = parse_range(file_path, start, end)
+            items.extend(range_items)
+            invalid.extend(range_invalid)
+
+        with open(file_path, "rb") as f:
+            content = f.read()
+        resumed = split_ranges(file_path, 256, start=ranges[3][0])
+
+        test_cases = [
+            # (result, expected, description)
+            (ranges[0][0] == 0 and ranges[-1][1] == size, True, "Faixas cobrem o arquivo inteiro"),
+            (all(a[1] == b[0] for a, b in zip(ranges, ranges[1:])), True, "Faixas contíguas"),
+            (all(content[end - 1:end] == b"\n" for _, end in ranges[:-1]), True,
+             "Faixas terminam em quebra de linha"),
+            ([item["id"] for item in items], [str(i) for i in range(200)], "Todos os itens, na ordem"),
+            (type(items[0]["price"]), Decimal, "Números como Decimal"),
+            ([(reject["line"], content[reject["byte"]:reject["byte"] + 10]) for reject in invalid],
+             [("{invalido", b"{invalido\n")], "Linha inválida rejeitada com o byte de início"),
+            (resumed, ranges[3:], "Retomada a partir do início de uma faixa"),
+            (split_ranges(file_path, 256, start=size), [], "Início no fim do arquivo"),
+            (is_ndjson(file_path), True, "Extensão .jsonl"),
+        ]
+
+    print("=" * 80)
+    print("TESTE DAS FAIXAS DE BYTES DO JSON LINES")
+    print("=" * 80)
+
+    passed = 0
+    failed = 0
+
+    for result, expected, description in test_cases:
+        status = "✓ PASS" if result == expected else "✗ FAIL"
+
+        if result == expected:
+            passed += 1
+        else:
+            failed += 1
+
+        print(f"\n{status} | {description}")
+        print(f"  Expected: {repr(expected)[:200]}")
+        print(f"  Got: {repr(result)[:200]}")
+
+    print("\n" + "=" * 80)
+    print(f"RESULTADO: {passed} passed, {failed} failed")
+    print("=" * 80)
+
+    return failed == 0
+
+
+def test_detection():
+    """Test JSON Lines detection by content when the extension does not tell"""
+    test_cases = [
+        # (sample, expected, description)
+        (b'{"id": "1"}\n{"id": "2"}\n', True, "Um objeto por linha"),
+        (b'[{"id": "1"},\n{"id": "2"}]\n', False, "Array JSON"),
+        (b'{\n  "id": "1"\n}\n', False, "Objeto JSON formatado em várias linhas"),
+        (b'{"id": "1"}\n', False, "Uma linha só"),
+    ]
+
+    print("\n" + "=" * 80)
+    print("TESTE DE DETECÇÃO DO JSON LINES")
+    print("=" * 80)
+
+    passed = 0
+    failed = 0
+
+    for sample, expected, description in test_cases:
+        result = is_ndjson("dump.json", sample)
+        status = "✓ PASS" if result == expected else "✗ FAIL"
+
+        if result == expected:
+            passed += 1
+        else:
+            failed += 1
+
+        print(f"\n{status} | {description}")
+        print(f"  Sample: {repr(sample)}")
+        print(f"  Expected: {expected} | Got: {result}")
+
+    print("\n" + "=" * 80)
+    print(f"RESULTADO: {passed} passed, {failed} failed")
+    print("=" * 80)
+
+    return failed == 0
+
+
+if __name__ == "__main__":
+    success = test_ranges()
+    success = test_detection() and success
+    sys.exit(0 if success else 1)
@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""
+Script de teste da alternância de partições (--spread-partitions)
+Verifica a ordem das rodadas por chave de partição e a remoção das escritas
+substituídas antes de alternar
+"""
+
+import sys
+import os
+
+# Add src to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__)))
+
+from src.services.partition_spread import interleave_partitions, latest_per_key, reorder_window
+
+
+def test_partition_spread():
+    """Test interleave_partitions and reorder_window"""
+    items = [{"pk": p, "n": n} for p, count in (("a", 3), ("b", 2), ("c", 1)) for n in range(count)]
+    spread = interleave_partitions(items, lambda item: item["pk"])
+    single = [{"pk": "a", "n": n} for n in range(3)]
+
+    key_schema = {"pk": "HASH", "sk": "RANGE"}
+    window = [{"pk": "a", "sk": 1, "v": 1}, {"pk": "a", "sk": 1, "v": 2},
+              {"pk": "a", "sk": 2, "v": 3}, {"pk": "b", "sk": 1, "v": 4}]
+    coalesced, replaced = reorder_window(window, key_schema, coalesce=True)
+    flushed, kept = reorder_window(window, key_schema, coalesce=False)
+    no_key, no_key_replaced = latest_per_key([{"v": 1}, {"v": 2}], lambda item: None)
+    dynamodb_json, _ = reorder_window([{"pk": {"S": "a"}, "sk": {"N": "1"}}, {"pk": {"S": "a"}, "sk": {"N": "2"}},
+                                       {"pk": {"S": "b"}, "sk": {"N": "1"}}], key_schema, coalesce=True)
+
+    test_cases = [
+        # (result, expected, description)
+        ([(item["pk"], item["n"]) for item in spread],
+         [("a", 0), ("b", 0), ("c", 0), ("a", 1), ("b", 1), ("a", 2)],
+         "Uma rodada por partição, na ordem do arquivo"),
+        (interleave_partitions(single, lambda item: item["pk"]) is single, True,
+         "Uma só partição mantém a lista"),
+        (([item["v"] for item in coalesced], replaced), ([2, 4, 3], 1),
+         "coalesce: só a última escrita de cada chave completa, antes de alternar"),
+        ((sorted(item["v"] for item in flushed), kept), ([1, 2, 3, 4], 0),
+         "flush: todas as escritas são mantidas"),
+        ((len(no_key), no_key_replaced), (2, 0), "Itens sem chave ficam todos"),
+        ([item["pk"]["S"] for item in dynamodb_json], ["a", "b", "a"], "Itens em DynamoDB JSON"),
+    ]
+
+    print("=" * 80)
+    print("TESTE DE ALTERNÂNCIA DE PARTIÇÕES")
+    print("=" * 80)
+
+    passed = 0
+    failed = 0
+
+    for result, expected, description in test_cases:
+        status = "✓ PASS" if result == expected else "✗ FAIL"
+
+        if result == expected:
+            passed += 1
+        else:
+            failed += 1
+
+        print(f"\n{status} | {description}")
+        print(f"  Expected: {repr(expected)}")
+        print(f"  Got: {repr(result)}")
+
+    print("\n" + "=" * 80)
+    print(f"RESULTADO: {passed} passed, {failed} failed")
+    print("=" * 80)
+
+    return failed == 0
+
+
+if __name__ == "__main__":
+    success = test_partition_spread()
+    sys.exit(0 if success else 1)
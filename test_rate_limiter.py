@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+Script de teste do limite de escrita das importações
+Verifica o cálculo de WCUs por item e o token bucket (RateLimiter) que
+segura as escritas na taxa configurada
+"""
+
+import sys
+import os
+
+# Add src to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__)))
+
+from src.services.item_converter import dynamodb_item_size, write_capacity_units
+from src.services.rate_limiter import RateLimiter
+
+
+def test_write_capacity_units():
+    """Test item sizes and WCUs computed from DynamoDB JSON"""
+    test_cases = [
+        # (item, expected_size, expected_wcu, description)
+        ({"id": {"S": "abc"}}, 5, 1, "String"),
+        ({"s": {"S": "ção"}}, 6, 1, "String fora do ASCII (bytes UTF-8)"),
+        ({"n": {"N": "123"}}, 4, 1, "Número"),
+        ({"ok": {"BOOL": True}, "x": {"NULL": True}}, 5, 1, "Booleano e nulo"),
+        ({"l": {"L": [{"S": "a"}, {"N": "1"}]}}, 9, 1, "Lista"),
+        ({"m": {"M": {"k": {"S": "v"}}}}, 7, 1, "Mapa"),
+        ({"id": {"S": "x" * 1022}}, 1024, 1, "Exatamente 1 KB"),
+        ({"id": {"S": "x" * 1023}}, 1025, 2, "1 byte acima de 1 KB"),
+    ]
+
+    print("=" * 80)
+    print("TESTE DE TAMANHO E WCU POR ITEM")
+    print("=" * 80)
+
+    passed = 0
+    failed = 0
+
+    for item, expected_size, expected_wcu, description in test_cases:
+        size = dynamodb_item_size(item)
+        wcu = write_capacity_units(item)
+        ok = (size, wcu) == (expected_size, expected_wcu)
+        status = "✓ PASS" if ok else "✗ FAIL"
+
+        if ok:
+            passed += 1
+        else:
+            failed += 1
+
+        print(f"\n{status} | {description}")
+        print(f"  Expected: {expected_size} bytes, {expected_wcu} WCU")
+        print(f"  Got: {size} bytes, {wcu} WCU")
+
+    print("\n" + "=" * 80)
+    print(f"RESULTADO: {passed} passed, {failed} failed")
+    print("=" * 80)
+
+    return failed == 0
+
+
+def test_rate_limiter():
+    """Test burst, refill wait and requests larger than the bucket"""
+    disabled = RateLimiter(0)
+    limiter = RateLimiter(100, burst=10)
+    burst_wait = limiter.acquire(10)
+    refill_wait = limiter.acquire(5)
+
+    large = RateLimiter(100, burst=10)
+    large_wait = large.acquire(30)
+    debt_wait = large.acquire(1)
+
+    test_cases = [
+        # (ok, detail, description)
+        (not disabled.enabled and disabled.acquire(1000) == 0.0, "sem espera", "Taxa 0 não limita"),
+        (burst_wait == 0.0, f"espera {burst_wait:.3f}s", "Rajada inicial liberada sem espera"),
+        (0.03 <= refill_wait <= 0.2, f"espera {refill_wait:.3f}s",
+         "Próximo pedido espera a reposição (5 unidades a 100/s)"),
+        (large_wait == 0.0, f"espera {large_wait:.3f}s", "Pedido maior que o balde liberado com o balde cheio"),
+        (0.15 <= debt_wait <= 0.4, f"espera {debt_wait:.3f}s",
+         "O saldo negativo mantém a taxa média (~0.21s para repor)"),
+    ]
+
+    print("\n" + "=" * 80)
+    print("TESTE DO RATE LIMITER")
+    print("=" * 80)
+
+    passed = 0
+    failed = 0
+
+    for ok, detail, description in test_cases:
+        status = "✓ PASS" if ok else "✗ FAIL"
+
+        if ok:
+            passed += 1
+        else:
+            failed += 1
+
+        print(f"\n{status} | {description}")
+        print(f"  Got: {detail}")
+
+    print("\n" + "=" * 80)
+    print(f"RESULTADO: {passed} passed, {failed} failed")
+    print("=" * 80)
+
+    return failed == 0
+
+
+if __name__ == "__main__":
+    success = test_write_capacity_units()
+    success = test_rate_limiter() and success
+    sys.exit(0 if success else 1)
@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+Script de teste do armazenamento dos resultados carregados
+Verifica que o ResultStore colunar devolve os itens como foram inseridos
+(inclusive Decimals sem perda) e mantém os ids das linhas ao deletar
+"""
+
+import sys
+import os
+from decimal import Decimal
+
+# Add src to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__)))
+
+from src.models.result_store import ResultStore
+
+
+def test_round_trip():
+    """Test that stored items come back equal, with the same types"""
+    items = [
+        {"id": "1", "qty": Decimal("3"), "price": Decimal("19.99"), "name": "Ana", "tags": ["a"]},
+        {"id": "2", "qty": Decimal("5"), "price": Decimal("0.5"), "active": True},
+        {"id": "3", "qty": Decimal("7.25"), "price": Decimal("0.1000000000000000055511151231257827")},
+        {"id": "4", "count": 10, "ratio": 0.25, "nested": {"k": Decimal("1")}},
+    ]
+    store = ResultStore(items)
+
+    test_cases = [
+        # (result, expected, description)
+        (len(store), 4, "Quantidade de linhas"),
+        ([store.get(row_id) for row_id in store.ids()], items, "Itens iguais aos inseridos"),
+        ([type(value) for value in store.column_values("price")], [Decimal] * 3,
+         "Coluna de Decimal volta como Decimal"),
+        (store.value(2, "price"), Decimal("0.1000000000000000055511151231257827"),
+         "Decimal com mais dígitos que um double volta exato"),
+        (list(store.column_values("qty")), [Decimal("3"), Decimal("5"), Decimal("7.25")],
+         "Coluna de inteiros que recebe fração mantém os valores"),
+        (store.value(1, "name", "-"), "-", "Atributo ausente devolve o default"),
+    ]
+
+    print("=" * 80)
+    print("TESTE DE IDA E VOLTA DO RESULT STORE")
+    print("=" * 80)
+
+    passed = 0
+    failed = 0
+
+    for result, expected, description in test_cases:
+        status = "✓ PASS" if result == expected else "✗ FAIL"
+
+        if result == expected:
+            passed += 1
+        else:
+            failed += 1
+
+        print(f"\n{status} | {description}")
+        print(f"  Expected: {repr(expected)}")
+        print(f"  Got: {repr(result)}")
+
+    print("\n" + "=" * 80)
+    print(f"RESULTADO: {passed} passed, {failed} failed")
+    print("=" * 80)
+
+    return failed == 0
+
+
+def test_delete():
+    """Test that deleting a row keeps every other row id valid"""
+    items = [{"id": str(i), "n": i} for i in range(4)]
+    store = ResultStore(items)
+    deleted = store.delete(1)
+
+    test_cases = [
+        # (result, expected, description)
+        (deleted, True, "delete de linha existente"),
+        (store.delete(1), False, "delete de linha já removida"),
+        (store.ids(), [0, 2, 3], "Demais ids mantidos"),
+        (store.get(3), items[3], "Linha depois da removida"),
+        (1 in store, False, "Linha removida fora do store"),
+        (len(store), 3, "Quantidade de linhas"),
+        (list(store.cells("n", [0, 1, 2])), [(0, 0), (2, 2)], "cells pula a linha removida"),
+    ]
+
+    print("\n" + "=" * 80)
+    print("TESTE DE DELETE DO RESULT STORE")
+    print("=" * 80)
+
+    passed = 0
+    failed = 0
+
+    for result, expected, description in test_cases:
+        status = "✓ PASS" if result == expected else "✗ FAIL"
+
+        if result == expected:
+            passed += 1
+        else:
+            failed += 1
+
+        print(f"\n{status} | {description}")
+        print(f"  Expected: {repr(expected)}")
+        print(f"  Got: {repr(result)}")
+
+    print("\n" + "=" * 80)
+    print(f"RESULTADO: {passed} passed, {failed} failed")
+    print("=" * 80)
+
+    return failed == 0
+
+
+if __name__ == "__main__":
+    success = test_round_trip()
+    success = test_delete() and success
+    sys.exit(0 if success else 1)
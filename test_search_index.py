@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+"""
+Script de teste da busca rápida nos resultados carregados
+Verifica que o SearchIndex encontra as mesmas linhas que uma busca direta no
+texto dos itens, sem guardar cópia do texto das linhas
+"""
+
+import sys
+import os
+from decimal import Decimal
+
+# Add src to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__)))
+
+from src.models.result_store import ResultStore
+from src.models.search_index import SearchIndex
+
+
+def test_search():
+    """Test SearchIndex.search against the expected rows"""
+    store = ResultStore()
+    index = SearchIndex(store)
+    index.add_many((store.append(item), item) for item in [
+        {"id": "1", "name": "Alice Souza", "city": "São Paulo"},
+        {"id": "2", "name": "Alicia Lima", "city": "Recife", "active": True},
+        {"id": "3", "name": "Bruno", "city": "São Paulo", "price": Decimal("19.99")},
+        {"id": "4", "name": "Carla", "meta": {"email": "carla@example.com"}},
+    ])
+
+    test_cases = [
+        # (query, expected_rows, description)
+        ("", None, "Consulta vazia"),
+        ("ali", {0, 1}, "Substring de um token"),
+        ("ALI", {0, 1}, "Sem diferenciar maiúsculas"),
+        ("alic", {0, 1}, "Consulta que estende a anterior (digitando)"),
+        ("são paulo", {0, 2}, "Frase com espaço"),
+        ("alice souza", {0}, "Vários termos"),
+        ("ali paulo", set(), "Vários termos fora da ordem do texto"),
+        ("19.99", {2}, "Número Decimal"),
+        ("true", {1}, "Booleano"),
+        ("carla@example", {3}, "Valor aninhado com pontuação"),
+        ("@", {3}, "Só pontuação"),
+        ("zzz", set(), "Sem resultados"),
+    ]
+
+    print("=" * 80)
+    print("TESTE DA BUSCA RÁPIDA")
+    print("=" * 80)
+
+    passed = 0
+    failed = 0
+
+    for query, expected, description in test_cases:
+        result = index.search(query)
+        status = "✓ PASS" if result == expected else "✗ FAIL"
+
+        if result == expected:
+            passed += 1
+        else:
+            failed += 1
+
+        print(f"\n{status} | {description}")
+        print(f"  Query: {repr(query)}")
+        print(f"  Expected: {expected} | Got: {result}")
+
+    print("\n" + "=" * 80)
+    print(f"RESULTADO: {passed} passed, {failed} failed")
+    print("=" * 80)
+
+    return failed == 0
+
+
+def test_incremental_rows():
+    """Test rows removed or added after the vocabulary was compacted"""
+    store = ResultStore()
+    index = SearchIndex(store)
+    index.add_many((store.append(item), item) for item in [
+        {"id": "1", "name": "Alice"},
+        {"id": "2", "name": "Alicia"},
+    ])
+
+    print("\n" + "=" * 80)
+    print("TESTE DE LINHAS REMOVIDAS E ADICIONADAS")
+    print("=" * 80)
+
+    passed = 0
+    failed = 0
+
+    index.remove(0)
+    store.delete(0)
+    item = {"id": "3", "name": "Ali Baba"}
+    index.add(store.append(item), item)
+
+    test_cases = [
+        # (query, expected_rows, description)
+        ("ali", {1, 2}, "Linha removida sai e linha nova entra"),
+        ("ali baba", {2}, "Frase conferida na linha nova"),
+        ("1", set(), "Id da linha removida"),
+    ]
+
+    for query, expected, description in test_cases:
+        result = index.search(query)
+        status = "✓ PASS" if result == expected else "✗ FAIL"
+
+        if result == expected:
+            passed += 1
+        else:
+            failed += 1
+
+        print(f"\n{status} | {description}")
+        print(f"  Query: {repr(query)}")
+        print(f"  Expected: {expected} | Got: {result}")
+
+    status = "✓ PASS" if len(index) == 2 else "✗ FAIL"
+    if len(index) == 2:
+        passed += 1
+    else:
+        failed += 1
+    print(f"\n{status} | Quantidade de linhas indexadas")
+    print(f"  Expected: 2 | Got: {len(index)}")
+
+    print("\n" + "=" * 80)
+    print(f"RESULTADO: {passed} passed, {failed} failed")
+    print("=" * 80)
+
+    return failed == 0
+
+
+if __name__ == "__main__":
+    success = test_search()
+    success = test_incremental_rows() and success
+    sys.exit(0 if success else 1)